@@ -0,0 +1,9 @@
+"""PMS 매니저 로컬 벤치마크 실행 스크립트
+
+Firebase/AHK/웹앱 대신 로컬 대체 구현을 띄워 체크인 처리 경로 전체를 측정합니다.
+사용법: python pms_benchmark.py --items 200 --properties 2 [--json]
+"""
+from pms_manager.bench.run import main
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,9 @@
+r"""PMS 매니저 처리 이벤트 조회 스크립트
+
+매니저가 event_log_file(기본 C:\PMS\pms_events.db)에 남긴 항목별 처리 기록을 객실/큐 ID/액션/날짜로 찾습니다.
+사용법: python pms_events.py --room C103 [--day 2025-03-01] [--queue-id=<ID>] [--json]
+"""
+from pms_manager.events import main
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,9 @@
+"""PMS Firebase Manager 실행 스크립트
+
+사용법: python pms_firebase_manager.py [설정 파일 경로]
+설정 파일을 생략하면 같은 폴더의 pms_manager_config.json을 사용합니다.
+"""
+from pms_manager.manager import main
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""여러 Property의 PMS 큐를 한 프로세스에서 처리하는 Firebase 매니저"""
@@ -0,0 +1,147 @@
+"""AHK 자동화 상태 추적: 액션별 처리 시간 통계 + ahk_log.txt 꼬리 읽기
+
+트리거 대기 시간은 고정 60초 대신 액션별 EWMA/p95로 정하고(trigger_timeout_min ~ trigger_timeout),
+AHK 로그에 트리거 감지 기록이 없거나 [오류]가 찍히면 제한 시간을 기다리지 않고 바로 실패 처리한다.
+"""
+import collections
+import os
+import time
+
+# 이 수만큼 처리 시간을 모으기 전에는 설정된 최대 대기 시간을 쓴다
+MIN_SAMPLES = 5
+EWMA_ALPHA = 0.2
+# p95를 구하는 최근 처리 시간 수
+TIMING_WINDOW = 50
+
+# pms_automator_*.ahk 가 남기는 로그 문구
+AHK_STARTED_MARKER = '[트리거 감지]'
+AHK_ERROR_MARKER = '[오류]'
+
+
+class _ActionStats:
+    __slots__ = ('count', 'ewma', 'recent')
+
+    def __init__(self):
+        self.count = 0
+        self.ewma = 0.0
+        self.recent = collections.deque(maxlen=TIMING_WINDOW)
+
+    def observe(self, seconds):
+        self.ewma = seconds if self.count == 0 else EWMA_ALPHA * seconds + (1 - EWMA_ALPHA) * self.ewma
+        self.count += 1
+        self.recent.append(seconds)
+
+    def p95(self):
+        values = sorted(self.recent)
+        return values[min(len(values) - 1, int(len(values) * 0.95))]
+
+
+class ActionTimings:
+    """액션별 AHK 처리 시간 (트리거 작성 → 트리거 삭제)"""
+
+    def __init__(self, floor, ceiling, factor):
+        self.floor = floor
+        self.ceiling = ceiling
+        self.factor = factor
+        self._stats = {}
+
+    def observe(self, action, seconds):
+        stats = self._stats.get(action)
+        if stats is None:
+            stats = self._stats[action] = _ActionStats()
+        stats.observe(seconds)
+
+    def expected(self, action):
+        """예상 처리 시간(초). 기록이 없으면 None"""
+        stats = self._stats.get(action)
+        return stats.ewma if stats is not None and stats.count else None
+
+    def timeout(self, action):
+        """factor × max(p95, EWMA)를 [floor, ceiling]로 자른 값"""
+        stats = self._stats.get(action)
+        if stats is None or stats.count < MIN_SAMPLES:
+            return self.ceiling
+        return min(self.ceiling, max(self.floor, self.factor * max(stats.p95(), stats.ewma)))
+
+    def snapshot(self):
+        return {
+            action: {
+                'count': stats.count,
+                'ewma_ms': round(stats.ewma * 1000, 1),
+                'p95_ms': round(stats.p95() * 1000, 1),
+                'timeout_sec': round(self.timeout(action), 1),
+            }
+            for action, stats in self._stats.items()
+        }
+
+
+def _decode(raw):
+    # AHK v1 FileAppend는 시스템 코드 페이지(한국어 Windows: cp949)로 쓴다
+    try:
+        return raw.decode('utf-8')
+    except UnicodeDecodeError:
+        return raw.decode('cp949', errors='replace')
+
+
+class AhkRun:
+    """트리거 하나를 쓴 뒤 ahk_log.txt에 새로 붙은 줄을 읽어 AHK 진행 상황 판단"""
+
+    def __init__(self, path, start_timeout):
+        self.path = path
+        self.start_timeout = start_timeout
+        self.created = time.monotonic()
+        self.started = False
+        self.error_line = None
+        self._offset = self._size()
+        self._partial = b''
+
+    def _size(self):
+        try:
+            return os.path.getsize(self.path)
+        except OSError:
+            return 0
+
+    def _read(self):
+        size = self._size()
+        if size < self._offset:
+            # 로그를 비웠거나 새로 만듦
+            self._offset, self._partial = 0, b''
+        if size == self._offset:
+            return
+        try:
+            with open(self.path, 'rb') as f:
+                f.seek(self._offset)
+                data = self._partial + f.read(size - self._offset)
+        except OSError:
+            return
+        self._offset = size
+        *lines, self._partial = data.split(b'\n')
+        for line in lines:
+            text = _decode(line).strip()
+            if AHK_STARTED_MARKER in text:
+                self.started = True
+            elif AHK_ERROR_MARKER in text and self.error_line is None:
+                self.error_line = text
+
+    def failure(self):
+        """AHK 쪽 실패가 확실하면 사유, 아직 모르면 None"""
+        self._read()
+        if self.error_line is not None:
+            return f"AHK 오류: {self.error_line}"
+        if not self.started and time.monotonic() - self.created >= self.start_timeout:
+            return f"AHK가 {self.start_timeout:g}초 안에 트리거를 감지하지 않음 (자동화 스크립트 실행 확인)"
+        return None
+
+
+class AhkLog:
+    """Property 하나의 ahk_log.txt. 파일이 없으면(AHK가 로그를 남기지 않는 환경) 감시하지 않는다"""
+
+    def __init__(self, path, start_timeout):
+        self.path = path
+        self.start_timeout = start_timeout
+
+    def begin(self):
+        """트리거를 쓰기 직전에 호출. 감시할 수 없으면 None"""
+        if not self.start_timeout or not os.path.exists(self.path):
+            return None
+        return AhkRun(self.path, self.start_timeout)
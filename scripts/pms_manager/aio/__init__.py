@@ -0,0 +1,6 @@
+"""asyncio 실행 방식 ("runtime": "asyncio")
+
+Property마다 SDK 리스너 스레드와 트리거 대기 스레드를 두는 대신, 이벤트 루프 하나에서
+Firebase REST 스트림(SSE) 수신, 트리거 파일 대기, 완료 기록을 모두 처리한다.
+httpx가 필요하다 (firebase-admin 설치 시 함께 설치됨).
+"""
@@ -0,0 +1,159 @@
+"""Firebase Realtime Database REST 클라이언트 (httpx, asyncio)
+
+stream()은 SDK의 listen()처럼 스레드를 쓰지 않고 text/event-stream 응답을 읽어
+put/patch 이벤트를 async iterator로 넘긴다. 연결이 끊기면 백오프 후 다시 연결하며,
+다시 연결할 때마다 서버가 path '/' 로 전체 데이터를 보내준다.
+"""
+import asyncio
+import json
+import random
+
+import httpx
+
+from ..firebase import (
+    RECONNECT_BACKOFF_BASE,
+    RECONNECT_BACKOFF_MAX,
+    STREAM_IDLE_TIMEOUT,
+    StreamError,
+    StreamEvent,
+    parse_sse,
+)
+
+DEFAULT_CONNECT_TIMEOUT = 3.05
+DEFAULT_READ_TIMEOUT = 10.0
+
+SCOPES = (
+    'https://www.googleapis.com/auth/firebase.database',
+    'https://www.googleapis.com/auth/userinfo.email',
+)
+
+
+class FirebaseRestError(Exception):
+    """REST 요청 실패"""
+
+
+class ServiceAccountToken:
+    """서비스 계정 키로 OAuth2 액세스 토큰 발급 (만료 전 자동 갱신)"""
+
+    def __init__(self, credentials_path):
+        from google.oauth2 import service_account
+
+        self._credentials = service_account.Credentials.from_service_account_file(
+            credentials_path, scopes=SCOPES)
+        self._lock = asyncio.Lock()
+
+    def _refresh(self):
+        from google.auth.transport.requests import Request
+
+        self._credentials.refresh(Request())
+
+    async def get(self, force=False):
+        async with self._lock:
+            if force or not self._credentials.valid:
+                # google-auth는 동기 HTTP를 쓰므로 스레드에서 갱신
+                await asyncio.to_thread(self._refresh)
+            return self._credentials.token
+
+
+class AsyncFirebaseClient:
+    """database_url 기준 경로에 GET/PUT/PATCH/DELETE 와 스트리밍 수신"""
+
+    def __init__(self, database_url, token_source=None, log=None,
+                 connect_timeout=DEFAULT_CONNECT_TIMEOUT, read_timeout=DEFAULT_READ_TIMEOUT):
+        self.base_url = database_url.rstrip('/')
+        # None이면 인증 없이 요청 (로컬 대체 서버/에뮬레이터)
+        self.token_source = token_source
+        self.log = log or (lambda message: None)
+        self._timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        self._http = httpx.AsyncClient(timeout=self._timeout, follow_redirects=True)
+
+    def _url(self, path):
+        path = (path or '').strip('/')
+        return f"{self.base_url}/{path}.json" if path else f"{self.base_url}/.json"
+
+    async def _headers(self, force_refresh=False):
+        if self.token_source is None:
+            return {}
+        token = await self.token_source.get(force=force_refresh)
+        return {'Authorization': f"Bearer {token}"}
+
+    async def request(self, method, path, value=None, params=None):
+        """응답 JSON 반환. 401이면 토큰을 갱신해 한 번 더 시도"""
+        body = None if value is None else json.dumps(value, ensure_ascii=False).encode('utf-8')
+        for attempt in range(2):
+            response = await self._http.request(
+                method, self._url(path), content=body, params=params,
+                headers=await self._headers(force_refresh=attempt > 0),
+            )
+            if response.status_code == 401 and attempt == 0 and self.token_source is not None:
+                continue
+            break
+        if response.status_code >= 400:
+            raise FirebaseRestError(f"{method} {path} 실패: {response.status_code} {response.text[:200]}")
+        return response.json() if response.content else None
+
+    async def get(self, path, params=None):
+        return await self.request('GET', path, params=params)
+
+    async def set(self, path, value):
+        await self.request('PUT', path, value, params={'print': 'silent'})
+
+    async def update(self, path, value):
+        await self.request('PATCH', path, value, params={'print': 'silent'})
+
+    async def delete(self, path):
+        await self.request('DELETE', path)
+
+    async def aclose(self):
+        await self._http.aclose()
+
+    async def stream(self, path, params=None):
+        """path 하위 변경을 StreamEvent로 계속 넘긴다 (취소될 때까지)
+
+        401 외의 4xx(.indexOn 규칙 없음, 권한 없음 등)는 다시 연결해도 같으므로 StreamError로 끝낸다.
+        """
+        failures = 0
+        force_refresh = False
+        while True:
+            try:
+                headers = await self._headers(force_refresh=force_refresh)
+                force_refresh = False
+                headers['Accept'] = 'text/event-stream'
+                timeout = httpx.Timeout(STREAM_IDLE_TIMEOUT, connect=self._timeout.connect)
+                async with self._http.stream('GET', self._url(path), params=params,
+                                             headers=headers, timeout=timeout) as response:
+                    if response.status_code == 401 and self.token_source is not None:
+                        force_refresh = True
+                        raise FirebaseRestError("인증 만료")
+                    if response.status_code != 200:
+                        await response.aread()
+                        message = f"스트림 연결 실패: {response.status_code} {response.text[:200]}"
+                        if 400 <= response.status_code < 500:
+                            raise StreamError(message, response.status_code)
+                        raise FirebaseRestError(message)
+
+                    failures = 0
+                    block = []
+                    async for line in response.aiter_lines():
+                        if line:
+                            block.append(line)
+                            continue
+                        event_type, data = parse_sse(block)
+                        block = []
+                        if event_type in ('put', 'patch'):
+                            payload = json.loads(data)
+                            yield StreamEvent(event_type, payload.get('path', '/'), payload.get('data'))
+                        elif event_type == 'cancel':
+                            raise FirebaseRestError(f"스트림 취소됨: {data}")
+                        elif event_type == 'auth_revoked':
+                            force_refresh = True
+                            raise FirebaseRestError("인증 만료")
+                    raise FirebaseRestError("스트림 연결 종료")
+            except asyncio.CancelledError:
+                raise
+            except (httpx.HTTPError, FirebaseRestError, ValueError) as e:
+                failures += 1
+                delay = min(RECONNECT_BACKOFF_MAX, RECONNECT_BACKOFF_BASE * (2 ** (failures - 1)))
+                delay *= random.uniform(0.5, 1.0)
+                self.log(f"⚠️ 스트림 재연결 ({path}, {delay:.1f}초 후): {e}")
+                await asyncio.sleep(delay)
@@ -0,0 +1,113 @@
+"""Pipeline과 같은 단계 구성을 asyncio 태스크로 실행
+
+단계 처리 함수는 일반 함수나 코루틴 함수 모두 가능하다. 단계 사이 큐는 asyncio.Queue이고
+가득 차면 앞 단계 태스크가 await 하므로 스레드 버전과 같은 방식으로 역압이 걸린다.
+"""
+import asyncio
+import inspect
+import time
+import traceback
+
+from ..pipeline import _STOP, DeadlineHeap, Pipeline
+
+
+class AsyncDeadlineQueue(asyncio.Queue):
+    """DeadlineQueue의 asyncio 버전 (asyncio.PriorityQueue와 같은 방식으로 확장)"""
+
+    def __init__(self, maxsize, priority, group=None):
+        self.priority = priority
+        self.group = group
+        super().__init__(maxsize)
+
+    def _init(self, maxsize):
+        self._queue = DeadlineHeap(self.priority, self.group)
+
+    def _put(self, item):
+        self._queue.push(item)
+
+    def _get(self):
+        return self._queue.pop()
+
+
+class AsyncPipeline(Pipeline):
+    def __init__(self, name, stages, log, observe=None):
+        super().__init__(name, stages, log, observe)
+        # 첫 단계 큐가 가득 차 있을 때 자리가 나기를 기다리는 put 태스크
+        self._blocked = set()
+
+    def submit(self, item, timeout=None):
+        """첫 단계에 작업 추가. 큐가 가득 차면 자리가 날 때 들어가도록 예약 (순서 유지)"""
+        queue = self.stages[0].queue
+        if not self._blocked:
+            try:
+                queue.put_nowait(item)
+                return True
+            except asyncio.QueueFull:
+                pass
+        task = asyncio.ensure_future(queue.put(item))
+        self._blocked.add(task)
+        task.add_done_callback(self._blocked.discard)
+        return True
+
+    async def wait_ready(self):
+        """예약된 submit이 모두 큐에 들어갈 때까지 대기 (수신 쪽 역압)"""
+        while self._blocked:
+            await asyncio.gather(*list(self._blocked))
+
+    def depth(self):
+        return super().depth() + len(self._blocked)
+
+    def start(self):
+        """실행 중인 이벤트 루프 안에서 호출"""
+        for stage in self.stages:
+            maxsize = stage.queue.maxsize
+            if stage.priority:
+                stage.queue = AsyncDeadlineQueue(maxsize, stage.priority, stage.group)
+            else:
+                stage.queue = asyncio.Queue(maxsize)
+        for stage in self.stages:
+            for _ in range(stage.workers):
+                stage._threads.append(asyncio.ensure_future(self._worker(stage)))
+
+    async def stop(self, timeout=5.0):
+        """앞 단계부터 차례로 남은 작업을 비우고 워커 종료"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        await self.wait_ready()
+        for stage in self.stages:
+            for _ in stage._threads:
+                await stage.queue.put(_STOP)
+            if stage._threads:
+                _, pending = await asyncio.wait(stage._threads, timeout=max(deadline - loop.time(), 0))
+                for task in pending:
+                    task.cancel()
+            stage._threads = []
+
+    async def _worker(self, stage):
+        while True:
+            item = await stage.queue.get()
+            if item is _STOP:
+                return
+
+            stage.stats.begin()
+            started = time.monotonic()
+            error = False
+            try:
+                result = stage.handler(item)
+                if inspect.isawaitable(result):
+                    result = await result
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                error = True
+                result = None
+                self.log(f"❌ {stage.name} 단계 오류: {e}")
+                self.log(f"상세 오류:\n{traceback.format_exc()}")
+            finally:
+                elapsed = time.monotonic() - started
+                stage.stats.end(elapsed, error)
+                if self.observe is not None:
+                    self.observe(stage.name, elapsed, error)
+
+            if result is not None and stage.next is not None:
+                await stage.next.queue.put(result)
@@ -0,0 +1,163 @@
+"""Property 하나를 이벤트 루프에서 처리
+
+PropertyManager의 검증/트리거/후처리 단계를 그대로 쓰고, 스레드를 쓰던 부분만 바꾼다:
+SDK listen() → REST 스트림, 트리거 파일 대기 → AsyncFileWatcher, 쓰기 배처 확인 → wrap_future.
+"""
+import asyncio
+import os
+import time
+import traceback
+
+from .. import journal as jobs
+from ..firebase import StreamError, query_params
+from ..property import PENDING_INDEX_HINT, PropertyManager
+from .pipeline import AsyncPipeline
+from .watch import AsyncFileWatcher
+
+PENDING_QUERY = query_params(order_by_child='status', equal_to='pending')
+
+
+class AsyncPropertyManager(PropertyManager):
+    def __init__(self, config, settings, sheets_sync, cleanup, journal, writes, client):
+        super().__init__(config, settings, sheets_sync, cleanup, journal, writes)
+        self.client = client
+        self.trigger_watcher = AsyncFileWatcher(
+            config.trigger_file,
+            poll_interval=settings.watch_poll_interval,
+            use_notifications=settings.watch_use_notifications,
+        )
+        # 완료 기록 등 결과를 기다리지 않는 태스크 (GC 방지용 참조)
+        self._tasks = set()
+
+    def _create_pipeline(self, stages):
+        return AsyncPipeline(self.name, stages, self.log, observe=self._observe_stage)
+
+    def _spawn(self, coro):
+        task = asyncio.ensure_future(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def start(self):
+        """실행 중인 이벤트 루프 안에서 호출"""
+        if self.executor is not None:
+            self.executor.start()
+            self.log(f"✓ {self.executor.label} 시작 ({self.executor.backend})")
+        else:
+            self.trigger_watcher.start()
+            self.log(f"✓ 트리거 파일 감시 시작 ({self.trigger_watcher.backend})")
+
+        self.room_status.start()
+        self.log("✓ 객실 상태 모니터링 스레드 시작")
+
+        self.pipeline.start()
+        self._resume_unfinished()
+
+        self._listener = self._spawn(self._listen())
+
+    async def stop(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
+        await self.pipeline.stop()
+        if self._tasks:
+            await asyncio.wait(list(self._tasks), timeout=5.0)
+        if self.executor is not None:
+            self.executor.stop()
+        self.trigger_watcher.stop()
+        self.room_status.stop()
+
+    async def _listen(self):
+        path = self.config.queue_path
+        if self.settings.listen_pending_only:
+            try:
+                self.log(f"👂 리스닝 시작 (스트림): {path} (pending 항목만)")
+                await self._consume(self.client.stream(path, params=PENDING_QUERY))
+                return
+            except StreamError as e:
+                self.log(f"⚠️ pending 조건 수신 실패, 전체 수신으로 전환: {e}")
+                self.log(f"  - Firebase 규칙에 {PENDING_INDEX_HINT} 추가 필요")
+
+        self.log(f"👂 리스닝 시작 (스트림): {path}")
+        await self._consume(self.client.stream(path))
+
+    async def _consume(self, stream):
+        async for event in stream:
+            self.on_queue_added(event)
+            await self.pipeline.wait_ready()
+
+    async def publish_metrics(self):
+        try:
+            await asyncio.wrap_future(self.writes.set(f"{self.config.status_path}/metrics", self.metrics_summary()))
+        except Exception as e:
+            self.log(f"⚠️ 지표 업로드 실패: {e}")
+
+    async def _mark(self, queue_id, status, fields):
+        started = time.monotonic()
+        try:
+            await asyncio.wrap_future(self.writes.update(self._item_path(queue_id), fields))
+            self._marked(queue_id, status, started)
+        except Exception as e:
+            self._mark_error(status, e)
+
+    def mark_as_completed(self, queue_id):
+        self._spawn(self._mark(queue_id, 'completed', self._completed_fields()))
+
+    def mark_as_failed(self, queue_id, error_message):
+        self._spawn(self._mark(queue_id, 'failed', self._failed_fields(error_message)))
+
+    def _reject(self, job):
+        self._spawn(self._finish(job))
+        return None
+
+    async def _run_automation(self, job):
+        self._automation_started(job)
+        if job.resume_state in (jobs.CONSUMED, jobs.SYNCED):
+            # PMS 반영은 이미 끝남: 후처리만 다시
+            job.success = True
+            return job
+
+        try:
+            if self.executor is not None:
+                # 스풀/소켓 ack 대기는 스레드 기반이므로 기본 실행기에서 대기
+                job.success = await asyncio.to_thread(self._execute_queued, job)
+            else:
+                job.success = await self._execute_trigger(job)
+        except Exception as e:
+            self.log(f"❌ 실행 오류: {e}")
+            self.log(f"상세 오류:\n{traceback.format_exc()}")
+            job.error = str(e)
+        return job
+
+    async def _execute_trigger(self, job):
+        """execute_pms_automation의 트리거 파일 대기를 await로"""
+        trigger_file = self.config.trigger_file
+        if self._previous_trigger_left(job):
+            elapsed = await self.trigger_watcher.wait_until(
+                lambda: not os.path.exists(trigger_file),
+                timeout=self._trigger_timeout(job),
+            )
+            if not self._previous_trigger_cleared(job, elapsed):
+                return False
+
+        result = self._begin_trigger(job)
+        if result is not None:
+            return result
+        elapsed = await self.trigger_watcher.wait_until(self._trigger_settled, timeout=self._trigger_timeout(job))
+        return self._trigger_result(job, elapsed)
+
+    async def _finish(self, job):
+        """Sheets 동기화 요청 + Firebase 완료/실패 기록"""
+        try:
+            if job.success:
+                self._request_sheets_sync(job)
+                await self._mark(job.queue_id, 'completed', self._completed_fields())
+                self.journal.advance(self.name, job.queue_id, jobs.COMPLETED)
+            else:
+                error = job.error or "알 수 없는 오류"
+                await self._mark(job.queue_id, 'failed', self._failed_fields(error))
+                self.journal.advance(self.name, job.queue_id, jobs.FAILED, error=error)
+        finally:
+            self._job_done(job)
+        return None
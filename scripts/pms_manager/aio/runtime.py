@@ -0,0 +1,75 @@
+"""asyncio 실행 방식의 메인 루프"""
+import asyncio
+import threading
+
+from ..manager import STATS_LOG_INTERVAL
+from .firebase_rest import AsyncFirebaseClient, ServiceAccountToken
+from .property import AsyncPropertyManager
+
+
+class AsyncRuntime:
+    """모든 Property를 이벤트 루프 하나에서 실행. run()은 stop() 또는 Ctrl+C까지 반환하지 않는다"""
+
+    def __init__(self, config, sheets_sync, cleanup, journal, writes, log):
+        self.config = config
+        self.log = log
+        self.sheets_sync = sheets_sync
+        # credentials_path가 없으면 인증 없이 접속 (로컬 대체 서버)
+        token = ServiceAccountToken(config.credentials_path) if config.credentials_path else None
+        self.client = AsyncFirebaseClient(
+            config.database_url,
+            token,
+            log=log,
+            connect_timeout=config.http_connect_timeout,
+            read_timeout=config.http_read_timeout,
+        )
+        self.managers = [
+            AsyncPropertyManager(p, config, sheets_sync, cleanup, journal, writes, self.client)
+            for p in config.properties
+        ]
+        # 모든 Property가 리스닝을 시작하면 설정됨
+        self.ready = threading.Event()
+        self._loop = None
+        self._stopping = None
+
+    def run(self, on_ready=None):
+        asyncio.run(self._serve(on_ready))
+
+    def stop(self):
+        """다른 스레드에서 종료 요청"""
+        loop, stopping = self._loop, self._stopping
+        if loop is not None and stopping is not None:
+            loop.call_soon_threadsafe(stopping.set)
+
+    async def _serve(self, on_ready):
+        self._loop = asyncio.get_running_loop()
+        self._stopping = asyncio.Event()
+        started = []
+        periodic = []
+        try:
+            for manager in self.managers:
+                await manager.start()
+                started.append(manager)
+            self.ready.set()
+            if on_ready is not None:
+                on_ready()
+            periodic = [asyncio.ensure_future(self._log_stats()), asyncio.ensure_future(self._publish_metrics())]
+            await self._stopping.wait()
+        finally:
+            for task in periodic:
+                task.cancel()
+            for manager in started:
+                await manager.stop()
+            await self.client.aclose()
+
+    async def _log_stats(self):
+        while True:
+            await asyncio.sleep(STATS_LOG_INTERVAL)
+            for manager in self.managers:
+                self.log(f"📊 {manager.name}: {manager.stats()}")
+            self.log(f"📊 Sheets: {self.sheets_sync.stats()}")
+
+    async def _publish_metrics(self):
+        while True:
+            await asyncio.sleep(self.config.metrics_summary_interval)
+            await asyncio.gather(*(manager.publish_metrics() for manager in self.managers))
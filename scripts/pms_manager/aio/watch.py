@@ -0,0 +1,70 @@
+"""이벤트 루프에서 파일 변경 대기
+
+watchdog이 있으면 FileWatcher의 OS 알림을 루프로 넘겨받고, 없으면 별도 스레드 없이
+asyncio.sleep 간격으로 직접 확인한다.
+"""
+import asyncio
+import os
+
+from ..watch import DEFAULT_POLL_INTERVAL, NOTIFY_SAFETY_INTERVAL, FileWatcher
+
+
+class AsyncFileWatcher:
+    def __init__(self, path, poll_interval=DEFAULT_POLL_INTERVAL, use_notifications=True):
+        self.path = os.path.abspath(path)
+        self.poll_interval = poll_interval
+        self.use_notifications = use_notifications
+        self._watcher = None
+        self._loop = None
+        self._changed = None
+
+    @property
+    def backend(self):
+        return 'notify' if self._watcher is not None else 'poll'
+
+    def start(self):
+        """실행 중인 이벤트 루프 안에서 호출"""
+        self._loop = asyncio.get_running_loop()
+        self._changed = asyncio.Event()
+        if not self.use_notifications:
+            return
+        watcher = FileWatcher(self.path, self.poll_interval, use_notifications=True)
+        watcher.start()
+        if watcher.backend != 'notify':
+            # OS 알림을 못 쓰면 폴링 스레드 대신 루프에서 직접 확인
+            watcher.stop()
+            return
+        watcher.add_listener(self._on_change)
+        self._watcher = watcher
+
+    def stop(self):
+        if self._watcher is not None:
+            self._watcher.stop()
+            self._watcher = None
+
+    def _on_change(self):
+        # 감시 스레드에서 호출됨
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(self._changed.set)
+
+    def _check_interval(self):
+        return NOTIFY_SAFETY_INTERVAL if self._watcher is not None else self.poll_interval
+
+    async def wait_until(self, predicate, timeout):
+        """predicate()가 참이 될 때까지 대기. 경과 시간(초) 또는 타임아웃 시 None 반환"""
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        deadline = started + timeout
+
+        while True:
+            self._changed.clear()
+            if predicate():
+                return loop.time() - started
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return None
+            try:
+                await asyncio.wait_for(self._changed.wait(), min(remaining, self._check_interval()))
+            except asyncio.TimeoutError:
+                pass
@@ -0,0 +1 @@
+"""실제 Firebase / AHK / 웹앱 없이 매니저를 돌리기 위한 로컬 대체 구현과 벤치마크"""
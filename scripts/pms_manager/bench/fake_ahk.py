@@ -0,0 +1,125 @@
+"""AHK 자동화 대체: 트리거 파일(또는 스풀 작업, 소켓 작업)을 읽고 잠시 뒤 처리 완료 표시"""
+import json
+import os
+import threading
+import time
+
+from ..socket_consumer import SocketConsumer
+
+
+class FakeAutomator:
+    """poll_interval마다 트리거 파일을 확인하고, macro_delay만큼 'PMS 조작' 후 삭제
+
+    delays({queue_id: 초})가 있으면 그 항목은 macro_delay 대신 해당 시간만큼 조작한다 (추적 재현).
+    log_file이 있으면 실제 스크립트처럼 ahk_log.txt에 감지/삭제 기록을 남긴다.
+    """
+
+    def __init__(self, trigger_file, poll_interval=0.02, macro_delay=0.05, delays=None, log_file=None):
+        self.trigger_file = trigger_file
+        self.log_file = log_file
+        self.poll_interval = poll_interval
+        self.macro_delay = macro_delay
+        self.delays = delays or {}
+        self.processed = []
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _log(self, message):
+        if self.log_file:
+            with open(self.log_file, 'a', encoding='utf-8') as f:
+                f.write(message + '\n')
+
+    def start(self):
+        self._log("========== AHK 스크립트 시작 (벤치마크) ==========")
+        self._thread = threading.Thread(target=self._run, name="fake-ahk", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(2.0)
+
+    def _run(self):
+        while not self._stop.wait(self.poll_interval):
+            try:
+                with open(self.trigger_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                # 없음 또는 쓰는 중
+                continue
+            self._log("[트리거 감지] 매크로 실행 시작")
+            time.sleep(self.delays.get(data.get('queue_id'), self.macro_delay))
+            try:
+                os.remove(self.trigger_file)
+            except OSError:
+                continue
+            self._log("[트리거 삭제] 처리 완료")
+            self.processed.append(data.get('queue_id'))
+
+
+class FakeSpoolAutomator(FakeAutomator):
+    """스풀 디렉터리 소비자: 매니페스트 묶음은 한 번의 처리(macro_delay)로, 작업마다 ack 기록"""
+
+    def __init__(self, spool_dir, poll_interval=0.02, macro_delay=0.05, item_delay=0.0):
+        super().__init__(None, poll_interval, macro_delay)
+        self.spool_dir = spool_dir
+        self.item_delay = item_delay
+        self.passes = 0
+
+    def _dir(self, name):
+        return os.path.join(self.spool_dir, name)
+
+    def _list(self, name):
+        try:
+            return sorted(f for f in os.listdir(self._dir(name)) if f.endswith('.json'))
+        except OSError:
+            return []
+
+    def _next_pass(self):
+        """다음에 처리할 순번 목록: 매니페스트가 있으면 그 묶음, 없으면 가장 앞 작업 하나"""
+        acked = set(self._list('acks'))
+        waiting = [f for f in self._list('jobs') if f not in acked]
+        if not waiting:
+            return []
+        for manifest in self._list('batches'):
+            try:
+                with open(os.path.join(self._dir('batches'), manifest), 'r', encoding='utf-8') as f:
+                    seqs = json.load(f)['seqs']
+            except (OSError, ValueError, KeyError):
+                continue
+            names = [f"{seq:08d}.json" for seq in seqs]
+            if waiting[0] in names:
+                return [name for name in names if name in waiting]
+        return waiting[:1]
+
+    def _run(self):
+        while not self._stop.wait(self.poll_interval):
+            names = self._next_pass()
+            if not names:
+                continue
+            time.sleep(self.macro_delay + self.item_delay * len(names))
+            self.passes += 1
+            for name in names:
+                try:
+                    with open(os.path.join(self._dir('jobs'), name), 'r', encoding='utf-8') as f:
+                        data = json.load(f)
+                except (OSError, ValueError):
+                    continue
+                ack_path = os.path.join(self._dir('acks'), name)
+                with open(ack_path + '.tmp', 'w', encoding='utf-8') as f:
+                    json.dump({'seq': data.get('seq'), 'success': True, 'error': ''}, f)
+                os.replace(ack_path + '.tmp', ack_path)
+                self.processed.append(data.get('queue_id'))
+
+
+class FakeSocketAutomator(SocketConsumer):
+    """소켓 실행기 소비자: 작업마다 macro_delay(또는 delays의 항목별 시간)만큼 'PMS 조작' 후 ack"""
+
+    def __init__(self, port, macro_delay=0.05, delays=None):
+        super().__init__('127.0.0.1', port, self._execute, name='fake-ahk', reconnect_interval=0.1,
+                         log=lambda message: None)
+        self.macro_delay = macro_delay
+        self.delays = delays or {}
+
+    def _execute(self, job):
+        time.sleep(self.delays.get(job.get('queue_id'), self.macro_delay))
@@ -0,0 +1,222 @@
+"""메모리 안의 Firebase Realtime Database 대체 구현
+
+firebase_admin.db 의 reference()/Reference(get, set, update, delete, child, listen)
+중 매니저가 쓰는 부분만 흉내 낸다. listen 콜백은 SDK처럼 리스너 전용 스레드에서
+순서대로 호출되고, 처음에는 path '/' 로 하위 전체가 전달된다.
+
+FakeDatabase.listen(path, callback, order_by_child, equal_to)는 firebase.listen의
+조건 수신처럼 조건에 맞는 자식만 보내고, 조건에서 벗어난 자식은 null로 알린다.
+"""
+import copy
+import queue
+import threading
+import time
+
+
+def _split(path):
+    return [part for part in (path or '').split('/') if part]
+
+
+class Event:
+    def __init__(self, event_type, path, data):
+        self.event_type = event_type
+        self.path = path
+        self.data = data
+
+
+class ListenerRegistration:
+    def __init__(self, database, parts, callback, order_by_child=None, equal_to=None):
+        self._database = database
+        self.parts = parts
+        self.order_by_child = order_by_child
+        self.equal_to = equal_to
+        # 조건 수신에서 지금 조건에 맞는 자식 키
+        self.members = set()
+        self._callback = callback
+        self._events = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="fake-firebase-listener", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            event = self._events.get()
+            if event is None:
+                return
+            try:
+                self._callback(event)
+            except Exception:
+                pass
+
+    def push(self, event):
+        self._events.put(event)
+
+    def matches(self, value):
+        return isinstance(value, dict) and value.get(self.order_by_child) == self.equal_to
+
+    def close(self):
+        self._database._remove_listener(self)
+        self._events.put(None)
+
+
+class FakeDatabase:
+    """reference(path)를 제공하는 메모리 DB. write_latency로 왕복 지연을 흉내 낼 수 있다"""
+
+    def __init__(self, write_latency=0.0):
+        self.write_latency = write_latency
+        self.write_count = 0
+        self._tree = {}
+        self._lock = threading.RLock()
+        self._listeners = []
+        # (op, path, value) 를 받는 관찰자. 벤치마크가 완료 시각을 잴 때 사용
+        self._observers = []
+
+    def reference(self, path='/'):
+        return FakeReference(self, _split(path))
+
+    def listen(self, path, callback, order_by_child=None, equal_to=None):
+        if order_by_child is None:
+            return self.reference(path).listen(callback)
+        registration = ListenerRegistration(self, _split(path), callback, order_by_child, equal_to)
+        with self._lock:
+            self._listeners.append(registration)
+            children = self._get(registration.parts)
+            children = children if isinstance(children, dict) else {}
+            initial = {key: value for key, value in children.items() if registration.matches(value)}
+            registration.members.update(initial)
+            registration.push(Event('put', '/', initial or None))
+        return registration
+
+    def add_observer(self, callback):
+        self._observers.append(callback)
+
+    def _remove_listener(self, registration):
+        with self._lock:
+            if registration in self._listeners:
+                self._listeners.remove(registration)
+
+    def _get(self, parts):
+        with self._lock:
+            node = self._tree
+            for part in parts:
+                if not isinstance(node, dict) or part not in node:
+                    return None
+                node = node[part]
+            return copy.deepcopy(node)
+
+    def _put(self, parts, value):
+        if not parts:
+            self._tree = copy.deepcopy(value) if isinstance(value, dict) else {}
+            return
+        node = self._tree
+        trail = []
+        for part in parts[:-1]:
+            child = node.get(part)
+            if not isinstance(child, dict):
+                child = node[part] = {}
+            trail.append((node, part))
+            node = child
+        if value is None:
+            node.pop(parts[-1], None)
+            # 비어 버린 상위 노드는 Firebase처럼 사라진다
+            for parent, part in reversed(trail):
+                if parent[part]:
+                    break
+                del parent[part]
+        else:
+            node[parts[-1]] = copy.deepcopy(value)
+
+    def _write(self, op, parts, changes):
+        """changes: [(절대 경로 parts, 값)]. 리스너별로 이벤트 하나씩 보낸다"""
+        if self.write_latency:
+            time.sleep(self.write_latency)
+        with self._lock:
+            self.write_count += 1
+            for change_parts, value in changes:
+                self._put(change_parts, value)
+            for registration in list(self._listeners):
+                self._dispatch(registration, op, parts, changes)
+        for observer in self._observers:
+            for change_parts, value in changes:
+                observer(op, '/'.join(change_parts), value)
+
+    def _dispatch(self, registration, op, parts, changes):
+        base = registration.parts
+        if registration.order_by_child is not None:
+            self._dispatch_filtered(registration, changes)
+            return
+        if op == 'patch' and parts[:len(base)] == base:
+            relative = parts[len(base):]
+            data = {'/'.join(change[len(parts):]): copy.deepcopy(value) for change, value in changes}
+            registration.push(Event('patch', '/' + '/'.join(relative), data))
+            return
+        # 리스너 위쪽에서 보낸 multi-path update는 리스너 아래 자식별 patch로 나눈다
+        grouped = {}
+        for change_parts, value in changes:
+            if op == 'patch' and change_parts[:len(base)] == base and len(change_parts) > len(base) + 1:
+                child = grouped.setdefault(change_parts[len(base)], {})
+                child['/'.join(change_parts[len(base) + 1:])] = copy.deepcopy(value)
+            elif change_parts[:len(base)] == base:
+                relative = change_parts[len(base):]
+                registration.push(Event('put', '/' + '/'.join(relative), copy.deepcopy(value)))
+            elif base[:len(change_parts)] == change_parts:
+                # 리스너 위쪽 노드가 바뀜: 리스너 위치의 새 값을 통째로 전달
+                registration.push(Event('put', '/', self._get(base)))
+        for key, data in grouped.items():
+            registration.push(Event('patch', '/' + key, data))
+
+    def _dispatch_filtered(self, registration, changes):
+        base = registration.parts
+        keys = set()
+        for change_parts, _ in changes:
+            if change_parts[:len(base)] == base and len(change_parts) > len(base):
+                keys.add(change_parts[len(base)])
+            elif base[:len(change_parts)] == change_parts:
+                children = self._get(base)
+                keys.update(children if isinstance(children, dict) else ())
+                keys.update(registration.members)
+        for key in sorted(keys):
+            value = self._get(base + [key])
+            if registration.matches(value):
+                registration.members.add(key)
+                registration.push(Event('put', '/' + key, value))
+            elif key in registration.members:
+                registration.members.discard(key)
+                registration.push(Event('put', '/' + key, None))
+
+
+class FakeReference:
+    def __init__(self, database, parts):
+        self._database = database
+        self._parts = parts
+
+    @property
+    def key(self):
+        return self._parts[-1] if self._parts else None
+
+    @property
+    def path(self):
+        return '/' + '/'.join(self._parts)
+
+    def child(self, path):
+        return FakeReference(self._database, self._parts + _split(path))
+
+    def get(self):
+        return self._database._get(self._parts)
+
+    def set(self, value):
+        self._database._write('put', self._parts, [(self._parts, value)])
+
+    def update(self, value):
+        changes = [(self._parts + _split(key), item) for key, item in value.items()]
+        self._database._write('patch', self._parts, changes)
+
+    def delete(self):
+        self._database._write('put', self._parts, [(self._parts, None)])
+
+    def listen(self, callback):
+        database = self._database
+        registration = ListenerRegistration(database, self._parts, callback)
+        with database._lock:
+            database._listeners.append(registration)
+            registration.push(Event('put', '/', database._get(self._parts)))
+        return registration
@@ -0,0 +1,146 @@
+"""FakeDatabase를 Firebase Realtime Database REST API처럼 내보내는 로컬 HTTP 서버
+
+    GET    /<path>.json                        값 조회
+    GET    /<path>.json  (Accept: text/event-stream)  put/patch 스트림 (SSE)
+           ?orderBy="status"&equalTo="pending"    조건에 맞는 자식만 (조회/스트림)
+    PUT    /<path>.json                        set
+    PATCH  /<path>.json                        update (multi-path)
+    DELETE /<path>.json                        delete
+
+asyncio 실행 방식(AsyncFirebaseClient)을 실제 Firebase 없이 시험할 때 사용한다.
+"""
+import json
+import queue
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+KEEPALIVE_INTERVAL = 30.0
+
+
+class _FirebaseHandler(BaseHTTPRequestHandler):
+    database = None
+    server_state = None
+
+    def _ref_path(self):
+        path = urlsplit(self.path).path
+        if path.endswith('.json'):
+            path = path[:-len('.json')]
+        return path.strip('/')
+
+    def _reply(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_body(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        return json.loads(self.rfile.read(length) or b'null')
+
+    def _query(self):
+        """(orderBy 자식 이름, equalTo 값). 조건이 없으면 (None, None)"""
+        params = dict(parse_qsl(urlsplit(self.path).query))
+        if 'orderBy' not in params:
+            return None, None
+        return json.loads(params['orderBy']), json.loads(params.get('equalTo', 'null'))
+
+    def _silent(self):
+        return 'print=silent' in urlsplit(self.path).query
+
+    def do_GET(self):
+        path = self._ref_path()
+        order_by_child, equal_to = self._query()
+        if 'text/event-stream' in (self.headers.get('Accept') or ''):
+            self._stream(path, order_by_child, equal_to)
+            return
+        value = self.database.reference(path).get()
+        if order_by_child is not None and isinstance(value, dict):
+            value = {key: item for key, item in value.items()
+                     if isinstance(item, dict) and item.get(order_by_child) == equal_to}
+        self._reply(200, value)
+
+    def do_PUT(self):
+        value = self._read_body()
+        self.database.reference(self._ref_path()).set(value)
+        if self._silent():
+            self.send_response(204)
+            self.end_headers()
+            return
+        self._reply(200, value)
+
+    def do_PATCH(self):
+        value = self._read_body()
+        if not isinstance(value, dict):
+            self._reply(400, {'error': 'PATCH 본문은 객체여야 함'})
+            return
+        self.database.reference(self._ref_path()).update(value)
+        if self._silent():
+            self.send_response(204)
+            self.end_headers()
+            return
+        self._reply(200, value)
+
+    def do_DELETE(self):
+        self.database.reference(self._ref_path()).delete()
+        self._reply(200, None)
+
+    def _stream(self, path, order_by_child=None, equal_to=None):
+        events = queue.SimpleQueue()
+        registration = self.database.listen(path, events.put, order_by_child, equal_to)
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        self.close_connection = True
+        try:
+            while not self.server_state.closing.is_set():
+                try:
+                    event = events.get(timeout=self.server_state.keepalive_interval)
+                    chunk = (f"event: {event.event_type}\n"
+                             f"data: {json.dumps({'path': event.path, 'data': event.data}, ensure_ascii=False)}\n\n")
+                except queue.Empty:
+                    chunk = "event: keep-alive\ndata: null\n\n"
+                self.wfile.write(chunk.encode('utf-8'))
+                self.wfile.flush()
+        except OSError:
+            pass
+        finally:
+            registration.close()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _ServerState:
+    def __init__(self, keepalive_interval):
+        self.keepalive_interval = keepalive_interval
+        self.closing = threading.Event()
+
+
+class FakeFirebaseServer:
+    def __init__(self, database, host='127.0.0.1', port=0, keepalive_interval=KEEPALIVE_INTERVAL):
+        self.state = _ServerState(keepalive_interval)
+        handler = type('FirebaseHandler', (_FirebaseHandler,), {
+            'database': database,
+            'server_state': self.state,
+        })
+        self._server = ThreadingHTTPServer((host, port), handler)
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-firebase-http", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self.state.closing.set()
+        self._server.shutdown()
+        self._server.server_close()
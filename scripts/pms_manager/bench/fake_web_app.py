@@ -0,0 +1,114 @@
+"""웹앱(/api/room-status, /api/update-room-status) 대체 HTTP 서버"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _WebAppHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    app = None
+
+    def _reply(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_body(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        raw = self.rfile.read(length) if length else b''
+        try:
+            return json.loads(raw or b'{}')
+        except ValueError:
+            return None
+
+    def do_GET(self):
+        self.app.delay()
+        if self.app.down():
+            self._reply(503, {'error': 'unavailable'})
+            return
+        if self.path.split('?', 1)[0] != '/api/room-status':
+            self._reply(404, {'error': 'not found'})
+            return
+        self._reply(200, self.app.room_list())
+
+    def do_PUT(self):
+        body = self._read_body()
+        self.app.delay()
+        if self.app.down():
+            self._reply(503, {'error': 'unavailable'})
+            return
+        if self.path.split('?', 1)[0] != '/api/update-room-status':
+            self._reply(404, {'error': 'not found'})
+            return
+        if not isinstance(body, dict) or 'roomId' not in body:
+            self._reply(400, {'error': 'roomId 필요'})
+            return
+        if not self.app.update(body['roomId'], body.get('newStatus')):
+            self._reply(404, {'error': 'room not found'})
+            return
+        self._reply(200, {'success': True})
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeWebApp:
+    """객실 목록을 메모리에 두고 상태 변경 요청을 기록하는 로컬 웹앱. 시작 후 outage초 동안은 503 응답"""
+
+    def __init__(self, room_numbers, latency=0.0, outage=0.0, host='127.0.0.1', port=0):
+        self.latency = latency
+        self.outage = outage
+        self.unavailable = 0
+        self._down_until = 0.0
+        self.rooms = {
+            f"room-{i}": {'id': f"room-{i}", 'roomNumber': number, 'status': '공실'}
+            for i, number in enumerate(room_numbers)
+        }
+        self.updates = []
+        self._lock = threading.Lock()
+        handler = type('WebAppHandler', (_WebAppHandler,), {'app': self})
+        self._server = ThreadingHTTPServer((host, port), handler)
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def delay(self):
+        if self.latency:
+            time.sleep(self.latency)
+
+    def down(self):
+        if time.monotonic() >= self._down_until:
+            return False
+        with self._lock:
+            self.unavailable += 1
+        return True
+
+    def room_list(self):
+        with self._lock:
+            return [dict(room) for room in self.rooms.values()]
+
+    def update(self, room_id, status):
+        with self._lock:
+            room = self.rooms.get(room_id)
+            if room is None:
+                return False
+            room['status'] = status
+            self.updates.append((room['roomNumber'], status))
+            return True
+
+    def start(self):
+        self._down_until = time.monotonic() + self.outage
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-web-app", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,128 @@
+"""추적 파일(trace_*.jsonl)로 기록된 부하를 로컬 대체 구현에서 다시 돌린다
+
+큐 이벤트에서 pending 항목이 처음 보인 시각을 도착 시각으로, 트리거 consumed 기록을
+항목별 AHK 처리 시간으로, 웹앱 호출 시간의 중앙값을 웹앱 지연으로 쓴다. 도착 간격만
+--speed 배로 줄이고 AHK 처리 시간은 그대로 두므로, 몰린 시간대를 빠르게 재현할 수 있다.
+"""
+import argparse
+import json
+
+from .. import trace
+from .run import _print_report, percentile, run_workload
+
+# 재현할 때 다시 쓰지 않는 처리 상태 필드
+STATE_FIELDS = frozenset(['status', 'createdAt', 'completedAt', 'failedAt', 'error'])
+
+
+def _pending_children(record):
+    """큐 이벤트 하나에서 (queue_id, 항목) 중 pending인 것"""
+    data = record.get('data')
+    path = (record.get('path') or '/').strip('/')
+    if not isinstance(data, dict):
+        return []
+    if not path:
+        children = data.items()
+    elif '/' not in path:
+        children = [(path, data)]
+    else:
+        return []
+    return [(queue_id, item) for queue_id, item in children
+            if isinstance(item, dict) and item.get('status') == 'pending']
+
+
+def build_workload(records):
+    """(workload, property 이름, 객실 번호, AHK 처리 시간, 원래 처리 시간(초) 목록, 웹앱 지연 중앙값)"""
+    arrivals = {}
+    ahk_delays = {}
+    recorded = []
+    http_ms = []
+    for record in records:
+        kind = record.get('k')
+        if kind == 'queue':
+            for queue_id, item in _pending_children(record):
+                key = (record.get('p'), queue_id)
+                if key not in arrivals:
+                    arrivals[key] = (record['t'], item)
+        elif kind == 'trigger' and record.get('phase') == 'consumed' and record.get('ms') is not None:
+            ahk_delays[record['id']] = record['ms'] / 1000
+        elif kind == 'job' and record.get('ms') is not None:
+            recorded.append(record['ms'] / 1000)
+        elif kind == 'http' and isinstance(record.get('status'), int):
+            http_ms.append(record['ms'])
+
+    if not arrivals:
+        return [], [], [], ahk_delays, recorded, None
+
+    first = min(t for t, _ in arrivals.values())
+    workload = sorted(
+        (t - first, name, queue_id, {k: v for k, v in item.items() if k not in STATE_FIELDS})
+        for (name, queue_id), (t, item) in arrivals.items()
+    )
+    names = sorted({name for _, name, _, _ in workload})
+    rooms = sorted({str(item.get('roomNumber')) for _, _, _, item in workload if item.get('roomNumber')})
+    web_latency = percentile(sorted(http_ms), 0.5) / 1000 if http_ms else None
+    return workload, names, rooms, ahk_delays, sorted(recorded), web_latency
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="추적 파일로 PMS 매니저 부하 재현")
+    parser.add_argument('trace_file', help="매니저가 trace_dir에 남긴 trace_*.jsonl")
+    parser.add_argument('--speed', type=float, default=1.0, help="도착 간격을 이 배수로 빠르게 (1 = 실제 속도)")
+    parser.add_argument('--runtime', choices=('threads', 'asyncio'), default='threads')
+    parser.add_argument('--trigger-mode', choices=('file', 'spool', 'socket'), default='file',
+                        help="spool이면 기록된 AHK 시간 대신 --ahk-delay-ms 사용")
+    parser.add_argument('--ahk-poll-ms', type=float, default=20, help="가짜 AHK 트리거 확인 주기")
+    parser.add_argument('--ahk-delay-ms', type=float, default=50,
+                        help="AHK 처리 시간 기록이 없는 항목의 처리 시간")
+    parser.add_argument('--web-latency-ms', type=float, default=None,
+                        help="웹앱 응답 지연 (기본: 기록된 웹앱 호출 시간 중앙값)")
+    parser.add_argument('--db-latency-ms', type=float, default=0, help="Firebase 쓰기 왕복 지연")
+    parser.add_argument('--priority-aging-sec', type=float, default=30.0,
+                        help="체크인 외 액션이 양보하는 최대 시간 (0이면 들어온 순서)")
+    parser.add_argument('--json', action='store_true', help="결과를 JSON으로 출력")
+    args = parser.parse_args(argv)
+
+    records = trace.load(args.trace_file)
+    workload, names, rooms, ahk_delays, recorded, web_latency = build_workload(records)
+    if not workload:
+        print(f"❌ 재현할 큐 항목 없음: {args.trace_file}")
+        return None
+    if args.web_latency_ms is not None:
+        web_latency = args.web_latency_ms / 1000
+
+    result = run_workload(
+        workload,
+        names,
+        rooms,
+        speed=args.speed,
+        ahk_poll=args.ahk_poll_ms / 1000,
+        ahk_delay=args.ahk_delay_ms / 1000,
+        ahk_delays=ahk_delays if args.trigger_mode != 'spool' else None,
+        db_latency=args.db_latency_ms / 1000,
+        web_latency=web_latency or 0.0,
+        trigger_mode=args.trigger_mode,
+        runtime=args.runtime,
+        priority_aging=args.priority_aging_sec,
+    )
+    result['speed'] = args.speed
+    result['trace_span_sec'] = round(workload[-1][0], 3)
+    result['recorded_job_ms'] = {
+        name: round(percentile(recorded, q) * 1000, 1) if recorded else None
+        for name, q in (('p50', 0.50), ('p95', 0.95), ('p99', 0.99), ('max', 1.0))
+    }
+
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+        return result
+
+    _print_report(result)
+    actions = {}
+    for _, _, _, item in workload:
+        action = item.get('action') or 'checkin'
+        actions[action] = actions.get(action, 0) + 1
+    recorded_ms = result['recorded_job_ms']
+    print(f"  - 추적: {result['trace_span_sec']}s 구간을 {args.speed:g}배로 재현, 액션별 "
+          + ", ".join(f"{action} {count}건" for action, count in sorted(actions.items())))
+    print(f"  - 원래 처리 시간(ms, 수신→완료): p50={recorded_ms['p50']} p95={recorded_ms['p95']} "
+          f"p99={recorded_ms['p99']} max={recorded_ms['max']}")
+    return result
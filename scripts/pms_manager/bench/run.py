@@ -0,0 +1,364 @@
+"""로컬 대체 구현으로 매니저 전체 경로를 돌려 처리량/지연을 잰다
+
+Firebase(메모리 DB) → 파이프라인 → 트리거 파일 → 가짜 AHK → completed 기록 →
+Sheets 동기화(로컬 웹앱)까지 실제 PropertyManager 코드를 그대로 사용한다.
+"""
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+
+from .. import firebase
+from ..cleanup import DeletionScheduler
+from ..config import ManagerConfig, PropertyConfig
+from ..journal import JobJournal
+from ..logger import configure_logging, shutdown_logging
+from ..property import PropertyManager
+from ..sheets_sync import SheetsSyncQueue
+from ..web_app import ACTION_STATUS, WebAppClient
+from ..writes import WriteBatcher
+from .fake_ahk import FakeAutomator, FakeSocketAutomator, FakeSpoolAutomator
+from .fake_firebase import FakeDatabase
+from .fake_firebase_server import FakeFirebaseServer
+from .fake_web_app import FakeWebApp
+
+DEFAULT_ITEMS = 200
+DEFAULT_ROOMS = 50
+# 처리가 멈춘 것으로 보고 포기하기까지 기다리는 시간(초)
+RUN_TIMEOUT = 600
+
+
+def percentile(values, q):
+    """정렬된 값 목록의 nearest-rank 백분위수"""
+    if not values:
+        return None
+    index = min(len(values) - 1, max(0, int(round(q * len(values) + 0.5)) - 1))
+    return values[index]
+
+
+class CompletionTracker:
+    """큐 항목의 status가 completed/failed로 바뀌는 시각을 기록"""
+
+    def __init__(self, expected):
+        self.expected = expected
+        self.pushed = {}
+        self.actions = {}
+        self.finished = {}
+        self.failed = 0
+        self._cond = threading.Condition()
+
+    def pushed_at(self, path, action):
+        with self._cond:
+            self.pushed[path] = time.monotonic()
+            self.actions[path] = action
+
+    def observe(self, op, path, value):
+        if not path.endswith('/status') or value not in ('completed', 'failed'):
+            return
+        item_path = path[:-len('/status')]
+        with self._cond:
+            if item_path not in self.pushed or item_path in self.finished:
+                return
+            self.finished[item_path] = time.monotonic()
+            self.failed += value == 'failed'
+            self._cond.notify_all()
+
+    def wait(self, timeout):
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while len(self.finished) < self.expected:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+            return True
+
+    def latencies(self, action=None):
+        with self._cond:
+            return sorted(self.finished[path] - self.pushed[path] for path in self.finished
+                          if action is None or self.actions[path] == action)
+
+
+def _iso_now():
+    return datetime.now(timezone.utc).isoformat(timespec='milliseconds').replace('+00:00', 'Z')
+
+
+def run_benchmark(items=DEFAULT_ITEMS, properties=1, rooms=DEFAULT_ROOMS, housekeeping_share=0.0, **options):
+    """items건을 한꺼번에 넣고 결과 요약(dict) 반환. housekeeping_share 비율만큼 앞쪽 항목을
+    clean 액션으로 넣는다. 나머지 옵션은 run_workload와 같다"""
+    room_numbers = [str(101 + i) for i in range(rooms)]
+    names = [f"property{index + 1}" for index in range(properties)]
+    housekeeping = round(items * housekeeping_share)
+    workload = []
+    for i in range(items):
+        # 청소 상태 변경이 몰린 뒤 체크인이 들어오는 상황
+        workload.append((0.0, names[i % properties], f"bench{i:06d}", {
+            'roomNumber': room_numbers[i % rooms],
+            'guestName': f"손님{i}",
+            'action': 'clean' if i < housekeeping else 'checkin',
+        }))
+    return run_workload(workload, names, room_numbers, **options)
+
+
+def run_workload(workload, property_names, room_numbers, speed=1.0, ahk_poll=0.02,
+                 ahk_delay=0.05, ahk_delays=None, db_latency=0.0, web_latency=0.0, watch_poll=0.05,
+                 use_notifications=True, trigger_mode='file', spool_batch=1, spool_pending=8,
+                 ahk_item_delay=0.0, runtime='threads', priority_aging=30.0, web_outage=0.0,
+                 circuit_open=1.0):
+    """workload [(시작 후 초, property 이름, queue_id, 항목)]를 시각에 맞춰(speed배) 넣고 결과 요약 반환
+
+    ahk_delays {queue_id: 초}가 있으면 가짜 AHK가 항목별로 그 시간만큼 처리한다 (파일 트리거, 소켓)
+    """
+    work_dir = tempfile.mkdtemp(prefix='pms_bench_')
+    items = len(workload)
+    properties = len(property_names)
+    database = FakeDatabase(write_latency=db_latency)
+    web_app = FakeWebApp(room_numbers, latency=web_latency, outage=web_outage)
+
+    property_configs = []
+    for name in property_names:
+        directory = os.path.join(work_dir, name)
+        os.makedirs(directory)
+        property_configs.append(PropertyConfig(
+            name=name,
+            queue_path=f"pms_queue/{name}",
+            status_path=f"pms_status/{name}",
+            trigger_file=os.path.join(directory, 'pms_trigger.txt'),
+            room_status_json=os.path.join(directory, 'room_status.json'),
+            log_file=os.path.join(directory, 'listener.log'),
+            spool_dir=os.path.join(directory, 'spool'),
+            ahk_log_file=os.path.join(directory, 'ahk_log.txt'),
+        ))
+
+    # asyncio 실행 방식은 FakeDatabase를 REST/SSE로 내보내는 로컬 서버에 접속
+    firebase_server = FakeFirebaseServer(database, keepalive_interval=1.0) if runtime == 'asyncio' else None
+
+    settings = ManagerConfig(
+        credentials_path='',
+        database_url=firebase_server.url if firebase_server is not None else '',
+        runtime=runtime,
+        web_app_url=web_app.url,
+        log_file=os.path.join(work_dir, 'manager.log'),
+        log_level='WARNING',
+        watch_poll_interval=watch_poll,
+        watch_use_notifications=use_notifications,
+        trigger_mode=trigger_mode,
+        spool_max_pending=spool_pending,
+        spool_batch_size=spool_batch,
+        priority_aging=priority_aging,
+        sheets_backlog_file=os.path.join(work_dir, 'sheets_backlog.json'),
+        journal_file=os.path.join(work_dir, 'pms_journal.db'),
+        metrics_port=0,
+        properties=property_configs,
+    )
+    configure_logging(settings.log_level)
+    firebase.use_database(database)
+
+    tracker = CompletionTracker(items)
+    database.add_observer(tracker.observe)
+
+    def log(message):
+        pass
+
+    client = WebAppClient(web_app.url, room_cache_ttl=settings.room_cache_ttl,
+                          circuit_failures=settings.web_app_circuit_failures, circuit_open_time=circuit_open,
+                          log=log)
+    sheets_sync = SheetsSyncQueue(client, settings.sheets_backlog_file, log)
+    writes = WriteBatcher(log, batch_window=settings.write_batch_window, rate=settings.write_rate,
+                          burst=settings.write_burst)
+    cleanup = DeletionScheduler(log, writes, delay=settings.queue_delete_delay)
+    journal = JobJournal(settings.journal_file, retention_days=settings.journal_retention_days)
+    async_runtime = None
+    if firebase_server is not None:
+        # httpx가 필요한 asyncio 실행 방식은 선택할 때만 불러온다 (manager.py와 같음)
+        from ..aio.runtime import AsyncRuntime
+        async_runtime = AsyncRuntime(settings, sheets_sync, cleanup, journal, writes, log)
+        managers = async_runtime.managers
+        runtime_thread = threading.Thread(target=async_runtime.run, name="bench-asyncio", daemon=True)
+    else:
+        managers = [PropertyManager(p, settings, sheets_sync, cleanup, journal, writes)
+                    for p in property_configs]
+    if trigger_mode == 'spool':
+        automators = [FakeSpoolAutomator(p.spool_dir, ahk_poll, ahk_delay, ahk_item_delay)
+                      for p in property_configs]
+    elif trigger_mode == 'socket':
+        # 실행기가 시작할 때 빈 포트를 고르므로 매니저 시작 후에 붙인다
+        automators = []
+    else:
+        automators = [FakeAutomator(p.trigger_file, ahk_poll, ahk_delay + ahk_item_delay, ahk_delays,
+                                    log_file=p.ahk_log_file)
+                      for p in property_configs]
+
+    try:
+        web_app.start()
+        writes.start()
+        sheets_sync.start()
+        cleanup.start()
+        for automator in automators:
+            automator.start()
+        if async_runtime is not None:
+            firebase_server.start()
+            runtime_thread.start()
+            async_runtime.ready.wait(30)
+        else:
+            for manager in managers:
+                manager.start()
+        if trigger_mode == 'socket':
+            for manager in managers:
+                automator = FakeSocketAutomator(manager.executor.port, ahk_delay + ahk_item_delay, ahk_delays)
+                automator.start()
+                automators.append(automator)
+
+        queue_paths = {config.name: config.queue_path for config in property_configs}
+        started = time.monotonic()
+        for offset, name, queue_id, item in workload:
+            wait = started + offset / speed - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            path = f"{queue_paths[name]}/{queue_id}"
+            tracker.pushed_at(path, item.get('action'))
+            firebase.reference(path).set(dict(item, status='pending', createdAt=_iso_now()))
+
+        completed = tracker.wait(RUN_TIMEOUT)
+        elapsed = time.monotonic() - started
+
+        # Sheets 전송까지 끝나야 한 사이클
+        deadline = time.monotonic() + 30
+        while len(sheets_sync) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        sheets_elapsed = time.monotonic() - started
+
+        latencies = tracker.latencies()
+        by_action = {}
+        for action in ACTION_STATUS:
+            values = tracker.latencies(action)
+            if values:
+                by_action[action] = {name: round(percentile(values, q) * 1000, 1)
+                                     for name, q in (('p50', 0.50), ('p95', 0.95), ('max', 1.0))}
+        return {
+            'items': items,
+            'properties': properties,
+            'trigger_mode': trigger_mode,
+            'runtime': runtime,
+            'completed': len(latencies) - tracker.failed,
+            'failed': tracker.failed,
+            'timed_out': not completed,
+            'elapsed_sec': round(elapsed, 3),
+            'items_per_sec': round(len(latencies) / elapsed, 2) if elapsed else None,
+            'latency_ms': {
+                name: round(percentile(latencies, q) * 1000, 1) if latencies else None
+                for name, q in (('p50', 0.50), ('p95', 0.95), ('p99', 0.99), ('max', 1.0))
+            },
+            'latency_by_action_ms': by_action,
+            'sheets_drained_sec': round(sheets_elapsed, 3),
+            'sheets_updates': len(web_app.updates),
+            'sheets_backlog': len(sheets_sync),
+            'firebase_writes': database.write_count,
+            'write_batches': writes.stats(),
+            'http': client.stats.snapshot(),
+            'web_app_unavailable': web_app.unavailable,
+            'circuit': client.breaker.snapshot(),
+            'stages': {manager.name: manager.pipeline.stats() for manager in managers},
+        }
+    finally:
+        if async_runtime is not None:
+            async_runtime.stop()
+            runtime_thread.join(10)
+            firebase_server.stop()
+        else:
+            for manager in managers:
+                manager.stop()
+        for automator in automators:
+            automator.stop()
+        sheets_sync.stop()
+        cleanup.stop()
+        writes.stop()
+        journal.close()
+        client.close()
+        web_app.stop()
+        firebase.use_database(None)
+        shutdown_logging()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def _print_report(result):
+    latency = result['latency_ms']
+    print("=" * 60)
+    print(f"📊 PMS 매니저 벤치마크 ({result['items']}건, Property {result['properties']}개, "
+          f"트리거 {result['trigger_mode']}, {result['runtime']})")
+    print("=" * 60)
+    print(f"  - 완료/실패: {result['completed']} / {result['failed']}"
+          + ("  ⏱️ 시간 초과" if result['timed_out'] else ""))
+    print(f"  - 전체 시간: {result['elapsed_sec']}s")
+    print(f"  - 처리량: {result['items_per_sec']} items/sec")
+    print(f"  - 지연(ms): p50={latency['p50']} p95={latency['p95']} "
+          f"p99={latency['p99']} max={latency['max']}")
+    if len(result['latency_by_action_ms']) > 1:
+        for action, values in result['latency_by_action_ms'].items():
+            print(f"    - {action}: p50={values['p50']} p95={values['p95']} max={values['max']}")
+    print(f"  - Sheets: {result['sheets_updates']}건 전송, 남은 대기 {result['sheets_backlog']}건 "
+          f"({result['sheets_drained_sec']}s)")
+    print(f"  - Firebase 쓰기: {result['firebase_writes']}회 (배처: {result['write_batches']})")
+    print(f"  - 웹앱 연결: {result['http']}")
+    if result['web_app_unavailable'] or result['circuit']['opened']:
+        print(f"  - 웹앱 장애: 503 응답 {result['web_app_unavailable']}회, 차단기 {result['circuit']}")
+    for name, stages in result['stages'].items():
+        for stage, stats in stages.items():
+            print(f"  - {name}/{stage}: 평균 {stats['avg_ms']}ms, 최대 {stats['max_ms']}ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="PMS 매니저 로컬 벤치마크")
+    parser.add_argument('--items', type=int, default=DEFAULT_ITEMS, help="한꺼번에 넣을 큐 항목 수")
+    parser.add_argument('--properties', type=int, default=1, help="동시에 돌릴 Property 수")
+    parser.add_argument('--rooms', type=int, default=DEFAULT_ROOMS, help="웹앱 객실 수")
+    parser.add_argument('--ahk-poll-ms', type=float, default=20, help="가짜 AHK 트리거 확인 주기")
+    parser.add_argument('--ahk-delay-ms', type=float, default=50, help="가짜 AHK 한 번 실행하는 시간")
+    parser.add_argument('--ahk-item-delay-ms', type=float, default=0, help="가짜 AHK 객실 하나당 추가 시간")
+    parser.add_argument('--trigger-mode', choices=('file', 'spool', 'socket'), default='file', help="트리거 전달 방식")
+    parser.add_argument('--spool-batch', type=int, default=1, help="스풀 매니페스트 하나에 묶을 최대 작업 수")
+    parser.add_argument('--spool-pending', type=int, default=8, help="스풀에 미리 넘겨 둘 최대 작업 수")
+    parser.add_argument('--db-latency-ms', type=float, default=0, help="Firebase 쓰기 왕복 지연")
+    parser.add_argument('--web-latency-ms', type=float, default=0, help="웹앱 응답 지연")
+    parser.add_argument('--web-outage-sec', type=float, default=0, help="시작 후 이 시간 동안 웹앱이 503 응답")
+    parser.add_argument('--circuit-open-sec', type=float, default=1.0, help="웹앱 차단기가 처음 열려 있는 시간")
+    parser.add_argument('--watch-poll-ms', type=float, default=50, help="트리거 파일 폴링 주기")
+    parser.add_argument('--no-notify', action='store_true', help="OS 파일 알림 대신 폴링만 사용")
+    parser.add_argument('--runtime', choices=('threads', 'asyncio'), default='threads',
+                        help="asyncio면 로컬 REST/SSE 서버를 띄워 AsyncRuntime으로 실행")
+    parser.add_argument('--housekeeping-share', type=float, default=0.0,
+                        help="앞쪽에 몰아서 넣을 clean 액션 비율 (0~1)")
+    parser.add_argument('--priority-aging-sec', type=float, default=30.0,
+                        help="체크인 외 액션이 양보하는 최대 시간 (0이면 들어온 순서)")
+    parser.add_argument('--json', action='store_true', help="결과를 JSON으로 출력")
+    args = parser.parse_args(argv)
+
+    result = run_benchmark(
+        items=args.items,
+        properties=args.properties,
+        rooms=args.rooms,
+        ahk_poll=args.ahk_poll_ms / 1000,
+        ahk_delay=args.ahk_delay_ms / 1000,
+        db_latency=args.db_latency_ms / 1000,
+        web_latency=args.web_latency_ms / 1000,
+        watch_poll=args.watch_poll_ms / 1000,
+        use_notifications=not args.no_notify,
+        trigger_mode=args.trigger_mode,
+        spool_batch=args.spool_batch,
+        spool_pending=args.spool_pending,
+        ahk_item_delay=args.ahk_item_delay_ms / 1000,
+        runtime=args.runtime,
+        housekeeping_share=args.housekeeping_share,
+        priority_aging=args.priority_aging_sec,
+        web_outage=args.web_outage_sec,
+        circuit_open=args.circuit_open_sec,
+    )
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+    else:
+        _print_report(result)
+    return result
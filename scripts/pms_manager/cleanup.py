@@ -0,0 +1,89 @@
+"""완료/실패 큐 항목 지연 삭제 스케줄러
+
+키오스크가 completed/failed 상태를 읽을 시간을 준 뒤 삭제해야 하므로,
+처리 스레드에서 sleep 하는 대신 힙에 (삭제 시각, 경로)를 넣어두고
+백그라운드 스레드가 같은 시점에 도래한 항목을 쓰기 배처에 한 번에 넘겨 지운다.
+"""
+import heapq
+import threading
+import time
+
+DEFAULT_DELETE_DELAY = 5.0
+# 이 간격 안에 도래하는 삭제는 한 번의 update로 묶는다
+DEFAULT_GROUP_WINDOW = 0.5
+
+
+class DeletionScheduler:
+    """루트 기준 경로 삭제를 지연 실행"""
+
+    def __init__(self, log, writes, delay=DEFAULT_DELETE_DELAY, group_window=DEFAULT_GROUP_WINDOW):
+        self.log = log
+        self.writes = writes
+        self.delay = delay
+        self.group_window = group_window
+        self._heap = []
+        self._cond = threading.Condition()
+        self._running = False
+        self._thread = None
+
+    def __len__(self):
+        with self._cond:
+            return len(self._heap)
+
+    def schedule(self, path, delay=None):
+        due = time.monotonic() + (self.delay if delay is None else delay)
+        with self._cond:
+            heapq.heappush(self._heap, (due, path.strip('/')))
+            self._cond.notify()
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="queue-cleanup", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=5.0):
+        """대기 중인 삭제를 즉시 실행하고 종료"""
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _take_due(self, now):
+        paths = []
+        while self._heap and self._heap[0][0] <= now + self.group_window:
+            paths.append(heapq.heappop(self._heap)[1])
+        return paths
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._running:
+                    if self._heap:
+                        wait = self._heap[0][0] - time.monotonic()
+                        if wait <= 0:
+                            break
+                        self._cond.wait(wait)
+                    else:
+                        self._cond.wait()
+
+                if self._running:
+                    paths = self._take_due(time.monotonic())
+                else:
+                    paths = [path for _, path in self._heap]
+                    self._heap.clear()
+
+            if paths:
+                self._delete(paths)
+            if not self._running:
+                return
+
+    def _delete(self, paths):
+        try:
+            self.writes.submit({path: None for path in paths}).result()
+            self.log(f"🗑️ 큐 항목 삭제: {len(paths)}건")
+        except Exception as e:
+            self.log(f"❌ 큐 항목 삭제 실패: {e}")
+            if self._running:
+                for path in paths:
+                    self.schedule(path)
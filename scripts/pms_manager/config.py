@@ -0,0 +1,231 @@
+"""매니저 설정 파일(JSON) 로드"""
+import json
+import os
+from dataclasses import dataclass, field
+from typing import List
+
+DEFAULT_DATABASE_URL = "https://kiosk-pms-default-rtdb.asia-southeast1.firebasedatabase.app/"
+DEFAULT_WEB_APP_URL = "https://v0-pms-seven.vercel.app/"
+TRIGGER_MODES = ('file', 'spool', 'socket')
+RUNTIMES = ('threads', 'asyncio')
+DEFAULT_CONFIG_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    'pms_manager_config.json',
+)
+
+
+class ConfigError(Exception):
+    """설정 파일 오류"""
+
+
+@dataclass
+class PropertyConfig:
+    name: str
+    queue_path: str
+    status_path: str
+    trigger_file: str
+    room_status_json: str
+    log_file: str
+    # trigger_mode가 'spool'일 때 작업/ack 파일을 주고받는 디렉터리
+    spool_dir: str = ''
+    # AHK 스크립트 로그: 트리거 감지/오류를 읽어 빨리 실패 처리 (파일이 없으면 감시 안 함)
+    ahk_log_file: str = ''
+    # trigger_mode가 'socket'일 때 자동화 쪽이 접속하는 포트 (0이면 socket_base_port + 목록 순서)
+    socket_port: int = 0
+
+
+@dataclass
+class ManagerConfig:
+    credentials_path: str
+    database_url: str = DEFAULT_DATABASE_URL
+    web_app_url: str = DEFAULT_WEB_APP_URL
+    api_key: str = ''
+    log_file: str = ''
+    # 'threads'(Firebase SDK 리스너 + 스레드 파이프라인) 또는 'asyncio'(REST 스트림 + 이벤트 루프 하나)
+    runtime: str = 'threads'
+    # DEBUG로 두면 이벤트별 상세 데이터까지 기록
+    log_level: str = 'INFO'
+    log_max_bytes: int = 10 * 1024 * 1024
+    log_backup_count: int = 5
+    # 트리거/상태 파일 감시: OS 알림이 없을 때 폴링 주기(초)
+    watch_poll_interval: float = 0.05
+    watch_use_notifications: bool = True
+    # 트리거 대기 시간(초): 액션별 처리 시간 기록이 쌓이면 factor × p95를 [min, trigger_timeout]로 자른 값
+    trigger_timeout: float = 60.0
+    trigger_timeout_min: float = 10.0
+    trigger_timeout_factor: float = 3.0
+    # 트리거를 쓴 뒤 ahk_log.txt에 감지 기록이 없으면 실패로 보는 시간(초, 0이면 감시 안 함)
+    ahk_start_timeout: float = 5.0
+    # PMS 자동화 순서: priority_actions는 먼저, 나머지 액션은 최대 priority_aging초까지 양보 (0이면 들어온 순서)
+    priority_actions: List[str] = field(default_factory=lambda: ['checkin'])
+    priority_aging: float = 30.0
+    # status가 pending인 큐 항목만 서버에서 걸러 받기 (pms_queue/$property/.indexOn: status 필요)
+    listen_pending_only: bool = True
+    # 트리거 전달 방식: 'file'(단일 트리거 파일), 'spool'(순번 작업 디렉터리), 'socket'(루프백 TCP)
+    trigger_mode: str = 'file'
+    socket_host: str = '127.0.0.1'
+    socket_base_port: int = 9120
+    # 소켓 모드: 자동화 쪽 연결이 없을 때 작업을 넘기지 못한 채 기다리는 최대 시간(초, 0이면 연결될 때까지)
+    socket_connect_timeout: float = 5.0
+    # 스풀/소켓 모드: 자동화 쪽에 한꺼번에 넘겨 둘 최대 작업 수
+    spool_max_pending: int = 8
+    # 스풀 모드: 매니페스트 하나로 묶을 작업 수/모으는 시간(초)
+    spool_batch_size: int = 1
+    spool_batch_window: float = 0.1
+    # room_status.json 연속 쓰기가 멈췄다고 보는 시간(초)
+    room_status_debounce: float = 0.2
+    # 웹앱 객실 목록(객실 번호 → ID) 캐시 유지 시간(초)
+    room_cache_ttl: float = 300.0
+    # 웹앱 HTTP: 연결/응답 타임아웃(초)과 멱등 요청 재시도 횟수
+    http_connect_timeout: float = 3.05
+    http_read_timeout: float = 10.0
+    http_max_retries: int = 2
+    # 웹앱 차단기: 연속 실패 횟수, 처음 차단 시간(초). 차단 중 Sheets 업데이트는 대기 목록에 남긴다
+    web_app_circuit_failures: int = 5
+    web_app_circuit_open: float = 30.0
+    # 아직 전송하지 못한 Google Sheets 업데이트 저장 파일
+    sheets_backlog_file: str = ''
+    # 완료/실패 처리된 큐 항목을 삭제하기까지 대기 시간(초)
+    queue_delete_delay: float = 5.0
+    # Firebase 쓰기 배처: 합치는 구간(초), 초당 최대 커밋 수(0이면 제한 없음)와 순간 허용량
+    write_batch_window: float = 0.02
+    write_rate: float = 20.0
+    write_burst: int = 5
+    # 큐 처리 파이프라인: 단계별 대기열 크기, 검증/후처리 워커 수
+    pipeline_queue_size: int = 100
+    pipeline_workers: int = 2
+    # 큐 항목 처리 이력 저널(SQLite)과 완료 항목 보관 기간(일)
+    journal_file: str = ''
+    journal_retention_days: int = 7
+    # 로컬 /metrics 포트 (0이면 끔), pms_status/<property>/metrics 요약 업로드 주기(초)
+    metrics_port: int = 9108
+    metrics_summary_interval: float = 60.0
+    # 현장 키오스크용 객실 상태 조회 엔드포인트 (0이면 끔). 다른 PC에서 읽으려면 host를 0.0.0.0으로
+    room_status_port: int = 9109
+    room_status_host: str = '127.0.0.1'
+    # 처리 경로 추적(JSONL) 저장 폴더. 비어 있으면 기록하지 않음 (pms_replay.py로 재현)
+    trace_dir: str = ''
+    # 항목별 처리 이벤트 저장 파일(빈 문자열이면 끔)과 보관 기간
+    event_log_file: str = ''
+    event_log_retention_days: int = 30
+    properties: List[PropertyConfig] = field(default_factory=list)
+
+
+def _property_from_dict(raw, base_dir):
+    name = raw.get('name')
+    if not name:
+        raise ConfigError("property 항목에 name 없음")
+
+    # 경로를 생략하면 C:\PMS\Property1\ 과 같은 기존 배치 규칙을 따른다
+    base_dir = raw.get('base_dir') or os.path.join(base_dir, name.capitalize())
+
+    def path(key, filename):
+        return raw.get(key) or os.path.join(base_dir, filename)
+
+    return PropertyConfig(
+        name=name,
+        queue_path=raw.get('queue_path') or f"pms_queue/{name}",
+        status_path=raw.get('status_path') or f"pms_status/{name}",
+        trigger_file=path('trigger_file', 'trigger.txt'),
+        room_status_json=path('room_status_json', 'room_status.json'),
+        log_file=path('log_file', 'listener.log'),
+        spool_dir=path('spool_dir', 'spool'),
+        ahk_log_file=path('ahk_log_file', 'ahk_log.txt'),
+        socket_port=raw.get('socket_port', 0),
+    )
+
+
+def load_config(config_path):
+    """설정 파일을 읽어 ManagerConfig 반환"""
+    try:
+        with open(config_path, 'r', encoding='utf-8-sig') as f:
+            raw = json.load(f)
+    except (OSError, ValueError) as e:
+        raise ConfigError(f"설정 파일 읽기 실패: {config_path} ({e})") from e
+
+    base_dir = raw.get('base_dir', r"C:\PMS")
+    firebase = raw.get('firebase', {})
+
+    credentials_path = firebase.get('credentials_path')
+    if not credentials_path:
+        raise ConfigError("firebase.credentials_path 없음")
+
+    properties = [_property_from_dict(p, base_dir) for p in raw.get('properties', [])]
+    if not properties:
+        raise ConfigError("properties 목록이 비어 있음")
+
+    trigger_mode = raw.get('trigger_mode', 'file')
+    if trigger_mode not in TRIGGER_MODES:
+        raise ConfigError(f"알 수 없는 trigger_mode: {trigger_mode} ({', '.join(TRIGGER_MODES)} 중 하나)")
+
+    runtime = raw.get('runtime', 'threads')
+    if runtime not in RUNTIMES:
+        raise ConfigError(f"알 수 없는 runtime: {runtime} ({', '.join(RUNTIMES)} 중 하나)")
+
+    priority_actions = raw.get('priority_actions', ['checkin'])
+    if not isinstance(priority_actions, list):
+        raise ConfigError(f"priority_actions는 액션 이름 목록이어야 함: {priority_actions}")
+
+    names = [p.name for p in properties]
+    if len(set(names)) != len(names):
+        raise ConfigError(f"중복된 property 이름: {names}")
+
+    socket_base_port = raw.get('socket_base_port', 9120)
+    for index, prop in enumerate(properties):
+        prop.socket_port = prop.socket_port or socket_base_port + index
+    if trigger_mode == 'socket':
+        ports = [p.socket_port for p in properties]
+        if len(set(ports)) != len(ports):
+            raise ConfigError(f"중복된 socket_port: {ports}")
+
+    return ManagerConfig(
+        credentials_path=credentials_path,
+        database_url=firebase.get('database_url', DEFAULT_DATABASE_URL),
+        web_app_url=raw.get('web_app_url', DEFAULT_WEB_APP_URL),
+        api_key=os.environ.get('API_KEY', raw.get('api_key', '')),
+        runtime=runtime,
+        log_file=raw.get('log_file') or os.path.join(base_dir, 'manager.log'),
+        log_level=raw.get('log_level', 'INFO'),
+        log_max_bytes=int(raw.get('log_max_mb', 10) * 1024 * 1024),
+        log_backup_count=raw.get('log_backup_count', 5),
+        watch_poll_interval=raw.get('watch_poll_interval_ms', 50) / 1000,
+        watch_use_notifications=raw.get('watch_use_notifications', True),
+        trigger_timeout=raw.get('trigger_timeout_sec', 60),
+        trigger_timeout_min=raw.get('trigger_timeout_min_sec', 10),
+        trigger_timeout_factor=raw.get('trigger_timeout_factor', 3.0),
+        ahk_start_timeout=raw.get('ahk_start_timeout_sec', 5),
+        priority_actions=priority_actions,
+        priority_aging=raw.get('priority_aging_sec', 30),
+        listen_pending_only=raw.get('listen_pending_only', True),
+        trigger_mode=trigger_mode,
+        socket_host=raw.get('socket_host', '127.0.0.1'),
+        socket_base_port=socket_base_port,
+        socket_connect_timeout=raw.get('socket_connect_timeout_sec', 5),
+        spool_max_pending=raw.get('spool_max_pending', 8),
+        spool_batch_size=raw.get('spool_batch_size', 1),
+        spool_batch_window=raw.get('spool_batch_window_ms', 100) / 1000,
+        room_status_debounce=raw.get('room_status_debounce_ms', 200) / 1000,
+        room_cache_ttl=raw.get('room_cache_ttl_sec', 300),
+        http_connect_timeout=raw.get('http_connect_timeout_sec', 3.05),
+        http_read_timeout=raw.get('http_read_timeout_sec', 10),
+        http_max_retries=raw.get('http_max_retries', 2),
+        web_app_circuit_failures=raw.get('web_app_circuit_failures', 5),
+        web_app_circuit_open=raw.get('web_app_circuit_open_sec', 30),
+        sheets_backlog_file=raw.get('sheets_backlog_file') or os.path.join(base_dir, 'sheets_backlog.json'),
+        queue_delete_delay=raw.get('queue_delete_delay_sec', 5),
+        write_batch_window=raw.get('write_batch_window_ms', 20) / 1000,
+        write_rate=raw.get('write_rate', 20),
+        write_burst=raw.get('write_burst', 5),
+        pipeline_queue_size=raw.get('pipeline_queue_size', 100),
+        pipeline_workers=raw.get('pipeline_workers', 2),
+        journal_file=raw.get('journal_file') or os.path.join(base_dir, 'pms_journal.db'),
+        journal_retention_days=raw.get('journal_retention_days', 7),
+        metrics_port=raw.get('metrics_port', 9108),
+        metrics_summary_interval=raw.get('metrics_summary_interval_sec', 60),
+        room_status_port=raw.get('room_status_port', 9109),
+        room_status_host=raw.get('room_status_host', '127.0.0.1'),
+        trace_dir=raw.get('trace_dir', ''),
+        event_log_file=raw.get('event_log_file', os.path.join(base_dir, 'pms_events.db')),
+        event_log_retention_days=raw.get('event_log_retention_days', 30),
+        properties=properties,
+    )
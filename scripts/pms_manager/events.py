@@ -0,0 +1,246 @@
+"""항목 처리 이벤트 기록 (SQLite, 추가 전용) + 조회 CLI
+
+listener.log는 사람이 읽는 문장이라 객실 하나의 이력을 보려면 파일 전체를 뒤져야 한다.
+여기에는 같은 처리 경로를 (시각, 날짜, property, queue_id, 객실, 액션, 종류, 내용) 행으로
+남기고 queue_id / 객실+날짜 / 액션+날짜 / 날짜 색인을 두어, "오늘 C103에 무슨 일이 있었나"를
+기록 양과 관계없이 바로 찾는다. 손님 이름 등 개인정보는 남기지 않는다.
+객실 번호는 웹앱과 같은 규칙(normalize_room_number)으로 맞춰 저장/조회하므로 c103, C 103도 C103으로 찾는다.
+
+record()는 큐에 넣기만 하고 전용 스레드가 모아서 한 트랜잭션으로 쓴다. start() 전에는 아무 일도 하지 않는다.
+
+    received   큐 항목 접수
+    trigger    트리거/스풀 전달 (phase=written|consumed|timeout|failed|blocked)
+    job        항목 처리 끝 (result=success|failure|timeout, error)
+    sheets     Google Sheets 상태 전송 (result)
+
+조회: python pms_events.py --room C103 [--day 2025-03-01] [--property property1] [--json]
+"""
+import argparse
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+from .config import DEFAULT_CONFIG_PATH, ConfigError, load_config
+from .web_app import ACTION_STATUS, normalize_room_number
+
+DEFAULT_RETENTION_DAYS = 30
+DEFAULT_LIMIT = 200
+# 한 트랜잭션으로 쓰는 최대 행 수
+MAX_BATCH = 500
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS events (
+        id INTEGER PRIMARY KEY,
+        ts REAL NOT NULL,
+        day TEXT NOT NULL,
+        property TEXT,
+        queue_id TEXT,
+        room_number TEXT,
+        action TEXT,
+        kind TEXT NOT NULL,
+        message TEXT,
+        data TEXT
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS events_queue_id ON events (queue_id)",
+    "CREATE INDEX IF NOT EXISTS events_room_day ON events (room_number, day)",
+    "CREATE INDEX IF NOT EXISTS events_action_day ON events (action, day)",
+    "CREATE INDEX IF NOT EXISTS events_day ON events (day)",
+)
+
+_COLUMNS = ('ts', 'day', 'property', 'queue_id', 'room_number', 'action', 'kind', 'message', 'data')
+
+_STOP = object()
+
+_lock = threading.Lock()
+_queue = None
+_thread = None
+
+
+def enabled():
+    return _queue is not None
+
+
+def _connect(path):
+    conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+def start(path, retention_days=DEFAULT_RETENTION_DAYS):
+    global _queue, _thread
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    conn = _connect(path)
+    for statement in _SCHEMA:
+        conn.execute(statement)
+    cutoff = time.strftime('%Y-%m-%d', time.localtime(time.time() - retention_days * 86400))
+    conn.execute("DELETE FROM events WHERE day < ?", (cutoff,))
+
+    with _lock:
+        _queue = queue.SimpleQueue()
+        _thread = threading.Thread(target=_run, args=(conn, _queue), name="event-log", daemon=True)
+        _thread.start()
+
+
+def stop(timeout=5.0):
+    """남은 기록을 모두 쓰고 닫는다"""
+    global _queue, _thread
+    with _lock:
+        pending, thread = _queue, _thread
+        _queue = _thread = None
+    if pending is None:
+        return
+    pending.put(_STOP)
+    thread.join(timeout)
+
+
+def record(kind, prop=None, queue_id=None, room_number=None, action=None, message='', **fields):
+    pending = _queue
+    if pending is None:
+        return
+    now = time.time()
+    pending.put((
+        now,
+        time.strftime('%Y-%m-%d', time.localtime(now)),
+        prop,
+        queue_id,
+        normalize_room_number(room_number) or None,
+        action or None,
+        kind,
+        message,
+        json.dumps(fields, ensure_ascii=False, separators=(',', ':'), default=str) if fields else None,
+    ))
+
+
+def _run(conn, pending):
+    while True:
+        item = pending.get()
+        batch = [item]
+        while len(batch) < MAX_BATCH:
+            try:
+                batch.append(pending.get_nowait())
+            except queue.Empty:
+                break
+
+        stop = _STOP in batch
+        rows = [row for row in batch if row is not _STOP]
+        if rows:
+            try:
+                conn.execute("BEGIN")
+                conn.executemany(
+                    f"INSERT INTO events ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})",
+                    rows,
+                )
+                conn.execute("COMMIT")
+            except sqlite3.Error as e:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                print(f"이벤트 기록 실패 ({len(rows)}건): {e}")
+        if stop:
+            conn.close()
+            return
+
+
+def query(path, prop=None, queue_id=None, room_number=None, action=None, day=None, since=None,
+          limit=DEFAULT_LIMIT):
+    """조건에 맞는 이벤트를 시각 순서로. since는 epoch 초. 매니저가 쓰는 중에도 읽을 수 있다(WAL)"""
+    if not os.path.exists(path):
+        raise FileNotFoundError(path)
+
+    clauses, params = [], []
+    for column, value in (('property', prop), ('queue_id', queue_id), ('action', action), ('day', day)):
+        if value:
+            clauses.append(f"{column} = ?")
+            params.append(str(value))
+    if room_number:
+        # 정규화 전에 기록된 행도 찾도록 입력값 그대로도 비교한다
+        clauses.append("room_number IN (?, ?)")
+        params.extend((normalize_room_number(room_number), str(room_number)))
+    if since is not None:
+        clauses.append("ts >= ?")
+        params.append(since)
+        # 날짜 색인을 쓸 수 있도록 구간의 시작 날짜도 조건에 넣는다
+        clauses.append("day >= ?")
+        params.append(time.strftime('%Y-%m-%d', time.localtime(since)))
+
+    sql = f"SELECT {', '.join(_COLUMNS)} FROM events"
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    # 최근 limit건을 고른 뒤 시각 순서로 돌려준다
+    sql += " ORDER BY ts DESC LIMIT ?"
+    params.append(limit)
+
+    conn = _connect(path)
+    try:
+        rows = conn.execute(sql, params).fetchall()
+    finally:
+        conn.close()
+
+    events = []
+    for row in reversed(rows):
+        event = dict(zip(_COLUMNS, row))
+        event['data'] = json.loads(event['data']) if event['data'] else {}
+        events.append(event)
+    return events
+
+
+def _default_path():
+    """pms_manager_config.json의 event_log_file (없으면 C:\\PMS\\pms_events.db)"""
+    try:
+        return load_config(DEFAULT_CONFIG_PATH).event_log_file
+    except ConfigError:
+        return os.path.join(r"C:\PMS", 'pms_events.db')
+
+
+def _format(event):
+    timestamp = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(event['ts']))
+    where = ' '.join(part for part in (event['property'], event['room_number'], event['action']) if part)
+    line = f"[{timestamp}] {where} [{event['kind']}] {event['message']}"
+    if event['queue_id']:
+        line += f" ({event['queue_id']})"
+    return line
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="PMS 매니저 처리 이벤트 조회")
+    parser.add_argument('--db', help="이벤트 파일 (기본: 설정 파일의 event_log_file)")
+    parser.add_argument('--property', help="property 이름")
+    parser.add_argument('--room', help="객실 번호 (예: C103)")
+    parser.add_argument('--queue-id', help="큐 항목 ID (-로 시작하면 --queue-id=-N… 형식)")
+    parser.add_argument('--action', choices=list(ACTION_STATUS), help="액션")
+    parser.add_argument('--day', help="YYYY-MM-DD (기본: 오늘, queue_id로 찾을 때는 전체)")
+    parser.add_argument('--all-days', action='store_true', help="날짜 조건 없이")
+    parser.add_argument('--since-hours', type=float, help="최근 N시간")
+    parser.add_argument('--limit', type=int, default=DEFAULT_LIMIT, help="최근 몇 건까지")
+    parser.add_argument('--json', action='store_true', help="결과를 JSON으로 출력")
+    args = parser.parse_args(argv)
+
+    path = args.db or _default_path()
+    day = args.day
+    if day is None and not (args.all_days or args.queue_id or args.since_hours):
+        day = time.strftime('%Y-%m-%d')
+    since = time.time() - args.since_hours * 3600 if args.since_hours else None
+
+    started = time.monotonic()
+    try:
+        events = query(path, prop=args.property, queue_id=args.queue_id, room_number=args.room,
+                       action=args.action, day=day, since=since, limit=args.limit)
+    except FileNotFoundError:
+        print(f"❌ 이벤트 파일 없음: {path}")
+        return None
+    elapsed = time.monotonic() - started
+
+    if args.json:
+        print(json.dumps(events, ensure_ascii=False, indent=2))
+        return events
+
+    for event in events:
+        print(_format(event))
+    print(f"— {len(events)}건 ({elapsed * 1000:.1f}ms, {path})")
+    return events
@@ -0,0 +1,287 @@
+"""PMS 자동화 실행기: 트리거 파일 대신 작업을 넘기고 순번별 결과(ack)를 받는 전달 방식
+
+trigger_mode별 실행기 (file은 PropertyManager가 트리거 파일을 직접 다룬다):
+
+    spool   TriggerSpool — 순번 작업/ack 파일 (spool.py)
+    socket  SocketExecutor — 루프백 TCP, 한 줄에 JSON 하나
+
+실행기는 모두 같은 방식으로 쓴다:
+
+    start() / stop()
+    submit(payload) → seq          작업 전달 (자동화 쪽이 아직 없으면 연결될 때 전달)
+    wait(seq, timeout)             (경과 시간, ack dict) 또는 타임아웃 시 (None, None)
+                                   자동화 쪽은 순번 순서로 처리하므로 timeout과 경과 시간은 앞선 작업이
+                                   모두 끝나 이 작업 차례가 된 때부터 잰다. 차례는 앞선 작업 하나당
+                                   timeout까지 기다린다 (남은 작업이 멈춰 있어도 끝없이 기다리지 않게)
+    cancel(seq)                    타임아웃된 작업 회수. 이미 넘겨서 회수 못 하면 False
+    find(queue_id)                 재시작 후 이어서 기다릴 순번 (durable이 아니면 항상 None)
+    pending()                      ack를 받지 못한 작업 수
+    label / backend / describe()   로그 표시용
+
+소켓 프로토콜 (UTF-8 JSON lines). 매니저가 socket_host:socket_port에서 기다리고 자동화 쪽이 접속한다.
+새 연결이 들어오면 이전 연결은 닫는다.
+
+    자동화 → 매니저  {"type": "hello", "name": "pms_automator_property1"}          (선택)
+    매니저 → 자동화  {"type": "job", "seq": 42, "queue_id": ..., "room_number": ..., "action": ..., ...}
+    자동화 → 매니저  {"type": "ack", "seq": 42, "success": true, "error": ""}
+    매니저 → 자동화  {"type": "cancel", "seq": 42}                               (타임아웃, 아직 시작 전이면 버릴 것)
+
+연결이 끊기면 이미 넘긴 작업은 처리 여부를 알 수 없으므로 실패로 돌려주고, 아직 넘기지 않은
+작업만 다음 연결에 넘긴다 (같은 작업을 두 번 실행하지 않는다).
+참고 구현: socket_consumer.py (python pms_socket_consumer.py)
+"""
+import json
+import socket
+import threading
+import time
+
+from .spool import TriggerSpool
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_BASE_PORT = 9120
+# 자동화 쪽 연결이 없을 때 작업을 넘기지 못한 채 기다리는 최대 시간(초)
+DEFAULT_CONNECT_TIMEOUT = 5.0
+MAX_LINE_BYTES = 64 * 1024
+
+DISCONNECTED_ERROR = "자동화 연결 끊김 (처리 여부 확인 필요)"
+
+
+def encode_message(message):
+    return (json.dumps(message, ensure_ascii=False, separators=(',', ':')) + '\n').encode('utf-8')
+
+
+def create_executor(config, settings, log):
+    """trigger_mode에 맞는 실행기. file이면 None (트리거 파일)"""
+    if settings.trigger_mode == 'spool':
+        return TriggerSpool(
+            config.spool_dir,
+            log,
+            batch_size=settings.spool_batch_size,
+            batch_window=settings.spool_batch_window,
+            poll_interval=settings.watch_poll_interval,
+            use_notifications=settings.watch_use_notifications,
+        )
+    if settings.trigger_mode == 'socket':
+        return SocketExecutor(
+            settings.socket_host,
+            config.socket_port,
+            log,
+            connect_timeout=settings.socket_connect_timeout or None,
+        )
+    return None
+
+
+class _Job:
+    __slots__ = ('seq', 'payload', 'submitted_at', 'sent', 'ack')
+
+    def __init__(self, seq, payload):
+        self.seq = seq
+        self.payload = payload
+        self.submitted_at = time.monotonic()
+        self.sent = False
+        self.ack = None
+
+
+class SocketExecutor:
+    """루프백 TCP로 작업을 바로 넘기고 ack를 받는 실행기 (자동화 쪽 연결은 하나)"""
+
+    label = "자동화 소켓 대기"
+    # 작업 목록이 메모리에만 있으므로 재시작 후 이어서 기다릴 수 없다
+    durable = False
+
+    def __init__(self, host, port, log, connect_timeout=DEFAULT_CONNECT_TIMEOUT):
+        self.host = host
+        self.port = port
+        self.log = log
+        self.connect_timeout = connect_timeout
+        self._jobs = {}
+        self._seq = 0
+        self._conn = None
+        self._peer = None
+        self._cond = threading.Condition()
+        self._server = None
+        self._thread = None
+        self._running = False
+
+    @property
+    def backend(self):
+        return f"tcp://{self.host}:{self.port}"
+
+    def describe(self):
+        return f"Automation Socket: {self.backend} ({'연결됨: ' + self._peer if self._peer else '연결 대기'})"
+
+    def connected(self):
+        with self._cond:
+            return self._conn is not None
+
+    def start(self):
+        self._server = socket.create_server((self.host, self.port))
+        self.port = self._server.getsockname()[1]
+        self._running = True
+        self._thread = threading.Thread(target=self._accept_loop, name=f"executor-{self.port}", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        server, self._server = self._server, None
+        if server is not None:
+            # close만으로는 accept 대기가 풀리지 않는다
+            _close(server)
+        with self._cond:
+            conn = self._conn
+            self._conn = None
+            self._cond.notify_all()
+        if conn is not None:
+            _close(conn)
+        if self._thread is not None:
+            self._thread.join(2.0)
+            self._thread = None
+
+    def pending(self):
+        with self._cond:
+            return sum(1 for job in self._jobs.values() if job.ack is None)
+
+    def submit(self, payload):
+        with self._cond:
+            self._seq += 1
+            job = _Job(self._seq, dict(payload, type='job', seq=self._seq))
+            self._jobs[job.seq] = job
+            if self._conn is not None:
+                self._send(self._conn, [job])
+            return job.seq
+
+    def find(self, queue_id):
+        return None
+
+    def _ahead(self, seq):
+        """seq보다 앞서 넘겨 아직 ack가 없는 작업 수 (_cond 보유)"""
+        return sum(1 for job in self._jobs.values() if job.seq < seq and job.ack is None)
+
+    def wait(self, seq, timeout):
+        """ack가 올 때까지 대기 (timeout은 차례가 된 때부터). 연결이 없어 connect_timeout 안에
+        넘기지 못하면 실패 ack"""
+        with self._cond:
+            job = self._jobs.get(seq)
+            if job is None:
+                return None, None
+            started = time.monotonic()
+            deadline = started + timeout * (self._ahead(seq) + 1)
+            turn = None
+            while job.ack is None:
+                now = time.monotonic()
+                if (not job.sent and self.connect_timeout is not None
+                        and now - job.submitted_at >= self.connect_timeout):
+                    job.ack = {'seq': seq, 'success': False,
+                               'error': f"자동화 프로그램이 {self.connect_timeout:g}초 안에 연결되지 않음 ({self.backend})"}
+                    break
+                if turn is None and not self._ahead(seq):
+                    turn = now
+                    deadline = min(deadline, turn + timeout)
+                remaining = deadline - now
+                if remaining <= 0:
+                    return None, None
+                if not job.sent and self.connect_timeout is not None:
+                    remaining = min(remaining, job.submitted_at + self.connect_timeout - now)
+                self._cond.wait(max(remaining, 0.0))
+            del self._jobs[seq]
+            return time.monotonic() - (turn if turn is not None else started), job.ack
+
+    def cancel(self, seq):
+        """아직 넘기지 않은 작업이면 회수(True). 넘긴 작업은 cancel 메시지만 보낸다"""
+        with self._cond:
+            job = self._jobs.pop(seq, None)
+            if job is None:
+                return False
+            # 뒤 작업의 차례가 됐을 수 있다
+            self._cond.notify_all()
+            if not job.sent:
+                return True
+            if self._conn is not None:
+                try:
+                    self._conn.sendall(encode_message({'type': 'cancel', 'seq': seq}))
+                except OSError:
+                    pass
+            return False
+
+    def _send(self, conn, jobs):
+        """작업 전송 (_cond 보유). 실패하면 연결을 끊은 것으로 본다"""
+        try:
+            conn.sendall(b''.join(encode_message(job.payload) for job in jobs))
+        except OSError as e:
+            self.log(f"⚠️ 자동화 소켓 전송 실패: {e}")
+            self._drop(conn)
+            return
+        for job in jobs:
+            job.sent = True
+
+    def _drop(self, conn):
+        """연결 정리 (_cond 보유). 넘긴 뒤 ack가 없는 작업은 실패로 돌려준다"""
+        if self._conn is not conn:
+            return
+        self._conn = None
+        self._peer = None
+        lost = [job for job in self._jobs.values() if job.sent and job.ack is None]
+        for job in lost:
+            job.ack = {'seq': job.seq, 'success': False, 'error': DISCONNECTED_ERROR}
+        self._cond.notify_all()
+        _close(conn)
+        if self._running:
+            self.log(f"⚠️ 자동화 연결 끊김" + (f" (처리 중이던 작업 {len(lost)}건 실패 처리)" if lost else ""))
+
+    def _accept_loop(self):
+        while self._running:
+            try:
+                conn, address = self._server.accept()
+            except OSError:
+                return
+            conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            with self._cond:
+                previous = self._conn
+                if previous is not None:
+                    self._drop(previous)
+                self._conn = conn
+                self._peer = f"{address[0]}:{address[1]}"
+                unsent = sorted((job for job in self._jobs.values() if not job.sent), key=lambda job: job.seq)
+                if unsent:
+                    self._send(conn, unsent)
+            self.log(f"🔌 자동화 연결: {self._peer}" + (f" (대기 작업 {len(unsent)}건 전달)" if unsent else ""))
+            threading.Thread(target=self._read_loop, args=(conn,), name=f"executor-{self.port}-read",
+                             daemon=True).start()
+
+    def _read_loop(self, conn):
+        reader = conn.makefile('rb')
+        try:
+            while True:
+                line = reader.readline(MAX_LINE_BYTES)
+                if not line:
+                    break
+                try:
+                    message = json.loads(line.decode('utf-8'))
+                except ValueError:
+                    self.log(f"⚠️ 자동화 소켓: 읽을 수 없는 메시지 {line[:80]!r}")
+                    continue
+                self._handle(message)
+        except OSError:
+            pass
+        finally:
+            with self._cond:
+                self._drop(conn)
+
+    def _handle(self, message):
+        kind = message.get('type')
+        if kind == 'hello':
+            self.log(f"🔌 자동화 프로그램: {message.get('name') or '이름 없음'}")
+        elif kind == 'ack':
+            with self._cond:
+                job = self._jobs.get(message.get('seq'))
+                if job is not None and job.ack is None:
+                    job.ack = message
+                    self._cond.notify_all()
+
+
+def _close(conn):
+    try:
+        conn.shutdown(socket.SHUT_RDWR)
+    except OSError:
+        pass
+    conn.close()
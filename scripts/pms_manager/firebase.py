@@ -0,0 +1,187 @@
+"""공유 Firebase 앱 초기화 + 데이터베이스 참조
+
+매니저의 모든 모듈은 firebase_admin.db 대신 이 모듈의 reference()/listen()을 사용한다.
+벤치마크/재현 도구는 use_database()로 같은 인터페이스의 대체 구현을 끼운다.
+"""
+import json
+import os
+import random
+import threading
+import traceback
+
+import firebase_admin
+from firebase_admin import credentials, db
+
+# Firebase는 30초마다 keep-alive를 보낸다. 이 시간 동안 아무것도 없으면 끊긴 것으로 본다
+STREAM_IDLE_TIMEOUT = 75.0
+STREAM_CONNECT_TIMEOUT = 10.0
+RECONNECT_BACKOFF_BASE = 1.0
+RECONNECT_BACKOFF_MAX = 30.0
+
+_database = db
+
+
+def use_database(database):
+    """reference(path)를 제공하는 객체로 교체. None이면 firebase_admin.db로 복귀"""
+    global _database
+    _database = database if database is not None else db
+
+
+def reference(path='/'):
+    return _database.reference(path)
+
+
+class StreamError(Exception):
+    """REST 스트림 연결 실패. status는 HTTP 상태 코드 (연결 자체가 안 됐으면 None)"""
+
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.status = status
+
+
+class StreamEvent:
+    """SDK의 db.Event와 같은 속성 (event_type, path, data)"""
+
+    def __init__(self, event_type, path, data):
+        self.event_type = event_type
+        self.path = path
+        self.data = data
+
+
+def parse_sse(lines):
+    """SSE 한 블록(빈 줄까지)의 event/data 줄을 (event, data 문자열)로"""
+    event_type, data = None, []
+    for line in lines:
+        if line.startswith('event:'):
+            event_type = line[6:].strip()
+        elif line.startswith('data:'):
+            data.append(line[5:].lstrip())
+    return event_type, '\n'.join(data)
+
+
+def query_params(order_by_child=None, equal_to=None):
+    """REST 질의 파라미터. 값은 JSON 문자열이어야 한다 (orderBy="status")"""
+    params = {}
+    if order_by_child:
+        params['orderBy'] = json.dumps(order_by_child)
+    if equal_to is not None:
+        params['equalTo'] = json.dumps(equal_to)
+    return params
+
+
+class QueryListener:
+    """조건을 붙인 REST 스트림을 읽는 리스너 스레드 (SDK listen()은 조건을 받지 않음)
+
+    콜백/close()는 SDK의 ListenerRegistration과 같다. 첫 연결 실패는 생성자에서 StreamError로
+    알리고(.indexOn 규칙 없음 등), 이후 끊김은 백오프 후 다시 연결한다.
+    """
+
+    def __init__(self, url, params, callback, session, log=None):
+        self.url = url
+        self.params = params
+        self.callback = callback
+        self.log = log or (lambda message: None)
+        self._session = session
+        self._stop = threading.Event()
+        self._response = self._connect()
+        self._thread = threading.Thread(target=self._run, name="firebase-query-listener", daemon=True)
+        self._thread.start()
+
+    def _connect(self):
+        response = self._session.get(
+            self.url,
+            params=self.params,
+            headers={'Accept': 'text/event-stream'},
+            stream=True,
+            timeout=(STREAM_CONNECT_TIMEOUT, STREAM_IDLE_TIMEOUT),
+        )
+        if response.status_code != 200:
+            detail = response.text[:200]
+            response.close()
+            raise StreamError(f"스트림 연결 실패: {response.status_code} {detail}", response.status_code)
+        response.encoding = 'utf-8'
+        return response
+
+    def _read(self, response):
+        block = []
+        for line in response.iter_lines(decode_unicode=True):
+            if self._stop.is_set():
+                return
+            if line:
+                block.append(line)
+                continue
+            event_type, data = parse_sse(block)
+            block = []
+            if event_type in ('put', 'patch'):
+                payload = json.loads(data)
+                self.callback(StreamEvent(event_type, payload.get('path', '/'), payload.get('data')))
+            elif event_type == 'cancel':
+                raise StreamError(f"스트림 취소됨: {data}")
+            elif event_type == 'auth_revoked':
+                raise StreamError("인증 만료")
+        raise StreamError("스트림 연결 종료")
+
+    def _run(self):
+        failures = 0
+        while not self._stop.is_set():
+            try:
+                if self._response is None:
+                    self._response = self._connect()
+                    failures = 0
+                self._read(self._response)
+            except Exception as e:
+                if self._stop.is_set():
+                    return
+                if self._response is not None:
+                    self._response.close()
+                    self._response = None
+                failures += 1
+                delay = min(RECONNECT_BACKOFF_MAX, RECONNECT_BACKOFF_BASE * (2 ** (failures - 1)))
+                delay *= random.uniform(0.5, 1.0)
+                self.log(f"⚠️ 스트림 재연결 ({delay:.1f}초 후): {e}")
+                self._stop.wait(delay)
+
+    def close(self):
+        self._stop.set()
+        response = self._response
+        if response is not None:
+            response.close()
+
+
+def listen(path, callback, order_by_child=None, equal_to=None, log=None):
+    """path 하위 변경 수신. 조건을 주면 서버가 조건에 맞는 항목만 보낸다 (.indexOn 규칙 필요)"""
+    if order_by_child is None:
+        return reference(path).listen(callback)
+    if _database is not db:
+        # 대체 구현은 같은 이름의 함수로 조건부 수신을 제공
+        return _database.listen(path, callback, order_by_child, equal_to)
+
+    from google.auth.transport.requests import AuthorizedSession
+
+    app = firebase_admin.get_app()
+    session = AuthorizedSession(app.credential.get_credential())
+    url = f"{app.options.get('databaseURL').rstrip('/')}/{path.strip('/')}.json"
+    return QueryListener(url, query_params(order_by_child, equal_to), callback, session, log=log)
+
+
+def init_firebase(config, log):
+    """모든 Property가 함께 쓰는 기본 Firebase 앱을 한 번만 초기화"""
+    try:
+        log(f"Firebase 초기화 시작...")
+        log(f"  - 인증 파일 경로: {config.credentials_path}")
+        log(f"  - 데이터베이스 URL: {config.database_url}")
+
+        if not os.path.exists(config.credentials_path):
+            log(f"❌ Firebase 인증 파일 없음: {config.credentials_path}")
+            return False
+
+        log(f"✓ Firebase 인증 파일 확인됨")
+
+        cred = credentials.Certificate(config.credentials_path)
+        firebase_admin.initialize_app(cred, {'databaseURL': config.database_url})
+        log(f"✓ Firebase 연결 성공 ({len(config.properties)}개 Property)")
+        return True
+    except Exception as e:
+        log(f"❌ Firebase 초기화 실패: {e}")
+        log(f"상세 오류:\n{traceback.format_exc()}")
+        return False
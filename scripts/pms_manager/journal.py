@@ -0,0 +1,102 @@
+"""큐 항목 처리 이력 저널 (SQLite, WAL)
+
+queue_id별로 received → trigger_written → consumed → synced → completed/failed
+단계를 기록한다. 같은 이벤트가 다시 와도 PMS 매크로를 두 번 실행하지 않고,
+중간에 프로세스가 죽었으면 재시작 시 남은 단계부터 이어서 처리한다.
+조회는 메모리 사전으로 하고 SQLite에는 쓰기만 하므로 Firebase 왕복이 필요 없다.
+"""
+import json
+import sqlite3
+import threading
+import time
+
+RECEIVED = 'received'
+TRIGGER_WRITTEN = 'trigger_written'
+CONSUMED = 'consumed'
+SYNCED = 'synced'
+COMPLETED = 'completed'
+FAILED = 'failed'
+
+TERMINAL_STATES = frozenset([COMPLETED, FAILED])
+DEFAULT_RETENTION_DAYS = 7
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    property TEXT NOT NULL,
+    queue_id TEXT NOT NULL,
+    state TEXT NOT NULL,
+    room_number TEXT,
+    action TEXT,
+    data TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (property, queue_id)
+)
+"""
+
+
+class JobJournal:
+    def __init__(self, path, retention_days=DEFAULT_RETENTION_DAYS):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(_SCHEMA)
+
+        cutoff = time.time() - retention_days * 86400
+        self._conn.execute(
+            "DELETE FROM jobs WHERE state IN (?, ?) AND updated_at < ?",
+            (COMPLETED, FAILED, cutoff),
+        )
+
+        # (property, queue_id) → (state, error)
+        self._states = {
+            (row[0], row[1]): (row[2], row[3])
+            for row in self._conn.execute("SELECT property, queue_id, state, error FROM jobs")
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def state(self, prop, queue_id):
+        """(state, error) 또는 처음 보는 항목이면 None"""
+        return self._states.get((prop, queue_id))
+
+    def record_received(self, prop, queue_id, data):
+        """새 항목이면 기록 후 True, 이미 아는 항목이면 False"""
+        key = (prop, queue_id)
+        with self._lock:
+            if key in self._states:
+                return False
+            now = time.time()
+            self._conn.execute(
+                "INSERT OR IGNORE INTO jobs (property, queue_id, state, room_number, action, data,"
+                " created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (prop, queue_id, RECEIVED, data.get('roomNumber'), data.get('action'),
+                 json.dumps(data, ensure_ascii=False), now, now),
+            )
+            self._states[key] = (RECEIVED, None)
+            return True
+
+    def advance(self, prop, queue_id, state, error=None, room_number=None, action=None):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET state = ?, error = COALESCE(?, error),"
+                " room_number = COALESCE(?, room_number), action = COALESCE(?, action),"
+                " updated_at = ? WHERE property = ? AND queue_id = ?",
+                (state, error, room_number, action, time.time(), prop, queue_id),
+            )
+            self._states[(prop, queue_id)] = (state, error)
+
+    def unfinished(self, prop):
+        """재시작 시 이어서 처리할 항목: [(queue_id, state, data)] 오래된 순"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT queue_id, state, data FROM jobs WHERE property = ? AND state NOT IN (?, ?)"
+                " ORDER BY created_at",
+                (prop, COMPLETED, FAILED),
+            ).fetchall()
+        return [(queue_id, state, json.loads(data or '{}')) for queue_id, state, data in rows]
@@ -0,0 +1,199 @@
+"""콘솔 + 파일 로그 (백그라운드 기록)
+
+log() 호출은 큐에 넣기만 하고, 전용 스레드가 모아서 파일에 쓴 뒤 한 번만 flush 한다.
+로그 파일은 크기(max_bytes) 또는 날짜가 바뀌면 listener.log.1, .2 … 로 돌려 쓴다.
+"""
+import atexit
+import os
+import queue
+import threading
+import time
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+
+LEVELS = {'DEBUG': DEBUG, 'INFO': INFO, 'WARNING': WARNING, 'ERROR': ERROR}
+
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_BACKUP_COUNT = 5
+# 한 번에 모아서 쓰는 최대 줄 수
+MAX_BATCH = 1000
+
+_STOP = object()
+
+
+class _RotatingFile:
+    def __init__(self, path, max_bytes, backup_count):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._file = None
+        self._size = 0
+        self._day = None
+
+    def _open(self):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        self._file = open(self.path, 'a', encoding='utf-8', buffering=64 * 1024)
+        self._size = self._file.tell()
+        self._day = time.strftime('%Y-%m-%d')
+
+    def _rotate(self):
+        self.close()
+        for i in range(self.backup_count - 1, 0, -1):
+            src = f"{self.path}.{i}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.path}.{i + 1}")
+        if os.path.exists(self.path):
+            if self.backup_count > 0:
+                os.replace(self.path, f"{self.path}.1")
+            else:
+                os.remove(self.path)
+
+    def write(self, line):
+        if self._file is None:
+            self._open()
+        data = line + '\n'
+        size = len(data.encode('utf-8'))
+        if self._size > 0 and (
+            (self.max_bytes and self._size + size > self.max_bytes)
+            or time.strftime('%Y-%m-%d') != self._day
+        ):
+            self._rotate()
+            self._open()
+        self._file.write(data)
+        self._size += size
+
+    def flush(self):
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class _LogWriter:
+    """모든 Logger가 공유하는 기록 스레드"""
+
+    def __init__(self):
+        self.level = INFO
+        self.max_bytes = DEFAULT_MAX_BYTES
+        self.backup_count = DEFAULT_BACKUP_COUNT
+        self._queue = queue.SimpleQueue()
+        self._files = {}
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, log_file, console_line, file_line):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+                    self._thread.start()
+        self._queue.put((log_file, console_line, file_line))
+
+    def _write(self, item):
+        log_file, console_line, file_line = item
+        print(console_line)
+        if not log_file:
+            return None
+        rotating = self._files.get(log_file)
+        if rotating is None:
+            rotating = _RotatingFile(log_file, self.max_bytes, self.backup_count)
+            self._files[log_file] = rotating
+        try:
+            rotating.write(file_line)
+        except Exception as e:
+            print(f"로그 저장 실패: {e}")
+            rotating.close()
+            return None
+        return rotating
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            batch = [item]
+            while len(batch) < MAX_BATCH:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            touched = set()
+            stop = False
+            for item in batch:
+                if item is _STOP:
+                    stop = True
+                    continue
+                rotating = self._write(item)
+                if rotating is not None:
+                    touched.add(rotating)
+
+            for rotating in touched:
+                try:
+                    rotating.flush()
+                except Exception as e:
+                    print(f"로그 저장 실패: {e}")
+
+            if stop:
+                for rotating in self._files.values():
+                    rotating.close()
+                return
+
+    def shutdown(self, timeout=5.0):
+        thread = self._thread
+        if thread is None or not thread.is_alive():
+            return
+        self._queue.put(_STOP)
+        thread.join(timeout)
+
+
+_writer = _LogWriter()
+atexit.register(_writer.shutdown)
+
+
+def configure_logging(level='INFO', max_bytes=DEFAULT_MAX_BYTES, backup_count=DEFAULT_BACKUP_COUNT):
+    _writer.level = LEVELS.get(str(level).upper(), INFO)
+    _writer.max_bytes = max_bytes
+    _writer.backup_count = backup_count
+
+
+def shutdown_logging():
+    """남은 로그를 모두 기록하고 파일을 닫는다"""
+    _writer.shutdown()
+
+
+class Logger:
+    """로그 파일 하나에 기록하는 로거. 콘솔 출력에는 태그를 붙인다."""
+
+    def __init__(self, log_file, tag=''):
+        self.log_file = log_file
+        self.tag = tag
+
+    def _emit(self, level, message):
+        if level < _writer.level:
+            return
+        timestamp = time.strftime('%Y-%m-%d %H:%M:%S')
+        log_message = f"[{timestamp}] {message}"
+        console_line = f"[{self.tag}] {log_message}" if self.tag else log_message
+        _writer.submit(self.log_file, console_line, log_message)
+
+    def debug(self, message):
+        self._emit(DEBUG, message)
+
+    def log(self, message):
+        """INFO. ⚠️로 시작하는 줄은 WARNING, ❌로 시작하는 줄은 ERROR로 기록"""
+        self._emit(_level_of(message), message)
+
+
+def _level_of(message):
+    head = message.lstrip()
+    if head.startswith('❌'):
+        return ERROR
+    if head.startswith('⚠'):
+        return WARNING
+    return INFO
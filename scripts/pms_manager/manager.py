@@ -0,0 +1,166 @@
+"""매니저 진입점: 설정 로드 → Firebase 초기화 → Property별 리스너 시작"""
+import os
+import sys
+import time
+import traceback
+
+from . import events
+from . import trace
+from .cleanup import DeletionScheduler
+from .config import DEFAULT_CONFIG_PATH, ConfigError, load_config
+from .firebase import init_firebase
+from .journal import JobJournal
+from .logger import Logger, configure_logging, shutdown_logging
+from .metrics import MetricsServer
+from .property import PropertyManager
+from .room_store import RoomStatusServer
+from .sheets_sync import SheetsSyncQueue
+from .web_app import WebAppClient
+from .writes import WriteBatcher
+
+# 파이프라인 대기열/단계별 처리 시간 요약을 남기는 주기(초)
+STATS_LOG_INTERVAL = 300
+
+
+def _log_ready(log):
+    log("✓ 준비 완료! 체크인 요청 대기 중...")
+    log("종료: Ctrl+C")
+    log("=" * 60)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    config_path = argv[0] if argv else DEFAULT_CONFIG_PATH
+
+    try:
+        config = load_config(config_path)
+    except ConfigError as e:
+        print(f"❌ {e}")
+        input("Press Enter to exit...")
+        return
+
+    configure_logging(config.log_level, config.log_max_bytes, config.log_backup_count)
+    log = Logger(config.log_file).log
+
+    log("=" * 60)
+    log(f"🚀 PMS Firebase Manager 시작 - {', '.join(p.name for p in config.properties)}")
+    log("=" * 60)
+    log(f"  - 설정 파일: {config_path}")
+    log(f"  - 웹앱 URL: {config.web_app_url}")
+    log(f"  - API Key 설정: {'✓' if config.api_key else '✗'}")
+    log(f"  - 실행 방식: {config.runtime}")
+    if config.trace_dir:
+        os.makedirs(config.trace_dir, exist_ok=True)
+        trace_file = os.path.join(config.trace_dir, f"trace_{time.strftime('%Y%m%d_%H%M%S')}.jsonl")
+        trace.start(trace_file)
+        log(f"  - 추적 기록: {trace_file}")
+    if config.event_log_file:
+        events.start(config.event_log_file, retention_days=config.event_log_retention_days)
+        log(f"  - 이벤트 기록: {config.event_log_file} (조회: python pms_events.py --room <객실>)")
+    log("=" * 60)
+
+    if not init_firebase(config, log):
+        log("❌ 종료: Firebase 초기화 실패")
+        input("Press Enter to exit...")
+        return
+
+    web_app = WebAppClient(
+        config.web_app_url,
+        config.api_key,
+        room_cache_ttl=config.room_cache_ttl,
+        connect_timeout=config.http_connect_timeout,
+        read_timeout=config.http_read_timeout,
+        max_retries=config.http_max_retries,
+        circuit_failures=config.web_app_circuit_failures,
+        circuit_open_time=config.web_app_circuit_open,
+        log=log,
+    )
+    sheets_sync = SheetsSyncQueue(web_app, config.sheets_backlog_file, log)
+    writes = WriteBatcher(log, batch_window=config.write_batch_window, rate=config.write_rate,
+                          burst=config.write_burst)
+    cleanup = DeletionScheduler(log, writes, delay=config.queue_delete_delay)
+    journal = JobJournal(config.journal_file, retention_days=config.journal_retention_days)
+
+    runtime = None
+    if config.runtime == 'asyncio':
+        try:
+            from .aio.runtime import AsyncRuntime
+        except ImportError as e:
+            log(f"❌ 종료: asyncio 실행 방식에 필요한 모듈 없음 ({e}). pip install httpx")
+            input("Press Enter to exit...")
+            return
+        runtime = AsyncRuntime(config, sheets_sync, cleanup, journal, writes, log)
+        managers = runtime.managers
+    else:
+        managers = [PropertyManager(p, config, sheets_sync, cleanup, journal, writes)
+                    for p in config.properties]
+
+    metrics_server = room_status_server = None
+    try:
+        if config.metrics_port:
+            metrics_server = MetricsServer(config.metrics_port)
+            metrics_server.start()
+            log(f"📈 지표 엔드포인트: http://127.0.0.1:{metrics_server.port}/metrics")
+
+        if config.room_status_port:
+            room_status_server = RoomStatusServer(
+                {manager.name: manager.room_status.store for manager in managers},
+                config.room_status_port,
+                host=config.room_status_host,
+            )
+            room_status_server.start()
+            log(f"🏨 객실 상태 조회: http://{config.room_status_host}:{room_status_server.port}/rooms/<property>")
+
+        writes.start()
+        sheets_sync.start()
+        cleanup.start()
+        for manager in managers:
+            manager.log_settings()
+
+        if runtime is not None:
+            # Property 시작/종료와 주기 작업은 이벤트 루프 안에서 처리
+            runtime.run(on_ready=lambda: _log_ready(log))
+            return
+
+        for manager in managers:
+            manager.start()
+        _log_ready(log)
+
+        last_stats_log = last_metrics_publish = time.monotonic()
+        while True:
+            time.sleep(1)
+            if time.monotonic() - last_stats_log >= STATS_LOG_INTERVAL:
+                last_stats_log = time.monotonic()
+                for manager in managers:
+                    log(f"📊 {manager.name}: {manager.stats()}")
+                log(f"📊 Sheets: {sheets_sync.stats()}")
+            if time.monotonic() - last_metrics_publish >= config.metrics_summary_interval:
+                last_metrics_publish = time.monotonic()
+                for manager in managers:
+                    manager.publish_metrics()
+    except KeyboardInterrupt:
+        log("👋 종료")
+    except Exception as e:
+        log(f"❌ 메인 루프 오류: {e}")
+        log(f"상세 오류:\n{traceback.format_exc()}")
+        input("Press Enter to exit...")
+    finally:
+        if runtime is None:
+            for manager in managers:
+                manager.stop()
+        sheets_sync.stop()
+        cleanup.stop()
+        # 삭제까지 모두 넘겨받은 뒤 마지막으로 비운다
+        writes.stop()
+        journal.close()
+        if metrics_server is not None:
+            metrics_server.stop()
+        if room_status_server is not None:
+            room_status_server.stop()
+        log(f"웹앱 연결 통계: {web_app.stats.snapshot()}")
+        log(f"웹앱 차단기: {web_app.breaker.snapshot()}")
+        log(f"Firebase 쓰기 통계: {writes.stats()}")
+        web_app.close()
+        trace.stop()
+        events.stop()
+        shutdown_logging()
@@ -0,0 +1,253 @@
+"""처리 단계별 지연/처리량 지표 (Prometheus 텍스트 형식)
+
+모듈 전역 REGISTRY에 카운터/히스토그램/게이지를 등록해 두고,
+MetricsServer가 http://127.0.0.1:<port>/metrics 로 내보낸다.
+"""
+import bisect
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# 체크인 한 건이 수 ms(HTTP)부터 수십 초(AHK)까지 걸리므로 넓게 잡는다
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names, values, extra=None):
+    pairs = list(zip(names, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in pairs) + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = ''
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, label_values):
+        if len(label_values) != len(self.labels):
+            raise ValueError(f"{self.name}: 레이블 {self.labels} 필요")
+        return tuple(str(v) for v in label_values)
+
+    def header(self):
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def __init__(self, name, help_text, labels=()):
+        super().__init__(name, help_text, labels)
+        self._values = {}
+
+    def inc(self, *label_values, amount=1):
+        key = self._key(label_values)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, *label_values):
+        with self._lock:
+            return self._values.get(self._key(label_values), 0)
+
+    def render(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        return self.header() + [
+            f"{self.name}{_format_labels(self.labels, key)} {_format_value(v)}" for key, v in items
+        ]
+
+
+class Gauge(_Metric):
+    """값을 직접 set 하거나, 수집 시점에 callback()으로 읽는다"""
+    kind = 'gauge'
+
+    def __init__(self, name, help_text, labels=()):
+        super().__init__(name, help_text, labels)
+        self._values = {}
+        self._callbacks = {}
+
+    def set(self, value, *label_values):
+        with self._lock:
+            self._values[self._key(label_values)] = value
+
+    def set_function(self, callback, *label_values):
+        with self._lock:
+            self._callbacks[self._key(label_values)] = callback
+
+    def render(self):
+        with self._lock:
+            items = dict(self._values)
+            callbacks = dict(self._callbacks)
+        for key, callback in callbacks.items():
+            try:
+                items[key] = callback()
+            except Exception:
+                continue
+        return self.header() + [
+            f"{self.name}{_format_labels(self.labels, key)} {_format_value(v)}"
+            for key, v in sorted(items.items())
+        ]
+
+
+class _HistogramSeries:
+    def __init__(self, bucket_count):
+        self.counts = [0] * (bucket_count + 1)
+        self.sum = 0.0
+        self.count = 0
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+
+    def observe(self, value, *label_values):
+        key = self._key(label_values)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _HistogramSeries(len(self.buckets))
+            series.counts[index] += 1
+            series.sum += value
+            series.count += 1
+
+    def summary(self, *label_values):
+        """{'count', 'avg', 'p50', 'p95', 'p99'} — 백분위수는 버킷 상한으로 근사"""
+        with self._lock:
+            series = self._series.get(self._key(label_values))
+            if series is None or series.count == 0:
+                return {'count': 0}
+            counts = list(series.counts)
+            total, total_sum = series.count, series.sum
+
+        def quantile(q):
+            rank = q * total
+            running = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                running += count
+                if running >= rank:
+                    return bound if bound != float('inf') else self.buckets[-1]
+            return self.buckets[-1]
+
+        return {
+            'count': total,
+            'avg': round(total_sum / total, 4),
+            'p50': quantile(0.50),
+            'p95': quantile(0.95),
+            'p99': quantile(0.99),
+        }
+
+    def render(self):
+        with self._lock:
+            items = sorted(
+                (key, list(s.counts), s.sum, s.count) for key, s in self._series.items()
+            )
+        lines = self.header()
+        for key, counts, total_sum, total in items:
+            running = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                running += count
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(self.labels, key, ('le', _format_value(bound)))} {running}"
+                )
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, key)} {_format_value(total_sum)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, key)} {total}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, *args, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"{name}: 이미 다른 종류로 등록됨")
+            return metric
+
+    def counter(self, name, help_text, labels=()):
+        return self._get_or_create(Counter, name, help_text, labels)
+
+    def gauge(self, name, help_text, labels=()):
+        return self._get_or_create(Gauge, name, help_text, labels)
+
+    def histogram(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+        return self._get_or_create(Histogram, name, help_text, labels, buckets=buckets)
+
+    def render(self):
+        with self._lock:
+            metrics = [self._metrics[name] for name in sorted(self._metrics)]
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = MetricsRegistry()
+
+counter = REGISTRY.counter
+gauge = REGISTRY.gauge
+histogram = REGISTRY.histogram
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry = REGISTRY
+
+    def do_GET(self):
+        if self.path.split('?', 1)[0] not in ('/metrics', '/'):
+            self.send_error(404)
+            return
+        body = self.registry.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MetricsServer:
+    """로컬 전용 /metrics HTTP 엔드포인트"""
+
+    def __init__(self, port, host='127.0.0.1', registry=REGISTRY):
+        handler = type('MetricsHandler', (_MetricsHandler,), {'registry': registry})
+        self._server = ThreadingHTTPServer((host, port), handler)
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def port(self):
+        return self._server.server_address[1]
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="metrics-http", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
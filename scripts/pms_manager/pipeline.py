@@ -0,0 +1,226 @@
+"""단계별 스레드 풀로 이루어진 작업 파이프라인
+
+각 단계는 제한된 크기의 큐와 워커 스레드를 가진다. 처리 함수가 값을 반환하면
+다음 단계 큐로 넘기고, None을 반환하면 거기서 끝난다. 큐가 가득 차면
+submit()/다음 단계 전달이 대기하므로 앞 단계에 자연스럽게 역압이 걸린다.
+
+단계에 priority(item) → 양보 시간(초)을 주면 그 단계 큐는 들어온 순서 대신
+(들어온 시각 + 양보 시간)이 이른 작업부터 꺼낸다. 양보 시간 0인 작업이 앞서고,
+양보 시간보다 오래 기다린 작업은 새로 들어온 급한 작업보다 먼저 처리된다 (aging).
+group(item) → (키, 도착 순서)를 주면 같은 키(객실)의 작업끼리는 도착 순서를 지킨다: 급한 작업도
+같은 객실의 앞선 작업은 앞지르지 못한다 (체크아웃 → 청소 → 체크인 순서 유지). 앞 단계 워커가
+여럿이라 큐에 들어오는 순서가 바뀌어도 도착 순서로 꺼낸다.
+"""
+import bisect
+import heapq
+import itertools
+import queue
+import threading
+import time
+import traceback
+
+DEFAULT_QUEUE_SIZE = 100
+
+_STOP = object()
+
+
+class StageStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.count = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+
+    def begin(self):
+        with self._lock:
+            self.in_flight += 1
+
+    def end(self, elapsed, error=False):
+        with self._lock:
+            self.in_flight -= 1
+            self.count += 1
+            self.errors += int(error)
+            self.total_time += elapsed
+            self.max_time = max(self.max_time, elapsed)
+
+    def snapshot(self):
+        with self._lock:
+            avg = self.total_time / self.count if self.count else 0.0
+            return {
+                'count': self.count,
+                'errors': self.errors,
+                'in_flight': self.in_flight,
+                'avg_ms': round(avg * 1000, 1),
+                'max_ms': round(self.max_time * 1000, 1),
+            }
+
+
+class _Waiting:
+    """한 그룹의 대기 작업: 도착 순서로 정렬된 목록과 그 그룹에 준 가장 늦은 꺼낼 시각"""
+    __slots__ = ('entries', 'due')
+
+    def __init__(self, due):
+        self.entries = []
+        self.due = due
+
+
+class DeadlineHeap:
+    """(꺼낼 시각, 순번, 그룹, 작업) 힙. 종료 표시는 남은 작업을 모두 처리한 뒤에.
+
+    그룹이 있는 작업은 그 그룹의 대기 목록에 도착 순서로 넣고 힙에는 자리만 둔다. 자리의
+    꺼낼 시각은 같은 그룹의 앞선 자리보다 이르지 않게 하고, 자리가 나오면 그룹에서 가장
+    먼저 도착한 작업을 꺼낸다"""
+
+    def __init__(self, priority, group=None):
+        self.priority = priority
+        self.group = group
+        self._heap = []
+        self._seq = itertools.count()
+        self._groups = {}
+
+    def __len__(self):
+        return len(self._heap)
+
+    def push(self, item):
+        if item is _STOP:
+            heapq.heappush(self._heap, (float('inf'), next(self._seq), None, item))
+            return
+        due = time.monotonic() + self.priority(item)
+        key, arrival = self.group(item) if self.group is not None else (None, None)
+        seq = next(self._seq)
+        if key is None:
+            heapq.heappush(self._heap, (due, seq, None, item))
+            return
+        waiting = self._groups.get(key)
+        if waiting is None:
+            waiting = self._groups[key] = _Waiting(due)
+        else:
+            due = waiting.due = max(due, waiting.due)
+        bisect.insort(waiting.entries, (arrival, seq, item), key=lambda entry: entry[:2])
+        heapq.heappush(self._heap, (due, seq, key, None))
+
+    def pop(self):
+        _, _, key, item = heapq.heappop(self._heap)
+        if key is None:
+            return item
+        waiting = self._groups[key]
+        _, _, item = waiting.entries.pop(0)
+        if not waiting.entries:
+            del self._groups[key]
+        return item
+
+
+class DeadlineQueue(queue.Queue):
+    """(들어온 시각 + priority(item))이 이른 작업부터 꺼내는 queue.Queue (같은 group끼리는 들어온 순서)"""
+
+    def __init__(self, maxsize, priority, group=None):
+        self.priority = priority
+        self.group = group
+        super().__init__(maxsize)
+
+    def _init(self, maxsize):
+        self.queue = DeadlineHeap(self.priority, self.group)
+
+    def _qsize(self):
+        return len(self.queue)
+
+    def _put(self, item):
+        self.queue.push(item)
+
+    def _get(self):
+        return self.queue.pop()
+
+
+class Stage:
+    """파이프라인 한 단계: handler(item) -> 다음 단계로 넘길 값 또는 None"""
+
+    def __init__(self, name, handler, workers=1, queue_size=DEFAULT_QUEUE_SIZE, priority=None, group=None):
+        self.name = name
+        self.handler = handler
+        self.workers = workers
+        # priority(item) → 양보 시간(초). 없으면 들어온 순서대로
+        self.priority = priority
+        # group(item) → (키, 도착 순서). 같은 키끼리는 도착 순서대로 (키가 None이면 제한 없음)
+        self.group = group
+        self.queue = DeadlineQueue(queue_size, priority, group) if priority else queue.Queue(queue_size)
+        self.stats = StageStats()
+        self.next = None
+        self._threads = []
+
+
+class Pipeline:
+    def __init__(self, name, stages, log, observe=None):
+        self.name = name
+        self.stages = stages
+        self.log = log
+        # observe(stage_name, elapsed, error): 단계 처리 시간을 외부 지표로 보낼 때 사용
+        self.observe = observe
+        for stage, next_stage in zip(stages, stages[1:]):
+            stage.next = next_stage
+
+    def submit(self, item, timeout=None):
+        """첫 단계에 작업 추가. 큐가 가득 차 timeout 안에 넣지 못하면 False"""
+        try:
+            self.stages[0].queue.put(item, timeout=timeout)
+            return True
+        except queue.Full:
+            return False
+
+    def depth(self):
+        """아직 처리되지 않은 작업 수 (대기 + 처리 중)"""
+        return sum(s.queue.qsize() + s.stats.in_flight for s in self.stages)
+
+    def start(self):
+        for stage in self.stages:
+            for i in range(stage.workers):
+                thread = threading.Thread(
+                    target=self._worker,
+                    args=(stage,),
+                    name=f"{self.name}-{stage.name}-{i}",
+                    daemon=True,
+                )
+                thread.start()
+                stage._threads.append(thread)
+
+    def stop(self, timeout=5.0):
+        """앞 단계부터 차례로 남은 작업을 비우고 워커 종료"""
+        deadline = time.monotonic() + timeout
+        for stage in self.stages:
+            for _ in stage._threads:
+                stage.queue.put(_STOP)
+            for thread in stage._threads:
+                thread.join(max(deadline - time.monotonic(), 0))
+            stage._threads = []
+
+    def _worker(self, stage):
+        while True:
+            item = stage.queue.get()
+            if item is _STOP:
+                return
+
+            stage.stats.begin()
+            started = time.monotonic()
+            error = False
+            try:
+                result = stage.handler(item)
+            except Exception as e:
+                error = True
+                result = None
+                self.log(f"❌ {stage.name} 단계 오류: {e}")
+                self.log(f"상세 오류:\n{traceback.format_exc()}")
+            finally:
+                elapsed = time.monotonic() - started
+                stage.stats.end(elapsed, error)
+                if self.observe is not None:
+                    self.observe(stage.name, elapsed, error)
+
+            if result is not None and stage.next is not None:
+                stage.next.queue.put(result)
+
+    def stats(self):
+        return {
+            stage.name: dict(stage.stats.snapshot(), depth=stage.queue.qsize())
+            for stage in self.stages
+        }
@@ -0,0 +1,714 @@
+"""Property 하나의 큐 리스너 + 처리 파이프라인"""
+import json
+import os
+import threading
+import time
+import traceback
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Optional
+
+from . import events
+from . import firebase
+from . import journal as jobs
+from . import metrics
+from . import trace
+from .ahk import ActionTimings, AhkLog
+from .logger import Logger
+from .pipeline import Pipeline, Stage
+from .room_status import RoomStatusMonitor
+from .executor import create_executor
+from .spool import write_json_atomic
+from .watch import FileWatcher
+from .web_app import ACTION_STATUS, map_action_to_status, normalize_room_number
+
+TIMEOUT_ERROR = "타임아웃"
+PREVIOUS_TRIGGER_ERROR = "이전 트리거가 아직 처리되지 않음"
+RESUME_UNKNOWN_ERROR = "재시작 후 처리 여부 확인 불가"
+RESUME_WITHDRAWN_ERROR = "중단된 사이 큐에서 취소/처리됨"
+# 이벤트 기록(events)에 남기는 트리거 단계별 문구
+TRIGGER_MESSAGES = {
+    'written': "트리거 작성",
+    'consumed': "AHK 처리 완료",
+    'timeout': "AHK 처리 타임아웃",
+    'failed': "AHK 처리 실패",
+    'blocked': "이전 트리거가 남아 트리거 작성 못 함",
+}
+PENDING_INDEX_HINT = 'pms_queue/$property/.indexOn: ["status"] (database.rules.json)'
+
+LISTENER_SECONDS = metrics.histogram(
+    'pms_listener_callback_seconds', 'Firebase 리스너 콜백 처리 시간', ['property'])
+DELIVERY_SECONDS = metrics.histogram(
+    'pms_delivery_seconds', '키오스크 createdAt부터 리스너 수신까지', ['property'])
+STAGE_SECONDS = metrics.histogram(
+    'pms_stage_seconds', '파이프라인 단계별 처리 시간', ['property', 'stage'])
+AUTOMATION_WAIT_SECONDS = metrics.histogram(
+    'pms_automation_wait_seconds', '검증 후 PMS 자동화 단계 대기열에서 기다린 시간', ['property', 'action'])
+AUTOMATION_SECONDS = metrics.histogram(
+    'pms_automation_seconds', '트리거 작성부터 AHK 처리 완료까지', ['property', 'action'])
+TRIGGER_TIMEOUT = metrics.gauge(
+    'pms_trigger_timeout_seconds', '마지막으로 적용한 트리거 대기 제한 시간', ['property', 'action'])
+MARK_SECONDS = metrics.histogram(
+    'pms_firebase_mark_seconds', 'Firebase completed/failed 기록 시간', ['property', 'status'])
+JOB_SECONDS = metrics.histogram(
+    'pms_job_seconds', '수신부터 완료/실패 기록까지', ['property', 'result'])
+JOBS_TOTAL = metrics.counter(
+    'pms_jobs_total', '처리 결과별 항목 수', ['property', 'result'])
+QUEUE_DEPTH = metrics.gauge(
+    'pms_queue_depth', '파이프라인에 남은 항목 수', ['property'])
+
+
+@dataclass
+class QueueJob:
+    """pms_queue 항목 하나의 처리 상태"""
+    queue_id: str
+    data: dict
+    received_at: float = field(default_factory=time.monotonic)
+    room_number: str = ''
+    action: str = ''
+    guest_name: str = ''
+    # 자동화 단계 대기열에 들어간 시각
+    queued_at: float = 0.0
+    success: bool = False
+    error: Optional[str] = None
+    # 재시작 후 이어서 처리할 때 저널에 기록돼 있던 마지막 단계
+    resume_state: str = jobs.RECEIVED
+
+    @property
+    def outcome(self):
+        if self.success:
+            return 'success'
+        return 'timeout' if self.error == TIMEOUT_ERROR else 'failure'
+
+
+def _delivery_delay(data):
+    """키오스크가 기록한 createdAt(ISO, UTC)부터 지금까지 초. 알 수 없으면 None"""
+    created_at = data.get('createdAt')
+    if not isinstance(created_at, str):
+        return None
+    try:
+        created = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if created.tzinfo is None:
+        return None
+    delay = (datetime.now(timezone.utc) - created).total_seconds()
+    return delay if delay >= 0 else None
+
+
+class PropertyManager:
+    """pms_queue/<property> 리스너와 객실 상태 업로드를 담당"""
+
+    def __init__(self, config, settings, sheets_sync, cleanup, journal, writes):
+        self.config = config
+        self.settings = settings
+        self.name = config.name
+        self.sheets_sync = sheets_sync
+        self.cleanup = cleanup
+        self.journal = journal
+        self.writes = writes
+        logger = Logger(config.log_file, tag=config.name)
+        self.log = logger.log
+        self.debug = logger.debug
+        self.trigger_watcher = FileWatcher(
+            config.trigger_file,
+            poll_interval=settings.watch_poll_interval,
+            use_notifications=settings.watch_use_notifications,
+        )
+        # 스풀/소켓 실행기 (file 모드면 None: 위 트리거 파일을 직접 쓴다)
+        self.executor = create_executor(config, settings, self.log)
+        self.ahk_timings = ActionTimings(
+            settings.trigger_timeout_min, settings.trigger_timeout, settings.trigger_timeout_factor)
+        self.ahk_log = AhkLog(config.ahk_log_file, settings.ahk_start_timeout)
+        # 지금 처리 중인 트리거의 AHK 로그 추적 (자동화 단계는 한 번에 하나)
+        self._ahk_run = None
+        self.room_status = RoomStatusMonitor(config, settings, self.log, writes)
+        # 검증/후처리는 병렬, PMS GUI 자동화는 한 번에 하나씩.
+        # 스풀/소켓 모드에서는 여러 건을 미리 넘겨 두고 자동화 쪽이 순서대로(또는 묶어서) 처리한다
+        automation_workers = settings.spool_max_pending if self.executor is not None else 1
+        self.pipeline = self._create_pipeline([
+            Stage('validate', self._validate, workers=settings.pipeline_workers,
+                  queue_size=settings.pipeline_queue_size),
+            Stage('automation', self._run_automation, workers=automation_workers,
+                  queue_size=settings.pipeline_queue_size,
+                  priority=self._automation_priority if settings.priority_aging else None,
+                  group=self._automation_group),
+            Stage('finish', self._finish, workers=settings.pipeline_workers,
+                  queue_size=settings.pipeline_queue_size),
+        ])
+        QUEUE_DEPTH.set_function(self.pipeline.depth, self.name)
+        self._in_flight = set()
+        self._in_flight_lock = threading.Lock()
+        # 재시작 전 접수만 된 항목: 첫 큐 스냅샷에서 아직 pending인지 확인한 뒤 처리 {queue_id: data}
+        self._awaiting_snapshot = {}
+        self._listener = None
+
+    def _create_pipeline(self, stages):
+        return Pipeline(self.name, stages, self.log, observe=self._observe_stage)
+
+    def _automation_priority(self, job):
+        """자동화 대기열에서 양보할 시간(초). 손님 응대 액션은 0"""
+        if job.action in self.settings.priority_actions:
+            return 0.0
+        return self.settings.priority_aging
+
+    def _automation_group(self, job):
+        """같은 객실 작업은 우선순위와 관계없이 수신 순서대로 (체크아웃 → 청소 → 체크인)"""
+        return normalize_room_number(job.room_number) or None, job.received_at
+
+    def _observe_stage(self, stage, elapsed, error):
+        STAGE_SECONDS.observe(elapsed, self.name, stage)
+
+    def log_settings(self):
+        self.log(f"📋 설정 정보:")
+        self.log(f"  - Property: {self.name}")
+        self.log(f"  - Firebase Path: {self.config.queue_path}")
+        self.log(f"  - Firebase Status Path: {self.config.status_path}")
+        if self.executor is not None:
+            self.log(f"  - {self.executor.describe()}")
+        else:
+            self.log(f"  - Trigger File: {self.config.trigger_file}")
+            self.log(f"  - 트리거 대기: {self.settings.trigger_timeout_min:g}~{self.settings.trigger_timeout:g}초 "
+                     f"(처리 시간 p95 × {self.settings.trigger_timeout_factor:g})")
+            if self.settings.ahk_start_timeout:
+                self.log(f"  - AHK Log: {self.config.ahk_log_file} "
+                         f"(감지 기록 없으면 {self.settings.ahk_start_timeout:g}초 후 실패)")
+        if self.settings.priority_aging:
+            self.log(f"  - 우선 처리: {', '.join(self.settings.priority_actions)} "
+                     f"(다른 액션은 최대 {self.settings.priority_aging:g}초 양보)")
+        self.log(f"  - Room Status JSON: {self.config.room_status_json}")
+        self.log(f"  - Log File: {self.config.log_file}")
+
+    def start(self):
+        """객실 상태 스레드와 큐 리스너 시작"""
+        if self.executor is not None:
+            self.executor.start()
+            self.log(f"✓ {self.executor.label} 시작 ({self.executor.backend})")
+        else:
+            self.trigger_watcher.start()
+            self.log(f"✓ 트리거 파일 감시 시작 ({self.trigger_watcher.backend})")
+
+        self.room_status.start()
+        self.log("✓ 객실 상태 모니터링 스레드 시작")
+
+        self.pipeline.start()
+        self._resume_unfinished()
+
+        self._listener = self._listen()
+
+    def _listen(self):
+        path = self.config.queue_path
+        if self.settings.listen_pending_only:
+            try:
+                listener = firebase.listen(path, self.on_queue_added, order_by_child='status',
+                                           equal_to='pending', log=self.log)
+                self.log(f"👂 리스닝 시작: {path} (pending 항목만)")
+                return listener
+            except Exception as e:
+                self.log(f"⚠️ pending 조건 수신 실패, 전체 수신으로 전환: {e}")
+                self.log(f"  - Firebase 규칙에 {PENDING_INDEX_HINT} 추가 필요")
+
+        listener = firebase.reference(path).listen(self.on_queue_added)
+        self.log(f"👂 리스닝 시작: {path}")
+        return listener
+
+    def stop(self):
+        if self._listener is not None:
+            self._listener.close()
+            self._listener = None
+        self.pipeline.stop()
+        if self.executor is not None:
+            self.executor.stop()
+        self.trigger_watcher.stop()
+        self.room_status.stop()
+
+    def stats(self):
+        stats = {'depth': self.pipeline.depth(), 'stages': self.pipeline.stats()}
+        if self.executor is not None:
+            stats['executor_pending'] = self.executor.pending()
+        else:
+            stats['ahk_timing'] = self.ahk_timings.snapshot()
+        return stats
+
+    def metrics_summary(self):
+        """pms_status/<property>/metrics 에 올리는 요약"""
+        return {
+            'updatedAt': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'queueDepth': self.pipeline.depth(),
+            'jobs': {result: JOBS_TOTAL.value(self.name, result)
+                     for result in ('success', 'failure', 'timeout')},
+            'jobSeconds': JOB_SECONDS.summary(self.name, 'success'),
+            'deliverySeconds': DELIVERY_SECONDS.summary(self.name),
+            'stageSeconds': {name: STAGE_SECONDS.summary(self.name, name)
+                             for name in self.pipeline.stats()},
+            'automationWaitSeconds': {action: AUTOMATION_WAIT_SECONDS.summary(self.name, action)
+                                      for action in ACTION_STATUS},
+            'sheets': self.sheets_sync.stats(),
+        }
+
+    def publish_metrics(self):
+        try:
+            self.writes.set(f"{self.config.status_path}/metrics", self.metrics_summary()).result()
+        except Exception as e:
+            self.log(f"⚠️ 지표 업로드 실패: {e}")
+
+    def _resume_unfinished(self):
+        """저널에 끝나지 않은 채 남은 항목을 마지막 단계부터 다시 파이프라인에 넣는다"""
+        unfinished = self.journal.unfinished(self.name)
+        if not unfinished:
+            return
+
+        self.log(f"♻️ 중단된 항목 {len(unfinished)}건 이어서 처리")
+        for queue_id, state, data in unfinished:
+            if state == jobs.RECEIVED:
+                # PMS를 아직 건드리지 않은 항목은 중단된 사이 취소됐거나 다른 곳에서 처리됐을 수 있으므로
+                # 첫 큐 스냅샷에서 pending으로 남아 있을 때만 다시 처리한다 (_settle_resumed)
+                self._awaiting_snapshot[queue_id] = data
+                self.log(f"  - {queue_id}: {state} (큐 확인 후 처리)")
+                continue
+            with self._in_flight_lock:
+                self._in_flight.add(queue_id)
+            self.log(f"  - {queue_id}: {state}")
+            self.pipeline.submit(QueueJob(queue_id, data, resume_state=state))
+
+    def _trigger_queue_id(self):
+        try:
+            with open(self.config.trigger_file, 'r', encoding='utf-8') as f:
+                return json.load(f).get('queue_id')
+        except (OSError, ValueError):
+            return None
+
+    def _trigger_data(self, job):
+        return {
+            'room_number': job.room_number,
+            'action': job.action,
+            'guest_name': job.guest_name,
+            'queue_id': job.queue_id,
+            'timestamp': time.strftime('%Y-%m-%d %H:%M:%S')
+        }
+
+    def execute_pms_automation(self, job):
+        """트리거 파일을 쓰고 AHK가 처리할 때까지 대기. 성공 여부 반환"""
+        if self.executor is not None:
+            return self._execute_queued(job)
+
+        if self._previous_trigger_left(job):
+            elapsed = self.trigger_watcher.wait_until(
+                lambda: not os.path.exists(self.config.trigger_file),
+                timeout=self._trigger_timeout(job),
+            )
+            if not self._previous_trigger_cleared(job, elapsed):
+                return False
+
+        result = self._begin_trigger(job)
+        if result is not None:
+            return result
+        return self._wait_for_trigger(job)
+
+    def _trigger_timeout(self, job):
+        """액션별 처리 시간 기록으로 정한 대기 제한 시간"""
+        timeout = self.ahk_timings.timeout(job.action)
+        TRIGGER_TIMEOUT.set(timeout, self.name, job.action)
+        return timeout
+
+    def _previous_trigger_left(self, job):
+        """타임아웃/오류로 끝난 이전 트리거가 남아 있는지. 덮어쓰면 AHK가 이전 작업을 마치며
+        새 트리거를 지워 처리하지 않은 항목이 완료로 기록될 수 있다"""
+        if job.resume_state == jobs.TRIGGER_WRITTEN or not os.path.exists(self.config.trigger_file):
+            return False
+        self.log(f"⏳ 이전 트리거가 남아 있어 AHK 처리를 기다림: {self._trigger_queue_id()}")
+        return True
+
+    def _previous_trigger_cleared(self, job, elapsed):
+        if elapsed is None:
+            self.log(f"❌ {PREVIOUS_TRIGGER_ERROR}: {job.room_number} (AHK 확인 필요)")
+            self._record_trigger(job, 'blocked')
+            job.error = PREVIOUS_TRIGGER_ERROR
+            return False
+        self.log(f"✓ 이전 트리거 처리됨 ({elapsed * 1000:.0f}ms 대기)")
+        return True
+
+    def _trigger_settled(self):
+        """AHK가 트리거를 지웠거나, AHK 로그로 실패가 확실해짐"""
+        if not os.path.exists(self.config.trigger_file):
+            return True
+        return self._ahk_run is not None and self._ahk_run.failure() is not None
+
+    def _begin_trigger(self, job):
+        """트리거 파일 작성. 결과가 이미 정해졌으면 True/False, AHK를 기다려야 하면 None"""
+        trigger_file = self.config.trigger_file
+
+        if job.resume_state == jobs.TRIGGER_WRITTEN:
+            # 트리거를 쓴 뒤 중단됨: 파일이 남아 있으면 계속 기다리고, 없으면 AHK가 처리한 것
+            if not os.path.exists(trigger_file):
+                self.log(f"♻️ 트리거가 이미 처리됨: {job.queue_id}")
+                self.journal.advance(self.name, job.queue_id, jobs.CONSUMED)
+                return True
+            if self._trigger_queue_id() != job.queue_id:
+                job.error = RESUME_UNKNOWN_ERROR
+                return False
+            return None
+
+        self.log(f"🔄 {job.action} 시작: {job.room_number} ({job.guest_name})")
+
+        # 트리거 파일 생성
+        os.makedirs(os.path.dirname(trigger_file), exist_ok=True)
+
+        trigger_data = self._trigger_data(job)
+        # 트리거를 쓰기 전 로그 끝 위치부터 읽는다
+        self._ahk_run = self.ahk_log.begin()
+        # AHK가 쓰는 도중의 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체
+        write_json_atomic(trigger_file, trigger_data)
+
+        self.journal.advance(self.name, job.queue_id, jobs.TRIGGER_WRITTEN)
+        self._record_trigger(job, 'written')
+        self.log(f"✓ 트리거 파일 생성: {trigger_file}")
+        self.debug(f"  - 데이터: {trigger_data}")
+        expected = self.ahk_timings.expected(job.action)
+        if expected is not None:
+            self.debug(f"  - 예상 처리 시간: {expected * 1000:.0f}ms (제한 {self._trigger_timeout(job):g}초)")
+        return None
+
+    def _wait_for_trigger(self, job):
+        # AHK가 트리거 파일을 삭제하거나 AHK 로그에 실패가 보이는 즉시 깨어남
+        elapsed = self.trigger_watcher.wait_until(self._trigger_settled, timeout=self._trigger_timeout(job))
+        return self._trigger_result(job, elapsed)
+
+    def _trigger_result(self, job, elapsed):
+        run, self._ahk_run = self._ahk_run, None
+        failure = run.failure() if run is not None else None
+
+        # [오류]가 찍혔으면 트리거가 지워졌어도 실패, 감지 기록만 없으면 트리거가 남아 있을 때만
+        if failure is not None and (run.error_line is not None or os.path.exists(self.config.trigger_file)):
+            if not run.started:
+                # AHK가 읽지 않은 트리거는 지워 둔다 (다음 항목이 기다리지 않도록).
+                # 지운 직후 종료되면 재시작 때 처리된 것으로 보므로 실패를 먼저 저널에 남긴다
+                self.journal.advance(self.name, job.queue_id, jobs.FAILED, error=failure)
+                try:
+                    os.remove(self.config.trigger_file)
+                except OSError:
+                    pass
+            self.log(f"❌ {job.action} 실패: {job.room_number} ({failure})")
+            self._record_trigger(job, 'failed', error=failure)
+            job.error = failure
+            return False
+
+        if elapsed is None:
+            self.log(f"⏱️ 타임아웃: AHK가 트리거 파일을 처리하지 않음")
+            self._record_trigger(job, 'timeout')
+            job.error = TIMEOUT_ERROR
+            return False
+
+        self.ahk_timings.observe(job.action, elapsed)
+        return self._automation_done(job, elapsed)
+
+    def _execute_queued(self, job):
+        """실행기(스풀/소켓)에 작업을 넘기고 같은 순번의 ack가 올 때까지 대기"""
+        executor = self.executor
+        if job.resume_state == jobs.TRIGGER_WRITTEN:
+            if not executor.durable:
+                # 작업 목록이 프로세스와 함께 사라짐
+                job.error = RESUME_UNKNOWN_ERROR
+                return False
+            seq = executor.find(job.queue_id)
+            if seq is None:
+                # 작업 파일이 정리됐으면 ack까지 받은 것
+                self.log(f"♻️ 자동화 작업이 이미 처리됨: {job.queue_id}")
+                self.journal.advance(self.name, job.queue_id, jobs.CONSUMED)
+                return True
+        else:
+            self.log(f"🔄 {job.action} 시작: {job.room_number} ({job.guest_name})")
+            seq = executor.submit(self._trigger_data(job))
+            self.journal.advance(self.name, job.queue_id, jobs.TRIGGER_WRITTEN)
+            self._record_trigger(job, 'written', seq=seq)
+            self.log(f"✓ 자동화 작업 #{seq} 전달 (대기 {executor.pending()}건)")
+
+        # 제한 시간과 경과 시간은 앞선 작업이 끝나 이 작업 차례가 된 때부터 (대기열에 밀린 시간 제외)
+        elapsed, ack = executor.wait(seq, timeout=self._trigger_timeout(job))
+
+        if elapsed is None:
+            # 회수하기 전에 실패를 저널에 남긴다. 회수 직후 종료되면 재시작 때 작업 파일이 없어
+            # ack까지 받은 것으로 보게 되므로, 저널이 먼저 실패여야 결과만 다시 기록된다
+            self.journal.advance(self.name, job.queue_id, jobs.FAILED, error=TIMEOUT_ERROR)
+            cancelled = executor.cancel(seq)
+            self.log(f"⏱️ 타임아웃: 자동화 작업 #{seq} 완료 확인 없음" + (" (작업 회수)" if cancelled else ""))
+            self._record_trigger(job, 'timeout', seq=seq)
+            job.error = TIMEOUT_ERROR
+            return False
+
+        if not ack.get('success', True):
+            job.error = ack.get('error') or "자동화 실패"
+            self.log(f"❌ {job.action} 실패: {job.room_number} (#{seq}: {job.error})")
+            self._record_trigger(job, 'failed', seq=seq, ms=round(elapsed * 1000, 1), error=job.error)
+            return False
+
+        self.ahk_timings.observe(job.action, elapsed)
+        return self._automation_done(job, elapsed)
+
+    def _record_trigger(self, job, phase, **fields):
+        trace.record('trigger', p=self.name, id=job.queue_id, phase=phase, action=job.action,
+                     room=job.room_number, **fields)
+        message = TRIGGER_MESSAGES[phase]
+        if fields.get('ms') is not None:
+            message += f" ({fields['ms']:.0f}ms)"
+        if fields.get('error'):
+            message += f": {fields['error']}"
+        events.record('trigger', self.name, job.queue_id, job.room_number, job.action, message,
+                      phase=phase, **fields)
+
+    def _automation_done(self, job, elapsed):
+        AUTOMATION_SECONDS.observe(elapsed, self.name, job.action)
+        self._record_trigger(job, 'consumed', ms=round(elapsed * 1000, 1))
+
+        self.journal.advance(self.name, job.queue_id, jobs.CONSUMED)
+        self.log(f"✅ {job.action} 완료: {job.room_number} (처리 시간: {elapsed * 1000:.0f}ms)")
+        return True
+
+    def _item_path(self, queue_id):
+        return f'{self.config.queue_path}/{queue_id}'
+
+    def _completed_fields(self):
+        return {
+            'status': 'completed',
+            'completedAt': time.strftime('%Y-%m-%dT%H:%M:%S')
+        }
+
+    def _failed_fields(self, error_message):
+        return {
+            'status': 'failed',
+            'error': error_message,
+            'failedAt': time.strftime('%Y-%m-%dT%H:%M:%S')
+        }
+
+    def _marked(self, queue_id, status, started):
+        # 키오스크가 완료/실패 상태를 읽을 수 있도록 잠시 뒤 삭제
+        self.cleanup.schedule(self._item_path(queue_id))
+        MARK_SECONDS.observe(time.monotonic() - started, self.name, status)
+        if status == 'completed':
+            self.log(f"✅ 완료 처리: {queue_id}")
+        else:
+            self.log(f"❌ 실패 처리: {queue_id}")
+
+    def _mark_error(self, status, error):
+        if status == 'completed':
+            self.log(f"❌ 완료 처리 실패: {error}")
+        else:
+            self.log(f"❌ 실패 처리 오류: {error}")
+
+    def _mark(self, queue_id, status, fields):
+        # 쓰기 배처가 확인하면 콜백에서 마무리. 후처리 워커는 기다리지 않는다
+        started = time.monotonic()
+
+        def done(future):
+            error = future.exception()
+            if error is None:
+                self._marked(queue_id, status, started)
+            else:
+                self._mark_error(status, error)
+
+        self.writes.update(self._item_path(queue_id), fields).add_done_callback(done)
+
+    def mark_as_completed(self, queue_id):
+        self._mark(queue_id, 'completed', self._completed_fields())
+
+    def mark_as_failed(self, queue_id, error_message):
+        self._mark(queue_id, 'failed', self._failed_fields(error_message))
+
+    def on_queue_added(self, event):
+        """리스너 콜백: 처리할 항목인지 확인하고 파이프라인에 넣기만 한다"""
+        started = time.monotonic()
+        try:
+            self.debug(f"📨 Firebase 이벤트 수신: {event.path}")
+
+            data = event.data
+            if trace.enabled():
+                trace.record('queue', p=self.name, ev=event.event_type, path=event.path,
+                             data=trace.scrub(data))
+
+            queue_id = event.path.strip('/') if event.path else None
+
+            if not queue_id and event.event_type == 'put' and self._awaiting_snapshot:
+                # 큐가 비어 있어도(data 없음) 첫 스냅샷으로 재시작 전 접수 항목을 정리한다
+                self._settle_resumed(data if isinstance(data, dict) else {})
+
+            if not data:
+                self.debug(f"⚠️ 데이터 없음")
+                return
+
+            if not queue_id:
+                # 리스닝 시작/재연결 시 큐 전체가 path '/' 로 한 번에 전달된다
+                if isinstance(data, dict):
+                    self._drain_snapshot(data)
+                return
+
+            if '/' in queue_id or not isinstance(data, dict):
+                self.log(f"⚠️ 유효하지 않은 queue_id: {queue_id}")
+                return
+
+            status = data.get('status')
+            if status != 'pending':
+                self.debug(f"⚠️ Pending 상태 아님, 무시: {queue_id} ({status})")
+                return
+
+            self._accept(queue_id, data)
+
+        except Exception as e:
+            self.log(f"❌ 처리 오류: {e}")
+            self.log(f"상세 오류:\n{traceback.format_exc()}")
+        finally:
+            LISTENER_SECONDS.observe(time.monotonic() - started, self.name)
+
+    def _settle_resumed(self, items):
+        """첫 스냅샷에 pending으로 없는 재시작 전 접수 항목은 실행하지 않고 저널에서 끝낸다.
+        남아 있는 항목은 이어지는 _drain_snapshot에서 저널 상태대로 처리된다"""
+        awaiting, self._awaiting_snapshot = self._awaiting_snapshot, {}
+        for queue_id, data in awaiting.items():
+            item = items.get(queue_id)
+            if isinstance(item, dict) and item.get('status') == 'pending':
+                continue
+            status = item.get('status') if isinstance(item, dict) else '삭제됨'
+            self.log(f"♻️ 큐에서 사라진 중단 항목, 실행하지 않음: {queue_id} ({status})")
+            self.journal.advance(self.name, queue_id, jobs.FAILED, error=RESUME_WITHDRAWN_ERROR)
+            events.record('job', self.name, queue_id, data.get('roomNumber'), data.get('action'),
+                          f"실행 안 함: {RESUME_WITHDRAWN_ERROR} ({status})", result='withdrawn')
+
+    def _drain_snapshot(self, items):
+        """스냅샷의 pending 항목을 오래된 순서로 한꺼번에 파이프라인에 넣는다"""
+        pending = [
+            (queue_id, item) for queue_id, item in items.items()
+            if isinstance(item, dict) and item.get('status') == 'pending'
+        ]
+        if not pending:
+            return
+
+        # createdAt이 없으면 push ID(시간순 정렬됨)로 정렬
+        pending.sort(key=lambda entry: (entry[1].get('createdAt') or '', entry[0]))
+        self.log(f"📥 대기 중인 항목 {len(pending)}건 일괄 처리 (전체 {len(items)}건)")
+
+        for queue_id, item in pending:
+            self._accept(queue_id, item)
+
+    def _accept(self, queue_id, data):
+        with self._in_flight_lock:
+            if queue_id in self._in_flight:
+                self.log(f"⚠️ 이미 처리 중, 무시: {queue_id}")
+                return
+            known = self.journal.state(self.name, queue_id)
+            if known is None or known[0] not in jobs.TERMINAL_STATES:
+                self._in_flight.add(queue_id)
+
+        if known is not None and known[0] in jobs.TERMINAL_STATES:
+            # 이미 실행한 항목인데 상태 기록이 반영되지 않은 경우: 자동화는 다시 돌리지 않는다
+            state, error = known
+            self.log(f"♻️ 이미 처리된 항목, 결과만 다시 기록: {queue_id}")
+            if state == jobs.COMPLETED:
+                self.mark_as_completed(queue_id)
+            else:
+                self.mark_as_failed(queue_id, error or "알 수 없는 오류")
+            return
+
+        if known is None:
+            self.journal.record_received(self.name, queue_id, data)
+            events.record('received', self.name, queue_id, data.get('roomNumber'), data.get('action'), "접수")
+            delay = _delivery_delay(data)
+            if delay is not None:
+                DELIVERY_SECONDS.observe(delay, self.name)
+            job = QueueJob(queue_id, data)
+        else:
+            job = QueueJob(queue_id, data, resume_state=known[0])
+
+        self.pipeline.submit(job)
+        self.log(f"✓ Queue ID: {queue_id} (대기 {self.pipeline.depth()}건)")
+
+    def _validate(self, job):
+        """항목 데이터 검증 후 객실 번호/액션 결정"""
+        data = job.data
+        self.debug(f"  - Event Data: {data}")
+
+        job.room_number = data.get('roomNumber', '')
+        job.guest_name = data.get('guestName', '')
+
+        self.debug(f"  - Room Number: {job.room_number}")
+        self.debug(f"  - Guest Name: {job.guest_name}")
+
+        if not job.room_number:
+            self.log(f"❌ 객실 번호 없음: {job.queue_id}")
+            job.error = "객실 번호 없음"
+            return self._reject(job)
+
+        action = data.get('action')
+        if not action:
+            if data.get('checkInDate') and data.get('guestName'):
+                action = 'checkin'
+                self.debug(f"  - Action 자동 설정: checkin")
+            else:
+                self.log(f"❌ 액션 타입 없음: {job.queue_id}")
+                job.error = "액션 타입 없음"
+                return self._reject(job)
+        else:
+            self.debug(f"  - Action: {action}")
+
+        job.action = action
+        self.journal.advance(self.name, job.queue_id, job.resume_state,
+                             room_number=job.room_number, action=action)
+        job.queued_at = time.monotonic()
+        return job
+
+    def _reject(self, job):
+        """검증 실패: 자동화 단계를 거치지 않고 바로 실패 처리"""
+        return self._finish(job)
+
+    def _automation_started(self, job):
+        AUTOMATION_WAIT_SECONDS.observe(time.monotonic() - job.queued_at, self.name, job.action)
+
+    def _run_automation(self, job):
+        self._automation_started(job)
+        if job.resume_state in (jobs.CONSUMED, jobs.SYNCED):
+            # PMS 반영은 이미 끝남: 후처리만 다시
+            job.success = True
+            return job
+
+        try:
+            job.success = self.execute_pms_automation(job)
+        except Exception as e:
+            self.log(f"❌ 실행 오류: {e}")
+            self.log(f"상세 오류:\n{traceback.format_exc()}")
+            job.error = str(e)
+        return job
+
+    def _finish(self, job):
+        """Sheets 동기화 요청 + Firebase 완료/실패 기록"""
+        try:
+            if job.success:
+                self._request_sheets_sync(job)
+                self.mark_as_completed(job.queue_id)
+                self.journal.advance(self.name, job.queue_id, jobs.COMPLETED)
+            else:
+                error = job.error or "알 수 없는 오류"
+                self.mark_as_failed(job.queue_id, error)
+                self.journal.advance(self.name, job.queue_id, jobs.FAILED, error=error)
+        finally:
+            self._job_done(job)
+        return None
+
+    def _request_sheets_sync(self, job):
+        # Google Sheets 업데이트는 백그라운드 큐에 맡기고 바로 완료 처리
+        if job.resume_state != jobs.SYNCED:
+            self.sheets_sync.enqueue(job.room_number, map_action_to_status(job.action))
+            self.journal.advance(self.name, job.queue_id, jobs.SYNCED)
+
+    def _job_done(self, job):
+        with self._in_flight_lock:
+            self._in_flight.discard(job.queue_id)
+        elapsed = time.monotonic() - job.received_at
+        JOBS_TOTAL.inc(self.name, job.outcome)
+        JOB_SECONDS.observe(elapsed, self.name, job.outcome)
+        trace.record('job', p=self.name, id=job.queue_id, action=job.action, result=job.outcome,
+                     ms=round(elapsed * 1000, 1))
+        if job.success:
+            message = f"완료 (수신 후 {elapsed:.1f}초)"
+        else:
+            message = f"실패: {job.error or '알 수 없는 오류'}"
+        events.record('job', self.name, job.queue_id, job.room_number or job.data.get('roomNumber'),
+                      job.action or job.data.get('action'), message,
+                      result=job.outcome, ms=round(elapsed * 1000, 1))
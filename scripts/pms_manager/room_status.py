@@ -0,0 +1,189 @@
+"""room_status.json → Firebase 객실 상태 업로드 (변경분만 전송)"""
+import hashlib
+import json
+import os
+import threading
+import time
+
+from .room_store import RoomStatusStore
+from .watch import FileWatcher, file_signature
+
+# 알림을 놓친 경우에 대비한 주기적 재확인 (내용이 같으면 쓰기 없음)
+SAFETY_RESCAN_INTERVAL = 10.0
+# 쓰기가 계속 이어져도 이 시간이 지나면 업로드를 시도
+MAX_DEBOUNCE = 2.0
+# 반쯤 쓰인 파일 등 읽기 실패 시 재시도 간격/횟수
+READ_RETRY_INTERVAL = 0.1
+READ_RETRY_LIMIT = 20
+ERROR_BACKOFF = 1.0
+
+
+def _rooms_as_dict(rooms):
+    """Firebase는 배열을 인덱스 키 객체로 저장하므로 같은 형태로 맞춘다"""
+    if isinstance(rooms, list):
+        return {str(i): room for i, room in enumerate(rooms) if room is not None}
+    return dict(rooms or {})
+
+
+def compute_delta(old, new):
+    """두 스냅샷을 비교해 multi-path update용 {경로: 값} 반환 (삭제는 None)"""
+    delta = {}
+
+    old_rooms = _rooms_as_dict(old.get('rooms'))
+    new_rooms = _rooms_as_dict(new.get('rooms'))
+
+    for key, room in new_rooms.items():
+        if old_rooms.get(key) != room:
+            delta[f"rooms/{key}"] = room
+    for key in old_rooms.keys() - new_rooms.keys():
+        delta[f"rooms/{key}"] = None
+
+    for key, value in new.items():
+        if key != 'rooms' and old.get(key) != value:
+            delta[key] = value
+    for key in old.keys() - new.keys():
+        if key != 'rooms':
+            delta[key] = None
+
+    return delta
+
+
+class RoomStatusUploader:
+    """마지막으로 업로드한 스냅샷을 기억하고 바뀐 객실만 Firebase에 반영"""
+
+    def __init__(self, status_path, log, writes, store=None):
+        self.status_path = status_path
+        self.log = log
+        self.writes = writes
+        # 로컬 조회용 저장소: Firebase 업로드 성공 여부와 관계없이 최신 파일 내용을 반영
+        self.store = store
+        self._snapshot = None
+        self._content_hash = None
+
+    def upload_bytes(self, raw):
+        """room_status.json 원본 바이트를 받아 업로드. 실제 쓰기가 있었으면 True"""
+        content_hash = hashlib.sha256(raw).hexdigest()
+        if content_hash == self._content_hash:
+            return False
+
+        status_data = json.loads(raw.decode('utf-8-sig'))
+        if not status_data or 'rooms' not in status_data:
+            return False
+
+        if self.store is not None:
+            self.store.load(status_data, content_hash)
+
+        written = self.upload(status_data)
+        self._content_hash = content_hash
+        return written
+
+    def upload(self, status_data):
+        if self._snapshot is None:
+            # 시작 직후에는 원격 상태를 알 수 없으므로 한 번 전체 업로드.
+            # status_path 전체를 set하면 같은 노드의 metrics 요약(pms_status/<property>/metrics)이
+            # 지워지므로 rooms와 파일의 최상위 키만 multi-path update로 덮어쓴다
+            self.writes.update(self.status_path, dict(status_data)).result()
+            self._snapshot = status_data
+            self.log(f"객실 상태 전체 업로드: {len(status_data['rooms'])}개")
+            return True
+
+        delta = compute_delta(self._snapshot, status_data)
+        if not delta:
+            self._snapshot = status_data
+            return False
+
+        try:
+            self.writes.update(self.status_path, delta).result()
+        except Exception:
+            # 원격 상태가 불확실해졌으므로 다음에는 전체 업로드
+            self._snapshot = None
+            self._content_hash = None
+            raise
+
+        self._snapshot = status_data
+        changed_rooms = sum(1 for path in delta if path.startswith('rooms/'))
+        self.log(f"객실 상태 업데이트: {changed_rooms}/{len(status_data['rooms'])}개 변경")
+        return True
+
+
+class RoomStatusMonitor:
+    """room_status.json 변경 알림을 받아 디바운스 후 업로드하는 스레드"""
+
+    def __init__(self, config, settings, log, writes):
+        self.path = config.room_status_json
+        self.log = log
+        self.debounce = settings.room_status_debounce
+        self.store = RoomStatusStore()
+        self.uploader = RoomStatusUploader(config.status_path, log, writes, store=self.store)
+        self.watcher = FileWatcher(
+            self.path,
+            poll_interval=settings.watch_poll_interval,
+            use_notifications=settings.watch_use_notifications,
+        )
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        self.watcher.start()
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._run,
+            name=f"room-status-{os.path.basename(os.path.dirname(self.path))}",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        self.watcher.stop()
+
+    def _wait_until_stable(self, generation):
+        """연속된 쓰기가 debounce 동안 멈출 때까지 대기"""
+        deadline = time.monotonic() + MAX_DEBOUNCE
+        while self._running and time.monotonic() < deadline:
+            changed = self.watcher.wait_for_change(generation, timeout=self.debounce)
+            if changed is None:
+                break
+            generation = changed
+        return generation
+
+    def _read_stable_bytes(self):
+        """읽는 동안 파일 크기/수정시각이 바뀌지 않은 내용만 반환"""
+        signature = file_signature(self.path)
+        if signature is None:
+            return None
+        with open(self.path, 'rb') as f:
+            raw = f.read()
+        if file_signature(self.path) != signature:
+            raise ValueError("읽는 중 파일 변경됨")
+        return raw
+
+    def sync_once(self):
+        """파일을 읽어 업로드. 반쯤 쓰인 파일이면 짧은 간격으로 재시도"""
+        for attempt in range(READ_RETRY_LIMIT):
+            try:
+                raw = self._read_stable_bytes()
+                if raw is None:
+                    return False
+                return self.uploader.upload_bytes(raw)
+            except (OSError, ValueError):
+                if attempt == READ_RETRY_LIMIT - 1:
+                    raise
+            time.sleep(READ_RETRY_INTERVAL)
+        return False
+
+    def _run(self):
+        self.log(f"객실 상태 모니터링 시작 ({self.watcher.backend})")
+        generation = self.watcher.generation
+
+        while self._running:
+            try:
+                self.sync_once()
+            except Exception as e:
+                self.log(f"상태 모니터링 오류: {e}")
+                time.sleep(ERROR_BACKOFF)
+                continue
+
+            changed = self.watcher.wait_for_change(generation, timeout=SAFETY_RESCAN_INTERVAL)
+            if changed is not None:
+                generation = self._wait_until_stable(changed)
@@ -0,0 +1,242 @@
+"""객실 상태 메모리 저장소 + 로컬 조회 HTTP 엔드포인트
+
+room_status.json을 읽을 때마다 객실을 __slots__ 레코드로 바꿔 건물/층/상태/객실 번호
+색인과 함께 스냅샷으로 교체한다. 조회는 잠금 없이 현재 스냅샷을 읽고, 같은 스냅샷의
+같은 질의는 인코딩된 응답을 재사용한다. 키오스크는 ETag/If-None-Match로 바뀌었을 때만
+본문을 받는다.
+
+    GET /rooms                               → {"properties": [...]}
+    GET /rooms/<property>?building=&floor=&status=&roomNumber=
+    GET /rooms/<property>/<roomNumber>
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+from . import metrics
+from .web_app import normalize_room_number
+
+# 현장 키오스크에 내보내지 않는 필드 (도어락 비밀번호 등)
+HIDDEN_FIELDS = frozenset(['password'])
+# 스냅샷 하나에서 캐시할 질의 응답 수
+MAX_CACHED_QUERIES = 256
+
+REQUESTS_TOTAL = metrics.counter(
+    'pms_room_status_requests_total', '로컬 객실 상태 조회 수', ['status'])
+
+
+class RoomRecord:
+    __slots__ = ('key', 'room_number', 'building', 'floor', 'status', 'room_type',
+                 'matching_room_number', 'extra')
+
+    # 웹앱 /api/room-status 응답과 같은 필드 이름
+    FIELDS = (
+        ('building', 'building'),
+        ('roomNumber', 'room_number'),
+        ('roomType', 'room_type'),
+        ('status', 'status'),
+        ('floor', 'floor'),
+        ('matchingRoomNumber', 'matching_room_number'),
+    )
+
+    def __init__(self, key, room):
+        self.key = key
+        self.room_number = str(room.get('roomNumber') or room.get('room_number') or '')
+        # 시트/Firebase 데이터는 건물을 category로 부른다
+        self.building = str(room.get('building') or room.get('category') or '')
+        self.floor = '' if room.get('floor') is None else str(room.get('floor'))
+        self.status = str(room.get('status') or '')
+        self.room_type = str(room.get('roomType') or '')
+        self.matching_room_number = str(room.get('matchingRoomNumber') or '')
+        known = {'roomNumber', 'room_number', 'building', 'category', 'floor', 'status',
+                 'roomType', 'matchingRoomNumber'}
+        extra = {k: v for k, v in room.items() if k not in known and k not in HIDDEN_FIELDS}
+        self.extra = extra or None
+
+    def to_dict(self):
+        room = {name: getattr(self, attr) for name, attr in self.FIELDS}
+        if self.extra:
+            room.update(self.extra)
+        return room
+
+
+def _index(records, attr, normalize=None):
+    index = {}
+    for position, record in enumerate(records):
+        value = getattr(record, attr)
+        if normalize is not None:
+            value = normalize(value)
+        if value:
+            index.setdefault(value, []).append(position)
+    return index
+
+
+class _Snapshot:
+    """한 번 만들면 바뀌지 않는 레코드 목록 + 색인"""
+
+    def __init__(self, records, etag, updated_at):
+        self.records = records
+        self.etag = etag
+        self.updated_at = updated_at
+        self.by_building = _index(records, 'building')
+        self.by_floor = _index(records, 'floor')
+        self.by_status = _index(records, 'status')
+        self.by_number = _index(records, 'room_number', normalize_room_number)
+        # 매칭 번호(예약 시트 G열)로도 찾을 수 있게
+        for key, positions in _index(records, 'matching_room_number', normalize_room_number).items():
+            self.by_number.setdefault(key, positions)
+        self.responses = {}
+        self.lock = threading.Lock()
+
+
+class RoomStatusStore:
+    """Property 하나의 객실 상태. load()가 스냅샷을 통째로 교체한다"""
+
+    def __init__(self):
+        self._snapshot = _Snapshot([], '"empty"', None)
+
+    @property
+    def etag(self):
+        return self._snapshot.etag
+
+    def __len__(self):
+        return len(self._snapshot.records)
+
+    def load(self, status_data, content_hash):
+        """room_status.json 내용으로 교체. 같은 내용이면 무시하고 False"""
+        etag = f'"{content_hash[:16]}"'
+        if etag == self._snapshot.etag:
+            return False
+        rooms = status_data.get('rooms') or {}
+        items = rooms.items() if isinstance(rooms, dict) else enumerate(rooms)
+        records = [RoomRecord(str(key), room) for key, room in items if isinstance(room, dict)]
+        self._snapshot = _Snapshot(records, etag, time.strftime('%Y-%m-%dT%H:%M:%S'))
+        return True
+
+    def query(self, building=None, floor=None, status=None, room_number=None):
+        """조건에 맞는 객실 dict 목록 (원래 순서 유지)"""
+        return [record.to_dict() for record in self._select(self._snapshot, building, floor, status, room_number)]
+
+    def _select(self, snapshot, building, floor, status, room_number):
+        candidates = None
+        for index, value in (
+            (snapshot.by_number, normalize_room_number(room_number) if room_number else None),
+            (snapshot.by_building, building),
+            (snapshot.by_floor, floor),
+            (snapshot.by_status, status),
+        ):
+            if not value:
+                continue
+            positions = index.get(value, ())
+            candidates = set(positions) if candidates is None else candidates.intersection(positions)
+            if not candidates:
+                return []
+        if candidates is None:
+            return list(snapshot.records)
+        return [snapshot.records[position] for position in sorted(candidates)]
+
+    def response(self, building=None, floor=None, status=None, room_number=None):
+        """(etag, JSON 본문 바이트). 같은 스냅샷의 같은 질의는 캐시된 본문 재사용"""
+        snapshot = self._snapshot
+        cache_key = (building, floor, status, room_number)
+        with snapshot.lock:
+            body = snapshot.responses.get(cache_key)
+        if body is None:
+            rooms = [record.to_dict() for record in self._select(snapshot, *cache_key)]
+            body = json.dumps({
+                'rooms': rooms,
+                'total': len(rooms),
+                'updatedAt': snapshot.updated_at,
+                'source': 'local',
+            }, ensure_ascii=False).encode('utf-8')
+            with snapshot.lock:
+                if len(snapshot.responses) < MAX_CACHED_QUERIES:
+                    snapshot.responses[cache_key] = body
+        return snapshot.etag, body
+
+
+def _etag_matches(header, etag):
+    if not header:
+        return False
+    tags = [tag.strip() for tag in header.split(',')]
+    return '*' in tags or etag in tags or f"W/{etag}" in tags
+
+
+class _RoomStatusHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    stores = {}
+
+    def _send(self, status, body=b'', etag=None):
+        self.send_response(status)
+        if etag is not None:
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', 'no-cache')
+        if status != 304:
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if status != 304 and self.command != 'HEAD':
+            self.wfile.write(body)
+        REQUESTS_TOTAL.inc(status)
+
+    def _error(self, status, message):
+        self._send(status, json.dumps({'error': message}, ensure_ascii=False).encode('utf-8'))
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        parts = [unquote(part) for part in url.path.split('/') if part]
+        if not parts or parts[0] != 'rooms' or len(parts) > 3:
+            self._error(404, 'not found')
+            return
+
+        if len(parts) == 1:
+            body = json.dumps({'properties': sorted(self.stores)}).encode('utf-8')
+            self._send(200, body)
+            return
+
+        store = self.stores.get(parts[1])
+        if store is None:
+            self._error(404, f"알 수 없는 property: {parts[1]}")
+            return
+
+        params = dict(parse_qsl(url.query))
+        room_number = parts[2] if len(parts) == 3 else params.get('roomNumber')
+        etag, body = store.response(
+            building=params.get('building'),
+            floor=params.get('floor'),
+            status=params.get('status'),
+            room_number=room_number,
+        )
+        if _etag_matches(self.headers.get('If-None-Match'), etag):
+            self._send(304, etag=etag)
+            return
+        self._send(200, body, etag=etag)
+
+    do_HEAD = do_GET
+
+    def log_message(self, format, *args):
+        pass
+
+
+class RoomStatusServer:
+    """Property별 RoomStatusStore를 읽기 전용으로 내보내는 로컬 HTTP 서버"""
+
+    def __init__(self, stores, port, host='127.0.0.1'):
+        handler = type('RoomStatusHandler', (_RoomStatusHandler,), {'stores': dict(stores)})
+        self._server = ThreadingHTTPServer((host, port), handler)
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def port(self):
+        return self._server.server_address[1]
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="room-status-http", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,185 @@
+"""Google Sheets 상태 동기화 write-behind 큐
+
+체크인 완료 처리는 웹앱 응답을 기다리지 않고 enqueue()만 한다.
+같은 객실에 대기 중인 변경이 여러 개면 마지막 상태 하나로 합치고,
+대기 목록은 파일로 저장해 재시작 후에도 이어서 전송한다.
+"""
+import json
+import os
+import threading
+import time
+
+from . import events
+from . import metrics
+from .web_app import CircuitOpenError, RoomNotFoundError, normalize_room_number, push_room_status
+
+DEFAULT_BATCH_WINDOW = 0.5
+RETRY_BACKOFF_BASE = 2.0
+RETRY_BACKOFF_MAX = 60.0
+
+SHEETS_SECONDS = metrics.histogram(
+    'pms_sheets_update_seconds', 'Google Sheets 상태 업데이트 시간', ['result'])
+SHEETS_BACKLOG = metrics.gauge('pms_sheets_backlog', '전송 대기 중인 Sheets 업데이트 수')
+
+
+class SheetsSyncQueue:
+    """객실별로 합쳐지는 Sheets 업데이트 대기열 + 백그라운드 전송 스레드"""
+
+    def __init__(self, client, backlog_file, log, batch_window=DEFAULT_BATCH_WINDOW):
+        self.client = client
+        self.backlog_file = backlog_file
+        self.log = log
+        self.batch_window = batch_window
+        # 정규화된 객실 번호 → {room_number, status, attempts, next_attempt}
+        self._pending = {}
+        self._cond = threading.Condition()
+        self._running = False
+        self._thread = None
+        self._load_backlog()
+        SHEETS_BACKLOG.set_function(self.__len__)
+
+    def __len__(self):
+        with self._cond:
+            return len(self._pending)
+
+    def stats(self):
+        return {'pending': len(self), 'web_app': self.client.breaker.snapshot()}
+
+    def _load_backlog(self):
+        try:
+            with open(self.backlog_file, 'r', encoding='utf-8') as f:
+                items = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            self.log(f"⚠️ Sheets 대기 목록 읽기 실패: {e}")
+            return
+
+        for item in items:
+            self._pending[normalize_room_number(item['room_number'])] = {
+                'room_number': item['room_number'],
+                'status': item['status'],
+                'attempts': 0,
+                'next_attempt': 0.0,
+            }
+        if self._pending:
+            self.log(f"📂 Sheets 대기 목록 복구: {len(self._pending)}건")
+
+    def _save_backlog(self):
+        """대기 목록을 임시 파일에 쓴 뒤 교체 (호출 측에서 _cond 보유)"""
+        items = [
+            {'room_number': item['room_number'], 'status': item['status']}
+            for item in self._pending.values()
+        ]
+        tmp_path = self.backlog_file + '.tmp'
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.backlog_file)), exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(items, f, ensure_ascii=False)
+            os.replace(tmp_path, self.backlog_file)
+        except OSError as e:
+            self.log(f"⚠️ Sheets 대기 목록 저장 실패: {e}")
+
+    def enqueue(self, room_number, status):
+        key = normalize_room_number(room_number)
+        with self._cond:
+            # 같은 객실의 이전 변경은 덮어쓴다 (마지막 상태만 의미 있음)
+            self._pending[key] = {
+                'room_number': room_number,
+                'status': status,
+                'attempts': 0,
+                'next_attempt': 0.0,
+            }
+            self._save_backlog()
+            self._cond.notify()
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="sheets-sync", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=5.0):
+        """남은 항목을 한 번 더 전송 시도한 뒤 종료. 실패분은 파일에 남는다"""
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        with self._cond:
+            self._save_backlog()
+
+    def _due_items(self, now):
+        return [(key, dict(item)) for key, item in self._pending.items() if item['next_attempt'] <= now]
+
+    def _next_wait(self, now):
+        if not self._pending:
+            return None
+        return max(min(item['next_attempt'] for item in self._pending.values()) - now, 0.0)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._running:
+                    wait = self._next_wait(time.monotonic())
+                    if wait == 0.0:
+                        break
+                    self._cond.wait(wait)
+
+                if self._running:
+                    # 연속된 변경을 모아서 한 번에 보내도록 잠깐 대기
+                    self._cond.wait(self.batch_window)
+
+                batch = self._due_items(time.monotonic())
+                stopping = not self._running
+
+            if batch:
+                self._flush(batch)
+            if stopping:
+                return
+
+    def _flush(self, batch):
+        results = []
+        for index, (key, item) in enumerate(batch):
+            started = time.monotonic()
+            try:
+                push_room_status(self.client, item['room_number'], item['status'])
+                self.log(f"Google Sheets 업데이트 성공: {item['room_number']} -> {item['status']}")
+                results.append((key, item, None))
+                result = 'success'
+            except RoomNotFoundError as e:
+                self.log(str(e))
+                results.append((key, item, None))
+                result = 'not_found'
+            except CircuitOpenError as e:
+                # 차단기가 열림: 남은 항목은 보내지 않고 대기 목록에 둔 채 시험 호출 시각까지 미룬다
+                deferred = batch[index:]
+                self.log(f"⏸️ Google Sheets 업데이트 {len(deferred)}건 보류: {e}")
+                results.extend((key, item, e) for key, item in deferred)
+                for _, item in deferred:
+                    events.record('sheets', room_number=item['room_number'],
+                                  message=f"Sheets {item['status']}: deferred", result='deferred')
+                break
+            except Exception as e:
+                self.log(f"Google Sheets 업데이트 오류 (재시도 예정): {e}")
+                results.append((key, item, e))
+                result = 'error'
+            SHEETS_SECONDS.observe(time.monotonic() - started, result)
+            events.record('sheets', room_number=item['room_number'],
+                          message=f"Sheets {item['status']}: {result}", result=result)
+
+        with self._cond:
+            now = time.monotonic()
+            for key, item, error in results:
+                current = self._pending.get(key)
+                # 전송 중에 새 상태가 들어왔으면 그대로 두고 다음 배치에서 보낸다
+                if current is None or current['status'] != item['status']:
+                    continue
+                if error is None:
+                    del self._pending[key]
+                elif isinstance(error, CircuitOpenError):
+                    current['next_attempt'] = now + max(error.retry_in, RETRY_BACKOFF_BASE)
+                else:
+                    current['attempts'] += 1
+                    backoff = min(RETRY_BACKOFF_MAX, RETRY_BACKOFF_BASE * (2 ** (current['attempts'] - 1)))
+                    current['next_attempt'] = now + backoff
+            self._save_backlog()
@@ -0,0 +1,175 @@
+"""소켓 실행기(executor.SocketExecutor) 참고 소비자
+
+매니저에 접속해 작업을 받아 handler로 처리하고 ack를 돌려준다. 연결이 끊기면 다시 접속한다.
+AHK 쪽 구현의 기준이자, 리눅스에서 소켓 경로를 시험/벤치마크할 때 쓰는 가짜 자동화다.
+
+    python pms_socket_consumer.py --port 9120 --delay-ms 50
+    python pms_socket_consumer.py --port 9120 -- AutoHotkey.exe pms_macro.ahk {room_number} {action}
+
+명령을 주면 작업마다 인자별로 {필드}를 채워 실행하고(셸을 거치지 않음) 종료 코드 0이면 성공으로 응답한다.
+"""
+import argparse
+import json
+import queue
+import socket
+import subprocess
+import threading
+import time
+
+from .executor import DEFAULT_BASE_PORT, DEFAULT_HOST, encode_message
+
+DEFAULT_RECONNECT_INTERVAL = 1.0
+DEFAULT_COMMAND_TIMEOUT = 60.0
+
+_STOP = object()
+
+
+class SocketConsumer:
+    """handler(job)가 예외 없이 끝나면 성공 ack, 예외면 그 메시지로 실패 ack. 작업은 받은 순서대로 하나씩"""
+
+    def __init__(self, host, port, handler, name='pms_socket_consumer',
+                 reconnect_interval=DEFAULT_RECONNECT_INTERVAL, log=print):
+        self.host = host
+        self.port = port
+        self.handler = handler
+        self.name = name
+        self.reconnect_interval = reconnect_interval
+        self.log = log
+        self.processed = []
+        self._stop = threading.Event()
+        self._sock = None
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self.run, name="socket-consumer", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        sock = self._sock
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        if self._thread is not None:
+            self._thread.join(2.0)
+
+    def run(self):
+        """stop()까지 접속 → 처리 → 재접속 반복"""
+        while not self._stop.is_set():
+            try:
+                sock = socket.create_connection((self.host, self.port), timeout=self.reconnect_interval)
+            except OSError:
+                self._stop.wait(self.reconnect_interval)
+                continue
+            sock.settimeout(None)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self._sock = sock
+            self.log(f"🔌 매니저 연결: {self.host}:{self.port}")
+            try:
+                self._serve(sock)
+            finally:
+                self._sock = None
+                sock.close()
+            if not self._stop.is_set():
+                self.log("⚠️ 매니저 연결 끊김, 다시 연결")
+                self._stop.wait(self.reconnect_interval)
+
+    def _serve(self, sock):
+        jobs = queue.SimpleQueue()
+        cancelled = set()
+        worker = threading.Thread(target=self._work, args=(sock, jobs, cancelled), name="socket-consumer-work",
+                                  daemon=True)
+        worker.start()
+        try:
+            sock.sendall(encode_message({'type': 'hello', 'name': self.name}))
+            reader = sock.makefile('rb')
+            for line in reader:
+                try:
+                    message = json.loads(line.decode('utf-8'))
+                except ValueError:
+                    continue
+                if message.get('type') == 'job':
+                    jobs.put(message)
+                elif message.get('type') == 'cancel':
+                    # 아직 시작하지 않은 작업만 버린다
+                    cancelled.add(message.get('seq'))
+        except OSError:
+            pass
+        finally:
+            jobs.put(_STOP)
+            worker.join()
+
+    def _work(self, sock, jobs, cancelled):
+        while True:
+            job = jobs.get()
+            if job is _STOP:
+                return
+            if job.get('seq') in cancelled:
+                continue
+            started = time.monotonic()
+            try:
+                self.handler(job)
+                ack = {'type': 'ack', 'seq': job.get('seq'), 'success': True, 'error': ''}
+            except Exception as e:
+                ack = {'type': 'ack', 'seq': job.get('seq'), 'success': False, 'error': str(e)}
+            ack['ms'] = round((time.monotonic() - started) * 1000, 1)
+            self.processed.append(job.get('queue_id'))
+            try:
+                sock.sendall(encode_message(ack))
+            except OSError:
+                # 끊긴 연결: 매니저가 이 작업을 실패로 처리한다
+                return
+
+
+def command_handler(command, timeout=DEFAULT_COMMAND_TIMEOUT):
+    """작업마다 command 인자 목록의 {필드}를 채워 실행 (셸을 거치지 않으므로 손님 이름 등이 명령으로 해석되지 않음)"""
+
+    def run(job):
+        args = [arg.format_map(_Fields(job)) for arg in command]
+        result = subprocess.run(args, capture_output=True, text=True, timeout=timeout)
+        if result.returncode != 0:
+            lines = [line for line in (result.stderr or result.stdout or '').splitlines() if line.strip()]
+            raise RuntimeError(lines[-1] if lines else f"종료 코드 {result.returncode}")
+
+    return run
+
+
+def delay_handler(delay):
+    def run(job):
+        time.sleep(delay)
+
+    return run
+
+
+class _Fields(dict):
+    def __missing__(self, key):
+        return ''
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="PMS 매니저 소켓 실행기 참고 소비자")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_BASE_PORT, help="Property의 socket_port")
+    parser.add_argument('--delay-ms', type=float, default=50, help="명령이 없을 때 처리한 것으로 볼 시간")
+    parser.add_argument('--command-timeout-sec', type=float, default=DEFAULT_COMMAND_TIMEOUT)
+    parser.add_argument('command', nargs=argparse.REMAINDER,
+                        help="-- 뒤에 작업마다 실행할 명령 ({room_number}, {action}, {queue_id} …)")
+    args = parser.parse_args(argv)
+
+    command = args.command[1:] if args.command[:1] == ['--'] else args.command
+    if command:
+        handler = command_handler(command, args.command_timeout_sec)
+    else:
+        handler = delay_handler(args.delay_ms / 1000)
+
+    def handle(job):
+        print(f"▶ #{job.get('seq')} {job.get('action')} {job.get('room_number')}")
+        handler(job)
+
+    consumer = SocketConsumer(args.host, args.port, handle)
+    try:
+        consumer.run()
+    except KeyboardInterrupt:
+        print("👋 종료")
@@ -0,0 +1,285 @@
+"""트리거 스풀 디렉터리: 여러 작업을 순번 파일로 넘기고 순번별 완료 확인을 받는다
+
+단일 트리거 파일 대신 아래 구조를 사용한다 (모든 파일은 .tmp에 쓴 뒤 rename).
+
+    <spool_dir>/jobs/00000042.json     작업 하나 (seq, queue_id, room_number, action, ...)
+    <spool_dir>/batches/00000042.json  {"batch": 42, "seqs": [42, 43, 44]} — 한 번에 처리할 묶음
+    <spool_dir>/acks/00000042.json     자동화 쪽이 쓰는 완료 확인 {"seq": 42, "success": true, "error": ""}
+    <spool_dir>/sequence               마지막으로 발급한 순번
+
+자동화 쪽은 ack가 없는 작업을 순번 순서로 처리하고, 매니페스트가 있으면 그 묶음을
+한 번에 처리한 뒤 작업마다 ack를 쓴다. 매니저는 ack를 읽으면 작업/ack 파일을 지운다.
+"""
+import json
+import os
+import threading
+import time
+
+from .watch import DEFAULT_POLL_INTERVAL, DirectoryWatcher
+
+DEFAULT_BATCH_SIZE = 1
+DEFAULT_BATCH_WINDOW = 0.1
+SEQ_WIDTH = 8
+
+
+def write_json_atomic(path, data):
+    """임시 파일에 쓴 뒤 교체: 읽는 쪽이 절반만 쓰인 파일을 보지 않는다"""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _read_json(path):
+    try:
+        with open(path, 'r', encoding='utf-8-sig') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+        return True
+    except OSError:
+        return False
+
+
+def _seq_of(filename):
+    stem, ext = os.path.splitext(filename)
+    if ext != '.json' or not stem.isdigit():
+        return None
+    return int(stem)
+
+
+class TriggerSpool:
+    """작업 파일 쓰기(묶음) + 순번별 ack 대기 (실행기 방식은 executor.py 참고)"""
+
+    label = "트리거 스풀 감시"
+    # 작업/ack가 파일로 남아 재시작 후에도 이어서 기다릴 수 있다
+    durable = True
+
+    def __init__(self, spool_dir, log, batch_size=DEFAULT_BATCH_SIZE, batch_window=DEFAULT_BATCH_WINDOW,
+                 poll_interval=DEFAULT_POLL_INTERVAL, use_notifications=True):
+        self.spool_dir = spool_dir
+        self.log = log
+        self.batch_size = max(1, batch_size)
+        self.batch_window = batch_window
+        self.jobs_dir = os.path.join(spool_dir, 'jobs')
+        self.batches_dir = os.path.join(spool_dir, 'batches')
+        self.acks_dir = os.path.join(spool_dir, 'acks')
+        self.ack_watcher = DirectoryWatcher(self.acks_dir, poll_interval, use_notifications)
+        self._seq = 0
+        # 아직 파일로 쓰지 않은 작업: [(seq, payload)]
+        self._buffer = []
+        self._written_seq = 0
+        # 파일 쓰기에 실패한 순번 → 예외 (submit()에서 다시 던진다)
+        self._write_errors = {}
+        # 매니페스트 번호 → 아직 ack 받지 못한 순번 집합
+        self._open_batches = {}
+        self._cond = threading.Condition()
+        self._running = False
+        self._thread = None
+
+    @property
+    def backend(self):
+        return self.ack_watcher.backend
+
+    def describe(self):
+        return f"Trigger Spool: {self.spool_dir} (묶음 최대 {self.batch_size}건)"
+
+    def _path(self, directory, seq):
+        return os.path.join(directory, f"{seq:0{SEQ_WIDTH}d}.json")
+
+    def _sequence_file(self):
+        return os.path.join(self.spool_dir, 'sequence')
+
+    def _load_sequence(self):
+        last = 0
+        try:
+            with open(self._sequence_file(), 'r', encoding='utf-8') as f:
+                last = int(f.read().strip() or 0)
+        except (OSError, ValueError):
+            pass
+        for directory in (self.jobs_dir, self.batches_dir, self.acks_dir):
+            for name in os.listdir(directory):
+                seq = _seq_of(name)
+                if seq is not None:
+                    last = max(last, seq)
+        return last
+
+    def _save_sequence(self):
+        tmp_path = self._sequence_file() + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(str(self._seq))
+        os.replace(tmp_path, self._sequence_file())
+
+    def _sweep(self):
+        """작업 파일 없이 남은 ack/매니페스트 정리, 남은 매니페스트는 다시 추적"""
+        pending = {_seq_of(name) for name in os.listdir(self.jobs_dir)} - {None}
+        for name in os.listdir(self.acks_dir):
+            seq = _seq_of(name)
+            if seq is not None and seq not in pending:
+                _remove(os.path.join(self.acks_dir, name))
+        for name in os.listdir(self.batches_dir):
+            batch = _seq_of(name)
+            if batch is None:
+                continue
+            manifest = _read_json(os.path.join(self.batches_dir, name)) or {}
+            seqs = set(manifest.get('seqs', [])) & pending
+            if seqs:
+                self._open_batches[batch] = seqs
+            else:
+                _remove(os.path.join(self.batches_dir, name))
+        return len(pending)
+
+    def start(self):
+        for directory in (self.jobs_dir, self.batches_dir, self.acks_dir):
+            os.makedirs(directory, exist_ok=True)
+        with self._cond:
+            self._seq = self._written_seq = self._load_sequence()
+            leftover = self._sweep()
+        if leftover:
+            self.log(f"📂 스풀에 남은 작업 {leftover}건")
+        self.ack_watcher.start()
+        self._running = True
+        if self.batch_size > 1:
+            self._thread = threading.Thread(target=self._run, name="trigger-spool", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._flush()
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(2.0)
+            self._thread = None
+        self.ack_watcher.stop()
+
+    def pending(self):
+        """자동화 쪽이 아직 처리하지 않은 작업 수"""
+        try:
+            return sum(1 for name in os.listdir(self.jobs_dir) if _seq_of(name) is not None)
+        except OSError:
+            return 0
+
+    def submit(self, payload):
+        """작업을 스풀에 넣고 파일이 쓰일 때까지 대기. 발급된 순번 반환"""
+        with self._cond:
+            self._seq += 1
+            seq = self._seq
+            self._buffer.append((seq, dict(payload, seq=seq)))
+            if self.batch_size == 1 or len(self._buffer) >= self.batch_size or not self._running:
+                self._flush()
+            else:
+                self._cond.notify_all()
+            while self._written_seq < seq:
+                self._cond.wait()
+            error = self._write_errors.pop(seq, None)
+        if error is not None:
+            raise error
+        return seq
+
+    def _run(self):
+        """첫 작업이 들어온 뒤 batch_window 동안 모아서 한 번에 쓴다"""
+        with self._cond:
+            while self._running:
+                if not self._buffer:
+                    self._cond.wait()
+                    continue
+                deadline = time.monotonic() + self.batch_window
+                while self._running and self._buffer and len(self._buffer) < self.batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                self._flush()
+
+    def _flush(self):
+        """버퍼의 작업 파일을 쓰고, 두 건 이상이면 매니페스트를 마지막에 쓴다 (_cond 보유)"""
+        if not self._buffer:
+            return
+        batch, self._buffer = self._buffer, []
+        try:
+            for seq, payload in batch:
+                write_json_atomic(self._path(self.jobs_dir, seq), payload)
+            if len(batch) > 1:
+                seqs = [seq for seq, _ in batch]
+                write_json_atomic(self._path(self.batches_dir, seqs[0]), {'batch': seqs[0], 'seqs': seqs})
+                self._open_batches[seqs[0]] = set(seqs)
+            self._save_sequence()
+        except OSError as e:
+            self.log(f"❌ 스풀 쓰기 실패: {e}")
+            for seq, _ in batch:
+                _remove(self._path(self.jobs_dir, seq))
+                self._write_errors[seq] = e
+        finally:
+            self._written_seq = batch[-1][0]
+            self._cond.notify_all()
+
+    def find(self, queue_id):
+        """queue_id로 아직 정리되지 않은 작업의 순번 찾기 (재시작 후 이어서 대기할 때)"""
+        for name in sorted(os.listdir(self.jobs_dir)):
+            seq = _seq_of(name)
+            if seq is None:
+                continue
+            payload = _read_json(os.path.join(self.jobs_dir, name)) or {}
+            if payload.get('queue_id') == queue_id:
+                return seq
+        return None
+
+    def _ahead(self, seq):
+        """seq보다 앞서 쓴 작업 중 아직 ack가 없는 수. 같은 묶음은 함께 처리되므로 세지 않는다"""
+        with self._cond:
+            batch = next((seqs for seqs in self._open_batches.values() if seq in seqs), ())
+        try:
+            names = os.listdir(self.jobs_dir)
+        except OSError:
+            return 0
+        count = 0
+        for name in names:
+            other = _seq_of(name)
+            if (other is not None and other < seq and other not in batch
+                    and not os.path.exists(self._path(self.acks_dir, other))):
+                count += 1
+        return count
+
+    def wait(self, seq, timeout):
+        """ack가 올 때까지 대기 (timeout은 차례가 된 때부터). (경과 시간, ack dict) 또는 타임아웃 시 (None, None)"""
+        ack_path = self._path(self.acks_dir, seq)
+        ahead = self._ahead(seq)
+        if ahead:
+            # 앞선 작업이 끝나거나 회수되어 차례가 될 때까지
+            turn = self.ack_watcher.wait_until(lambda: os.path.exists(ack_path) or not self._ahead(seq),
+                                               timeout * ahead)
+            if turn is None:
+                return None, None
+        elapsed = self.ack_watcher.wait_until(lambda: os.path.exists(ack_path), timeout)
+        if elapsed is None:
+            return None, None
+
+        ack = _read_json(ack_path)
+        if not isinstance(ack, dict):
+            # 내용을 못 읽으면 파일이 생긴 것만으로 처리 완료로 본다
+            ack = {'seq': seq, 'success': True}
+        self._release(seq)
+        return elapsed, ack
+
+    def cancel(self, seq):
+        """타임아웃된 작업 파일을 지워 나중에 뒤늦게 실행되지 않게 한다. 이미 없으면 False"""
+        removed = _remove(self._path(self.jobs_dir, seq))
+        if removed:
+            self._release(seq)
+        return removed
+
+    def _release(self, seq):
+        _remove(self._path(self.jobs_dir, seq))
+        _remove(self._path(self.acks_dir, seq))
+        with self._cond:
+            for batch, seqs in list(self._open_batches.items()):
+                seqs.discard(seq)
+                if not seqs:
+                    del self._open_batches[batch]
+                    _remove(self._path(self.batches_dir, batch))
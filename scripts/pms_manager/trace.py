@@ -0,0 +1,91 @@
+"""처리 경로 추적 기록 (JSONL)
+
+설정에 trace_dir이 있으면 실행마다 trace_<시작 시각>.jsonl 파일을 만들고, 한 줄에 하나씩
+{"t": 시작 후 초, "k": 종류, ...}를 남긴다. start() 전에는 record()가 아무 일도 하지 않는다.
+
+    queue    Firebase 큐 이벤트 (p, ev, path, data)
+    trigger  트리거/스풀 전달 (p, id, phase=written|consumed|timeout|failed|blocked, ms)
+    job      항목 처리 끝 (p, id, action, result, ms)
+    write    Firebase 쓰기 커밋 (paths, writes, ms, ok)
+    http     웹앱 호출 (m, path, status, ms)
+
+pms_replay.py가 이 파일의 큐 이벤트 시각과 AHK 처리 시간으로 같은 부하를 재현한다.
+"""
+import json
+import threading
+import time
+
+# 추적 파일에 남기지 않는 개인정보 필드
+PRIVATE_FIELDS = frozenset(['guestName', 'password', 'phone', 'email'])
+# 버퍼를 파일로 내보내는 최소 간격(초)
+FLUSH_INTERVAL = 1.0
+
+_lock = threading.Lock()
+_file = None
+_started = 0.0
+_last_flush = 0.0
+
+
+def enabled():
+    return _file is not None
+
+
+def start(path):
+    global _file, _started, _last_flush
+    with _lock:
+        _file = open(path, 'a', encoding='utf-8')
+        _started = _last_flush = time.monotonic()
+    record('start', wall=time.strftime('%Y-%m-%dT%H:%M:%S'))
+
+
+def stop():
+    global _file
+    with _lock:
+        if _file is not None:
+            _file.close()
+            _file = None
+
+
+def scrub(value):
+    """개인정보 필드 값을 가린 복사본"""
+    if isinstance(value, dict):
+        return {key: '*' if key in PRIVATE_FIELDS and item else scrub(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [scrub(item) for item in value]
+    return value
+
+
+def record(kind, **fields):
+    global _last_flush
+    if _file is None:
+        return
+    now = time.monotonic()
+    entry = {'t': round(now - _started, 4), 'k': kind}
+    entry.update(fields)
+    line = json.dumps(entry, ensure_ascii=False, separators=(',', ':'), default=str)
+    with _lock:
+        if _file is None:
+            return
+        _file.write(line + '\n')
+        if now - _last_flush >= FLUSH_INTERVAL:
+            _file.flush()
+            _last_flush = now
+
+
+def load(path):
+    """추적 파일을 레코드 목록으로. 여러 번 실행한 기록이 이어져 있으면 마지막 실행만"""
+    records = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # 비정상 종료로 잘린 마지막 줄
+                continue
+            if entry.get('k') == 'start':
+                records = []
+            records.append(entry)
+    return records
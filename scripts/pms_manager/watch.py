@@ -0,0 +1,160 @@
+"""파일 변경 감시
+
+watchdog이 설치되어 있으면 OS 변경 알림(Windows: ReadDirectoryChangesW,
+Linux: inotify)을 사용하고, 없으면 짧은 주기로 stat을 비교하는 폴링으로 동작한다.
+어느 쪽이든 변경이 감지되면 wait_until() / wait_for_change()로 대기 중인
+스레드를 즉시 깨운다.
+"""
+import os
+import threading
+import time
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # watchdog 미설치 시 폴링으로 대체
+    FileSystemEventHandler = object
+    Observer = None
+
+DEFAULT_POLL_INTERVAL = 0.05
+# 알림 모드에서도 놓친 이벤트에 대비해 가끔 직접 확인
+NOTIFY_SAFETY_INTERVAL = 0.5
+
+
+def file_signature(path):
+    """(mtime_ns, size) 또는 파일이 없으면 None"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+class _EventHandler(FileSystemEventHandler):
+    def __init__(self, watcher):
+        super().__init__()
+        self.watcher = watcher
+
+    def on_any_event(self, event):
+        paths = [getattr(event, 'src_path', ''), getattr(event, 'dest_path', '')]
+        if any(self.watcher.matches(p) for p in paths if p):
+            self.watcher.notify()
+
+
+class FileWatcher:
+    """단일 파일의 생성/수정/삭제를 감시"""
+
+    def __init__(self, path, poll_interval=DEFAULT_POLL_INTERVAL, use_notifications=True):
+        self.path = os.path.abspath(path)
+        self.directory = os.path.dirname(self.path)
+        self.poll_interval = poll_interval
+        self.use_notifications = use_notifications and Observer is not None
+        self.generation = 0
+        # 변경 시 호출할 함수 (감시 스레드에서 호출됨)
+        self._listeners = []
+        self._cond = threading.Condition()
+        self._observer = None
+        self._poll_thread = None
+        self._running = False
+
+    @property
+    def backend(self):
+        return 'notify' if self._observer is not None else 'poll'
+
+    def matches(self, path):
+        return os.path.normcase(os.path.abspath(path)) == os.path.normcase(self.path)
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        os.makedirs(self.directory, exist_ok=True)
+
+        if self.use_notifications:
+            try:
+                observer = Observer()
+                observer.schedule(_EventHandler(self), self.directory, recursive=False)
+                observer.daemon = True
+                observer.start()
+                self._observer = observer
+                return
+            except Exception:
+                self._observer = None
+
+        self._poll_thread = threading.Thread(
+            target=self._poll_loop,
+            name=f"watch-{os.path.basename(self.path)}",
+            daemon=True,
+        )
+        self._poll_thread.start()
+
+    def stop(self):
+        self._running = False
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer = None
+        self.notify()
+
+    def add_listener(self, callback):
+        self._listeners.append(callback)
+
+    def notify(self):
+        with self._cond:
+            self.generation += 1
+            self._cond.notify_all()
+        for callback in self._listeners:
+            callback()
+
+    def _signature(self):
+        return file_signature(self.path)
+
+    def _poll_loop(self):
+        last = self._signature()
+        while self._running:
+            time.sleep(self.poll_interval)
+            current = self._signature()
+            if current != last:
+                last = current
+                self.notify()
+
+    def _check_interval(self):
+        return NOTIFY_SAFETY_INTERVAL if self._observer is not None else self.poll_interval
+
+    def wait_until(self, predicate, timeout):
+        """predicate()가 참이 될 때까지 대기. 경과 시간(초) 또는 타임아웃 시 None 반환"""
+        started = time.monotonic()
+        deadline = started + timeout
+
+        with self._cond:
+            while True:
+                if predicate():
+                    return time.monotonic() - started
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self._cond.wait(min(remaining, self._check_interval()))
+
+    def wait_for_change(self, generation, timeout=None):
+        """generation 이후 변경이 생기면 새 generation 반환, 타임아웃 시 None"""
+        with self._cond:
+            if self._cond.wait_for(lambda: self.generation != generation, timeout):
+                return self.generation
+            return None
+
+
+class DirectoryWatcher(FileWatcher):
+    """디렉터리 바로 아래 파일의 생성/수정/삭제를 감시"""
+
+    def __init__(self, path, poll_interval=DEFAULT_POLL_INTERVAL, use_notifications=True):
+        super().__init__(path, poll_interval, use_notifications)
+        self.directory = self.path
+
+    def matches(self, path):
+        return os.path.normcase(os.path.dirname(os.path.abspath(path))) == os.path.normcase(self.path)
+
+    def _signature(self):
+        try:
+            names = sorted(os.listdir(self.path))
+        except OSError:
+            return None
+        return tuple((name, file_signature(os.path.join(self.path, name))) for name in names)
@@ -0,0 +1,383 @@
+"""웹앱(Google Sheets) API 클라이언트"""
+import random
+import re
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from . import metrics
+from . import trace
+
+DEFAULT_ROOM_CACHE_TTL = 300.0
+DEFAULT_CONNECT_TIMEOUT = 3.05
+DEFAULT_READ_TIMEOUT = 10.0
+DEFAULT_MAX_RETRIES = 2
+RETRY_BACKOFF_BASE = 0.5
+RETRY_BACKOFF_MAX = 8.0
+# 재시도해도 결과가 같은(멱등) 메서드만 재시도
+IDEMPOTENT_METHODS = frozenset(['GET', 'HEAD', 'PUT', 'DELETE', 'OPTIONS'])
+RETRY_STATUS_CODES = frozenset([429, 500, 502, 503, 504])
+# 목록에 없는 객실을 연속으로 조회할 때 목록을 다시 받는 최소 간격(초)
+MISS_REFRESH_INTERVAL = 10.0
+# 차단기: 연속 실패 횟수, 차단 시간(초). 시험 호출이 실패할 때마다 차단 시간을 두 배로 (최대 CIRCUIT_OPEN_MAX)
+DEFAULT_CIRCUIT_FAILURES = 5
+DEFAULT_CIRCUIT_OPEN_TIME = 30.0
+CIRCUIT_OPEN_MAX = 300.0
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+CIRCUIT_LEVELS = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+CIRCUIT_STATE = metrics.gauge('pms_web_app_circuit_state', '웹앱 차단기 상태 (0 closed, 1 half_open, 2 open)')
+CIRCUIT_REJECTED = metrics.counter('pms_web_app_rejected_total', '차단기가 열려 보내지 않은 웹앱 호출 수')
+
+
+class WebAppError(Exception):
+    """웹앱 호출 실패 (재시도 가능)"""
+
+
+class RoomNotFoundError(WebAppError):
+    """웹앱 객실 목록에 없는 객실 (재시도해도 실패)"""
+
+
+class CircuitOpenError(WebAppError):
+    """차단기가 열려 있어 호출하지 않음 (retry_in초 뒤 다시 시도)"""
+
+    def __init__(self, retry_in):
+        super().__init__(f"웹앱 호출 차단 중 ({retry_in:.0f}초 후 재확인)")
+        self.retry_in = retry_in
+
+
+def normalize_room_number(room_number):
+    """'Camp 101', 'CAMP101', ' camp 101호' → 'CAMP101'"""
+    key = re.sub(r'\s+', '', str(room_number or '')).upper()
+    return key[:-1] if key.endswith('호') else key
+
+
+class RoomDirectory:
+    """웹앱 객실 목록을 정규화된 객실 번호 → 객실 ID 로 색인해 캐시"""
+
+    def __init__(self, client, ttl=DEFAULT_ROOM_CACHE_TTL, log=None):
+        self.client = client
+        self.ttl = ttl
+        self.log = log
+        self._index = {}
+        self._loaded_at = None
+        self._last_miss_refresh = 0.0
+        # 만료 후 갱신에 실패하면 이 시각까지 이전 색인을 그대로 쓴다
+        self._stale_until = 0.0
+        self._lock = threading.Lock()
+
+    def _is_fresh(self):
+        if self._loaded_at is not None and time.monotonic() - self._loaded_at < self.ttl:
+            return True
+        return bool(self._index) and time.monotonic() < self._stale_until
+
+    def _refresh_or_keep(self):
+        """만료된 색인 갱신. 실패해도 이전 색인이 있으면 그것을 쓰고 MISS_REFRESH_INTERVAL 뒤 다시 시도"""
+        try:
+            self.refresh()
+        except (WebAppError, requests.RequestException, ValueError) as e:
+            if not self._index:
+                raise
+            self._stale_until = time.monotonic() + MISS_REFRESH_INTERVAL
+            if self.log is not None:
+                self.log(f"⚠️ 객실 목록 갱신 실패, 이전 목록({len(self._index)}개)으로 조회: {e}")
+
+    def refresh(self):
+        """객실 목록을 다시 받아 색인 재구성. 실패 시 예외"""
+        response = self.client.get("/api/room-status")
+        if response.status_code != 200:
+            raise WebAppError(f"객실 목록 조회 실패: {response.status_code}")
+
+        rooms = response.json()
+        if isinstance(rooms, dict):
+            rooms = rooms.get('rooms', [])
+
+        # roomNumber 일치를 matchingRoomNumber 일치보다 우선
+        index = {}
+        for field in ('roomNumber', 'matchingRoomNumber'):
+            for room in rooms:
+                key = normalize_room_number(room.get(field))
+                if key and room.get('id'):
+                    index.setdefault(key, room.get('id'))
+
+        self._index = index
+        self._loaded_at = time.monotonic()
+        return len(index)
+
+    def invalidate(self):
+        with self._lock:
+            self._loaded_at = None
+            self._stale_until = 0.0
+
+    def lookup(self, room_number):
+        """객실 ID 반환. 캐시가 만료됐거나 없는 객실이면 목록을 다시 받는다 (만료 후 갱신에 실패하면 이전 목록)"""
+        key = normalize_room_number(room_number)
+        with self._lock:
+            if not self._is_fresh():
+                self._refresh_or_keep()
+                return self._index.get(key)
+
+            room_id = self._index.get(key)
+            if room_id is None and time.monotonic() - self._last_miss_refresh >= MISS_REFRESH_INTERVAL:
+                self._last_miss_refresh = time.monotonic()
+                self.refresh()
+                room_id = self._index.get(key)
+            return room_id
+
+
+class CircuitBreaker:
+    """웹앱 호출이 연속 failure_threshold회 실패하면 open_time 동안 호출하지 않고 바로 거절(open).
+    그 뒤 한 번만 시험 호출(half_open)을 보내 성공하면 닫고, 실패하면 더 오래 연다"""
+
+    def __init__(self, failure_threshold=DEFAULT_CIRCUIT_FAILURES, open_time=DEFAULT_CIRCUIT_OPEN_TIME, log=None):
+        self.failure_threshold = failure_threshold
+        self.open_time = open_time
+        self.log = log
+        self.state = CLOSED
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = 0.0
+        self._open_for = open_time
+        self._probing = False
+        self._opened = 0
+        self._rejected = 0
+
+    def _log(self, message):
+        if self.log is not None:
+            self.log(message)
+
+    def retry_in(self):
+        """시험 호출을 보낼 수 있을 때까지 남은 시간(초)"""
+        with self._lock:
+            if self.state != OPEN:
+                return 0.0
+            return max(self._opened_at + self._open_for - time.monotonic(), 0.0)
+
+    def allow(self):
+        """이번 호출을 보내도 되면 그 시점 상태(CLOSED, 시험 호출이면 HALF_OPEN), 아니면 None.
+        half_open이면 한 번에 하나만 허용"""
+        with self._lock:
+            if self.state == OPEN and time.monotonic() >= self._opened_at + self._open_for:
+                self.state = HALF_OPEN
+                self._probing = False
+            if self.state == CLOSED or (self.state == HALF_OPEN and not self._probing):
+                self._probing = self.state == HALF_OPEN
+                return self.state
+            self._rejected += 1
+        CIRCUIT_REJECTED.inc()
+        return None
+
+    def end_probe(self):
+        """시험 호출이 success()/failure() 없이 끝났을 때(예상 밖 예외 등) 다음 호출이 다시 시험하게 한다"""
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._probing = False
+
+    def success(self):
+        with self._lock:
+            recovered = self.state != CLOSED
+            self.state = CLOSED
+            self._failures = 0
+            self._probing = False
+            self._open_for = self.open_time
+        if recovered:
+            self._log("✓ 웹앱 응답 확인: 차단 해제")
+
+    def failure(self, reason):
+        with self._lock:
+            self._failures += 1
+            if self.state == HALF_OPEN:
+                self._open_for = min(self._open_for * 2, max(CIRCUIT_OPEN_MAX, self.open_time))
+            elif self.state != CLOSED or self._failures < self.failure_threshold:
+                return
+            self.state = OPEN
+            self._opened_at = time.monotonic()
+            self._probing = False
+            self._opened += 1
+            open_for, failures = self._open_for, self._failures
+        self._log(f"🔌 웹앱 호출 차단: 연속 실패 {failures}회 ({reason}), {open_for:.0f}초 후 재확인")
+
+    def snapshot(self):
+        retry_in = self.retry_in()
+        with self._lock:
+            return {
+                'state': self.state,
+                'failures': self._failures,
+                'retry_in_sec': round(retry_in, 1),
+                'opened': self._opened,
+                'rejected': self._rejected,
+            }
+
+
+class ConnectionStats:
+    """요청 수와 새로 연 TCP(+TLS) 연결 수. 차이가 keep-alive로 재사용된 횟수"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.new_connections = 0
+        self.retries = 0
+
+    def add(self, field):
+        with self._lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'new_connections': self.new_connections,
+                'reused_connections': max(self.requests - self.new_connections, 0),
+                'retries': self.retries,
+            }
+
+
+def _counting_pool_class(base, stats):
+    class CountingPool(base):
+        def _new_conn(self):
+            stats.add('new_connections')
+            return super()._new_conn()
+
+    return CountingPool
+
+
+class _CountingAdapter(HTTPAdapter):
+    """urllib3 풀이 새 연결을 만들 때마다 ConnectionStats에 기록"""
+
+    def __init__(self, stats, **kwargs):
+        self.stats = stats
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _counting_pool_class(HTTPConnectionPool, self.stats),
+            'https': _counting_pool_class(HTTPSConnectionPool, self.stats),
+        }
+
+
+class WebAppClient:
+    """모든 Property가 공유하는 웹앱 HTTP 클라이언트 (keep-alive 풀 + 재시도 + 차단기)"""
+
+    def __init__(self, base_url, api_key='', room_cache_ttl=DEFAULT_ROOM_CACHE_TTL,
+                 connect_timeout=DEFAULT_CONNECT_TIMEOUT, read_timeout=DEFAULT_READ_TIMEOUT,
+                 max_retries=DEFAULT_MAX_RETRIES, circuit_failures=DEFAULT_CIRCUIT_FAILURES,
+                 circuit_open_time=DEFAULT_CIRCUIT_OPEN_TIME, log=None):
+        self.base_url = base_url.rstrip('/')
+        self.api_key = api_key
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.stats = ConnectionStats()
+        self.breaker = CircuitBreaker(circuit_failures, circuit_open_time, log=log)
+        CIRCUIT_STATE.set_function(lambda: CIRCUIT_LEVELS[self.breaker.state])
+
+        self.session = requests.Session()
+        adapter = _CountingAdapter(self.stats, pool_connections=4, pool_maxsize=8)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        if api_key:
+            self.session.headers['x-api-key'] = api_key
+
+        self.rooms = RoomDirectory(self, ttl=room_cache_ttl, log=log)
+
+    def _backoff(self, attempt):
+        # 지수 백오프 + 지터: 여러 스레드가 같은 순간에 재시도하지 않도록
+        delay = min(RETRY_BACKOFF_MAX, RETRY_BACKOFF_BASE * (2 ** attempt))
+        return random.uniform(delay / 2, delay)
+
+    def request(self, method, path, **kwargs):
+        method = method.upper()
+        kwargs.setdefault('timeout', self.timeout)
+        retries = self.max_retries if method in IDEMPOTENT_METHODS else 0
+
+        # 웹앱이 죽어 있으면 타임아웃을 기다리지 않고 바로 실패
+        permit = self.breaker.allow()
+        if permit is None:
+            trace.record('http', m=method, path=path, status='CircuitOpen', ms=0.0)
+            raise CircuitOpenError(self.breaker.retry_in())
+
+        try:
+            return self._send(method, path, retries, kwargs)
+        finally:
+            if permit == HALF_OPEN:
+                # 결과를 기록하지 못한 시험 호출이 half_open을 계속 막지 않도록
+                self.breaker.end_probe()
+
+    def _send(self, method, path, retries, kwargs):
+        for attempt in range(retries + 1):
+            self.stats.add('requests')
+            started = time.monotonic()
+            try:
+                response = self.session.request(method, f"{self.base_url}{path}", **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                trace.record('http', m=method, path=path, status=type(e).__name__,
+                             ms=round((time.monotonic() - started) * 1000, 1))
+                self.breaker.failure(type(e).__name__)
+                # 차단기가 열렸으면 남은 재시도도 보내지 않는다
+                if attempt >= retries or self.breaker.state != CLOSED:
+                    raise
+            except requests.RequestException as e:
+                self.breaker.failure(type(e).__name__)
+                raise
+            else:
+                trace.record('http', m=method, path=path, status=response.status_code,
+                             ms=round((time.monotonic() - started) * 1000, 1))
+                if response.status_code not in RETRY_STATUS_CODES:
+                    self.breaker.success()
+                    return response
+                self.breaker.failure(f"HTTP {response.status_code}")
+                if attempt >= retries or self.breaker.state != CLOSED:
+                    return response
+                response.close()
+
+            self.stats.add('retries')
+            time.sleep(self._backoff(attempt))
+
+    def get(self, path, **kwargs):
+        return self.request('GET', path, **kwargs)
+
+    def put(self, path, **kwargs):
+        return self.request('PUT', path, **kwargs)
+
+    def close(self):
+        self.session.close()
+
+
+def push_room_status(client, room_number, new_status):
+    """객실 상태 PUT. 실패 시 WebAppError / RoomNotFoundError"""
+    room_id = client.rooms.lookup(room_number)
+
+    if not room_id:
+        raise RoomNotFoundError(f"Google Sheets에서 객실 찾을 수 없음: {room_number}")
+
+    update_response = client.put(
+        "/api/update-room-status",
+        json={"roomId": room_id, "newStatus": new_status},
+    )
+
+    if update_response.status_code == 404:
+        # 시트 행이 바뀌어 캐시된 ID가 무효해진 경우
+        client.rooms.invalidate()
+
+    if update_response.status_code != 200:
+        raise WebAppError(f"Google Sheets 업데이트 실패: {update_response.status_code}")
+
+
+# 큐 액션 → Google Sheets 상태
+ACTION_STATUS = {
+    'checkin': '사용중',
+    'checkout': '청소대기중',
+    'clean': '공실',
+    'dirty': '청소대기중'
+}
+
+
+def map_action_to_status(action):
+    """액션을 Google Sheets 상태로 매핑"""
+    return ACTION_STATUS.get(action, '공실')
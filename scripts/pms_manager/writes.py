@@ -0,0 +1,230 @@
+"""Firebase 쓰기 배처: 짧은 구간의 쓰기를 루트 multi-path update 하나로 합친다
+
+객실 상태 set/update, 큐 항목 completed/failed 기록, 지연 삭제 등 모든 쓰기가
+여기로 모인다. 첫 쓰기 후 batch_window 동안 들어온 쓰기를 경로 기준으로 합치고
+(같은 경로는 나중 값, 상위 경로를 쓰면 하위 경로 쓰기는 흡수), 토큰 버킷으로
+초당 커밋 수를 제한한다. 토큰을 기다리는 동안 들어온 쓰기도 같은 커밋에 합쳐진다.
+
+합친 커밋이 실패하면 호출별로 나눠 다시 보내, 잘못된 경로(키에 . # $ [ ] 등)를 쓴 호출만
+실패하고 같은 커밋에 묶였던 다른 쓰기(큐 항목 완료 기록 등)는 반영되게 한다.
+
+submit()/set()/update()/delete()는 concurrent.futures.Future를 돌려준다.
+확인이 필요한 호출 측은 result()로 기다리고(asyncio에서는 wrap_future),
+나머지는 add_done_callback()으로 실패만 기록한다.
+"""
+import threading
+import time
+from concurrent.futures import Future
+
+from . import firebase
+from . import metrics
+from . import trace
+
+DEFAULT_BATCH_WINDOW = 0.02
+DEFAULT_RATE = 20.0
+DEFAULT_BURST = 5
+# 이만큼 경로가 모이면 구간이 끝나기 전이라도 커밋
+MAX_BATCH_PATHS = 500
+
+WRITES_TOTAL = metrics.counter('pms_firebase_writes_total', '배처에 들어온 Firebase 쓰기 요청 수')
+COMMITS_TOTAL = metrics.counter(
+    'pms_firebase_commits_total', '루트 multi-path update 요청 수', ['result'])
+BATCH_WRITES = metrics.histogram(
+    'pms_firebase_batch_writes', '커밋 하나에 합쳐진 쓰기 요청 수',
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256))
+COMMIT_SECONDS = metrics.histogram('pms_firebase_commit_seconds', '루트 update 왕복 시간')
+THROTTLE_SECONDS = metrics.counter('pms_firebase_throttle_seconds_total', '속도 제한으로 기다린 시간')
+
+
+def _join(path, key):
+    path = path.strip('/')
+    key = key.strip('/')
+    return f"{path}/{key}" if path and key else path or key
+
+
+def _assign(node, parts, value):
+    """node(dict 또는 값)의 parts 위치에 value를 넣은 새 값. 빈 객체는 Firebase처럼 None"""
+    node = dict(node) if isinstance(node, dict) else {}
+    head, rest = parts[0], parts[1:]
+    child = _assign(node.get(head), rest, value) if rest else value
+    if child is None:
+        node.pop(head, None)
+    else:
+        node[head] = child
+    return node or None
+
+
+def _merged(updates):
+    pending = {}
+    for path, value in updates.items():
+        merge_write(pending, path, value)
+    return pending
+
+
+def merge_write(pending, path, value):
+    """{경로: 값} 묶음에 쓰기 하나를 합친다. 한 update 안에 상위/하위 경로가 함께 있으면
+    Firebase가 거부하므로, 상위 경로가 있으면 그 값 안에 넣고 하위 경로는 지운다"""
+    parts = path.split('/')
+    for depth in range(len(parts) - 1, 0, -1):
+        ancestor = '/'.join(parts[:depth])
+        if ancestor in pending:
+            pending[ancestor] = _assign(pending[ancestor], parts[depth:], value)
+            return
+    prefix = path + '/'
+    for key in [key for key in pending if key.startswith(prefix)]:
+        del pending[key]
+    pending[path] = value
+
+
+class TokenBucket:
+    """초당 rate개, 최대 burst개까지 모아 둘 수 있는 토큰. rate가 0이면 제한 없음"""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+
+    def reserve(self):
+        """토큰 하나를 쓰고, 그 토큰이 생길 때까지 기다려야 하는 시간(초) 반환"""
+        if not self.rate:
+            return 0.0
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        self._tokens -= 1
+        return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+
+class WriteBatcher:
+    """모든 Firebase 쓰기를 합쳐 보내는 백그라운드 스레드"""
+
+    def __init__(self, log, batch_window=DEFAULT_BATCH_WINDOW, rate=DEFAULT_RATE, burst=DEFAULT_BURST):
+        self.log = log
+        self.batch_window = batch_window
+        self.bucket = TokenBucket(rate, burst)
+        self._pending = {}
+        # (Future, 그 호출의 {경로: 값}) — 합친 커밋이 실패하면 호출별로 다시 보낸다
+        self._futures = []
+        self._first_at = None
+        self._cond = threading.Condition()
+        self._wake = threading.Event()
+        self._running = False
+        self._thread = None
+        self._stats = {'writes': 0, 'commits': 0, 'failed': 0, 'paths': 0, 'max_batch': 0,
+                       'throttled_sec': 0.0}
+
+    def __len__(self):
+        with self._cond:
+            return len(self._futures)
+
+    def stats(self):
+        with self._cond:
+            stats = dict(self._stats)
+        stats['throttled_sec'] = round(stats['throttled_sec'], 3)
+        return stats
+
+    def submit(self, updates):
+        """루트 기준 {경로: 값} (값 None은 삭제). 커밋 결과를 알려주는 Future 반환"""
+        future = Future()
+        updates = {path.strip('/'): value for path, value in updates.items()}
+        WRITES_TOTAL.inc()
+        with self._cond:
+            self._stats['writes'] += 1
+            if self._running:
+                for path, value in updates.items():
+                    merge_write(self._pending, path, value)
+                self._futures.append((future, updates))
+                if self._first_at is None:
+                    self._first_at = time.monotonic()
+                self._cond.notify()
+                return future
+
+        # 시작 전/종료 후에는 호출 스레드에서 바로 보낸다
+        self._commit(_merged(updates), [(future, updates)])
+        return future
+
+    def set(self, path, value):
+        return self.submit({path: value})
+
+    def update(self, path, values):
+        """path 아래 여러 자식을 한 번에 (Reference.update와 같음)"""
+        return self.submit({_join(path, key): value for key, value in values.items()})
+
+    def delete(self, path):
+        return self.submit({path: None})
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="firebase-writes", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=10.0):
+        """남은 쓰기를 속도 제한 없이 보내고 종료"""
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._running and not self._futures:
+                    self._cond.wait()
+                while self._running and len(self._pending) < MAX_BATCH_PATHS:
+                    remaining = self._first_at + self.batch_window - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                if not self._futures and not self._running:
+                    return
+
+            # 토큰을 기다리는 동안 들어온 쓰기도 이번 커밋에 합쳐진다
+            wait = self.bucket.reserve()
+            if wait > 0 and self._running:
+                THROTTLE_SECONDS.inc(amount=wait)
+                with self._cond:
+                    self._stats['throttled_sec'] += wait
+                self._wake.wait(wait)
+
+            with self._cond:
+                pending, futures = self._pending, self._futures
+                self._pending, self._futures, self._first_at = {}, [], None
+            if futures:
+                self._commit(pending, futures)
+
+    def _commit(self, pending, futures):
+        started = time.monotonic()
+        try:
+            if pending:
+                firebase.reference('/').update(pending)
+        except Exception as e:
+            trace.record('write', paths=sorted(pending), writes=len(futures),
+                         ms=round((time.monotonic() - started) * 1000, 1), ok=False)
+            COMMITS_TOTAL.inc('failure')
+            with self._cond:
+                self._stats['failed'] += 1
+            if len(futures) > 1:
+                # 어느 호출이 원인인지 모르므로 호출별로 나눠 보낸다 (들어온 순서대로 → 같은 경로는 나중 값)
+                self.log(f"⚠️ Firebase 쓰기 실패 ({len(futures)}건 합친 커밋), 호출별로 다시 전송: {e}")
+                for entry in futures:
+                    self._commit(_merged(entry[1]), [entry])
+                return
+            self.log(f"❌ Firebase 쓰기 실패 (경로 {len(pending)}개): {e}")
+            for future, _ in futures:
+                future.set_exception(e)
+            return
+
+        elapsed = time.monotonic() - started
+        trace.record('write', paths=sorted(pending), writes=len(futures), ms=round(elapsed * 1000, 1), ok=True)
+        COMMIT_SECONDS.observe(elapsed)
+        COMMITS_TOTAL.inc('success')
+        BATCH_WRITES.observe(len(futures))
+        with self._cond:
+            self._stats['commits'] += 1
+            self._stats['paths'] += len(pending)
+            self._stats['max_batch'] = max(self._stats['max_batch'], len(futures))
+        for future, _ in futures:
+            future.set_result(None)
@@ -0,0 +1,9 @@
+r"""PMS 매니저 추적 기록 재현 스크립트
+
+매니저 설정의 trace_dir에 남은 trace_*.jsonl을 로컬 대체 구현으로 다시 돌려 지연을 측정합니다.
+사용법: python pms_replay.py C:\PMS\traces\trace_20250301_090000.jsonl [--speed 10] [--json]
+"""
+from pms_manager.bench.replay import main
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,10 @@
+"""PMS 매니저 소켓 실행기 참고 소비자 스크립트
+
+trigger_mode가 socket일 때 매니저(socket_host:socket_port)에 접속해 작업을 받아 처리하고 ack를 돌려줍니다.
+사용법: python pms_socket_consumer.py --port 9120 [--delay-ms 50]
+        python pms_socket_consumer.py --port 9120 -- AutoHotkey.exe pms_macro.ahk {room_number} {action}
+"""
+from pms_manager.socket_consumer import main
+
+if __name__ == "__main__":
+    main()
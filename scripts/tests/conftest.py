@@ -0,0 +1,94 @@
+"""pms_manager 테스트 공용 fixture: 메모리 Firebase와 Property 하나짜리 매니저"""
+import pytest
+
+from pms_manager import firebase
+from pms_manager.bench.fake_firebase import FakeDatabase
+from pms_manager.cleanup import DeletionScheduler
+from pms_manager.config import ManagerConfig, PropertyConfig
+from pms_manager.journal import JobJournal
+from pms_manager.logger import configure_logging, shutdown_logging
+from pms_manager.property import PropertyManager
+from pms_manager.sheets_sync import SheetsSyncQueue
+from pms_manager.web_app import WebAppClient
+from pms_manager.writes import WriteBatcher
+
+from helpers import PROPERTY, QUEUE_PATH
+
+
+def _quiet(message):
+    pass
+
+
+@pytest.fixture
+def database():
+    db = FakeDatabase()
+    firebase.use_database(db)
+    yield db
+    firebase.use_database(None)
+
+
+@pytest.fixture
+def property_config(tmp_path):
+    directory = tmp_path / PROPERTY
+    directory.mkdir()
+    return PropertyConfig(
+        name=PROPERTY,
+        queue_path=QUEUE_PATH,
+        status_path=f"pms_status/{PROPERTY}",
+        trigger_file=str(directory / 'pms_trigger.txt'),
+        room_status_json=str(directory / 'room_status.json'),
+        log_file=str(directory / 'listener.log'),
+        spool_dir=str(directory / 'spool'),
+        ahk_log_file=str(directory / 'ahk_log.txt'),
+    )
+
+
+@pytest.fixture
+def make_manager(tmp_path, database, property_config):
+    """make_manager(**설정) → 시작한 PropertyManager. 같은 테스트에서 다시 부르면 같은 저널로 재시작"""
+    configure_logging('WARNING')
+    running = []
+
+    def make(**overrides):
+        for manager, parts in running:
+            _stop(manager, parts)
+        running.clear()
+
+        options = dict(
+            credentials_path='',
+            web_app_url='http://127.0.0.1:1',
+            log_file=str(tmp_path / 'manager.log'),
+            trigger_timeout=2.0,
+            trigger_timeout_min=0.5,
+            ahk_start_timeout=0,
+            journal_file=str(tmp_path / 'pms_journal.db'),
+            sheets_backlog_file=str(tmp_path / 'sheets_backlog.json'),
+            metrics_port=0,
+            properties=[property_config],
+        )
+        options.update(overrides)
+        settings = ManagerConfig(**options)
+        client = WebAppClient(settings.web_app_url, log=_quiet)
+        writes = WriteBatcher(_quiet)
+        writes.start()
+        sheets_sync = SheetsSyncQueue(client, settings.sheets_backlog_file, _quiet)
+        cleanup = DeletionScheduler(_quiet, writes, delay=60)
+        journal = JobJournal(settings.journal_file)
+        manager = PropertyManager(property_config, settings, sheets_sync, cleanup, journal, writes)
+        manager.start()
+        running.append((manager, (writes, journal, client)))
+        return manager
+
+    yield make
+
+    for manager, parts in running:
+        _stop(manager, parts)
+    shutdown_logging()
+
+
+def _stop(manager, parts):
+    writes, journal, client = parts
+    manager.stop()
+    writes.stop()
+    journal.close()
+    client.close()
@@ -0,0 +1,33 @@
+"""테스트 보조 함수"""
+import os
+import time
+
+from pms_manager import firebase
+
+PROPERTY = 'property1'
+QUEUE_PATH = f"pms_queue/{PROPERTY}"
+
+
+def wait_until(predicate, timeout=5.0, interval=0.01):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(interval)
+    return predicate()
+
+
+def queue_item(queue_id, room_number='C103', action='checkin', status='pending'):
+    data = {'roomNumber': room_number, 'action': action, 'guestName': '테스트', 'status': status}
+    firebase.reference(f"{QUEUE_PATH}/{queue_id}").set(data)
+    return data
+
+
+def queue_status(queue_id):
+    item = firebase.reference(f"{QUEUE_PATH}/{queue_id}").get()
+    return item.get('status') if isinstance(item, dict) else None
+
+
+def spool_jobs(config):
+    path = os.path.join(config.spool_dir, 'jobs')
+    return sorted(os.listdir(path)) if os.path.isdir(path) else []
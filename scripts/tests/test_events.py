@@ -0,0 +1,26 @@
+from pms_manager import events
+
+
+def test_room_numbers_are_normalized(tmp_path):
+    path = str(tmp_path / 'events.db')
+    events.start(path)
+    events.record('received', 'property1', 'q1', 'c 103호', 'checkin', "접수")
+    events.record('received', 'property1', 'q2', 'C104', 'checkin', "접수")
+    events.stop()
+
+    for room in ('C103', 'c103', 'C 103'):
+        found = events.query(path, room_number=room)
+        assert [(event['queue_id'], event['room_number']) for event in found] == [('q1', 'C103')]
+
+
+def test_query_filters_by_action_and_queue_id(tmp_path):
+    path = str(tmp_path / 'events.db')
+    events.start(path)
+    events.record('received', 'property1', 'q1', 'C103', 'checkin', "접수")
+    events.record('job', 'property1', 'q1', 'C103', 'checkin', "완료", result='success')
+    events.record('received', 'property1', 'q2', 'C103', 'clean', "접수")
+    events.stop()
+
+    assert [event['kind'] for event in events.query(path, queue_id='q1')] == ['received', 'job']
+    assert [event['queue_id'] for event in events.query(path, action='clean')] == ['q2']
+    assert events.query(path, queue_id='q1')[1]['data'] == {'result': 'success'}
@@ -0,0 +1,75 @@
+import time
+
+from pms_manager.bench.fake_ahk import FakeSocketAutomator, FakeSpoolAutomator
+from pms_manager.executor import SocketExecutor
+from pms_manager.spool import TriggerSpool
+
+
+def _quiet(message):
+    pass
+
+
+def _job(queue_id):
+    return {'queue_id': queue_id, 'room_number': 'C103', 'action': 'checkin'}
+
+
+def test_spool_timeout_starts_when_job_turn_comes(tmp_path):
+    # 작업 하나에 0.2초 걸리는 자동화: 세 번째 작업은 넘긴 뒤 0.6초 넘게 걸려도 제 차례부터는 제한 안
+    spool = TriggerSpool(str(tmp_path), _quiet, poll_interval=0.01, use_notifications=False)
+    spool.start()
+    automator = FakeSpoolAutomator(str(tmp_path), poll_interval=0.01, macro_delay=0.2)
+    automator.start()
+    try:
+        seqs = [spool.submit(_job(f'q{i}')) for i in range(3)]
+        elapsed, ack = spool.wait(seqs[-1], timeout=0.5)
+        assert ack is not None and ack['success']
+        assert elapsed < 0.5
+        for seq in seqs[:-1]:
+            assert spool.wait(seq, timeout=0.5)[1] is not None
+    finally:
+        automator.stop()
+        spool.stop()
+
+
+def test_spool_wait_is_bounded_without_consumer(tmp_path):
+    spool = TriggerSpool(str(tmp_path), _quiet, poll_interval=0.01, use_notifications=False)
+    spool.start()
+    try:
+        spool.submit(_job('q1'))
+        seq = spool.submit(_job('q2'))
+        started = time.monotonic()
+        assert spool.wait(seq, timeout=0.2) == (None, None)
+        assert time.monotonic() - started < 1.0
+    finally:
+        spool.stop()
+
+
+def test_socket_timeout_starts_when_job_turn_comes():
+    executor = SocketExecutor('127.0.0.1', 0, _quiet)
+    executor.start()
+    automator = FakeSocketAutomator(executor.port, macro_delay=0.2)
+    automator.start()
+    try:
+        seqs = [executor.submit(_job(f'q{i}')) for i in range(3)]
+        elapsed, ack = executor.wait(seqs[-1], timeout=0.5)
+        assert ack is not None and ack['success']
+        assert elapsed < 0.5
+    finally:
+        automator.stop()
+        executor.stop()
+
+
+def test_socket_cancel_passes_turn_to_next_job():
+    # 연결된 자동화가 없으면 앞 작업을 회수한 뒤에야 다음 작업 차례
+    executor = SocketExecutor('127.0.0.1', 0, _quiet, connect_timeout=None)
+    executor.start()
+    try:
+        first = executor.submit(_job('q1'))
+        second = executor.submit(_job('q2'))
+        assert executor.wait(first, timeout=0.1) == (None, None)
+        assert executor.cancel(first)
+        started = time.monotonic()
+        assert executor.wait(second, timeout=0.1) == (None, None)
+        assert time.monotonic() - started < 0.5
+    finally:
+        executor.stop()
@@ -0,0 +1,92 @@
+import os
+
+from pms_manager import journal as jobs
+from pms_manager.bench.fake_ahk import FakeAutomator
+from pms_manager.journal import JobJournal
+
+from helpers import PROPERTY, queue_item, queue_status, spool_jobs, wait_until
+
+ITEM = {'roomNumber': 'C103', 'action': 'checkin', 'guestName': '테스트'}
+
+
+def test_journal_survives_reopen(tmp_path):
+    path = str(tmp_path / 'journal.db')
+    journal = JobJournal(path)
+    assert journal.record_received(PROPERTY, 'q1', ITEM)
+    assert not journal.record_received(PROPERTY, 'q1', ITEM)
+    journal.record_received(PROPERTY, 'q2', ITEM)
+    journal.advance(PROPERTY, 'q1', jobs.TRIGGER_WRITTEN)
+    journal.advance(PROPERTY, 'q2', jobs.FAILED, error='타임아웃')
+    journal.close()
+
+    journal = JobJournal(path)
+    try:
+        assert journal.state(PROPERTY, 'q1') == (jobs.TRIGGER_WRITTEN, None)
+        assert journal.state(PROPERTY, 'q2') == (jobs.FAILED, '타임아웃')
+        assert journal.unfinished(PROPERTY) == [('q1', jobs.TRIGGER_WRITTEN, ITEM)]
+    finally:
+        journal.close()
+
+
+def _seed(settings_path, *entries):
+    journal = JobJournal(settings_path)
+    for queue_id, state in entries:
+        journal.record_received(PROPERTY, queue_id, ITEM)
+        if state != jobs.RECEIVED:
+            journal.advance(PROPERTY, queue_id, state)
+    journal.close()
+
+
+def test_resume_after_trigger_consumed(tmp_path, make_manager):
+    _seed(str(tmp_path / 'pms_journal.db'), ('q1', jobs.TRIGGER_WRITTEN))
+    queue_item('q1')
+    make_manager()
+    # 트리거 파일이 없으면 AHK가 처리한 것: 다시 실행하지 않고 완료 기록
+    assert wait_until(lambda: queue_status('q1') == 'completed')
+
+
+def test_resume_skips_received_items_gone_from_queue(tmp_path, make_manager, property_config):
+    _seed(str(tmp_path / 'pms_journal.db'),
+          ('pending', jobs.RECEIVED), ('done', jobs.RECEIVED), ('deleted', jobs.RECEIVED))
+    queue_item('pending')
+    queue_item('done', status='completed')
+    automator = FakeAutomator(property_config.trigger_file, poll_interval=0.01, macro_delay=0.01)
+    automator.start()
+    try:
+        manager = make_manager()
+        assert wait_until(lambda: queue_status('pending') == 'completed')
+        assert wait_until(lambda: manager.journal.state(PROPERTY, 'deleted')[0] == jobs.FAILED)
+        assert automator.processed == ['pending']
+        assert manager.journal.state(PROPERTY, 'done')[0] == jobs.FAILED
+        assert queue_status('done') == 'completed'
+    finally:
+        automator.stop()
+
+
+def test_resume_with_empty_queue_closes_received_items(tmp_path, make_manager):
+    _seed(str(tmp_path / 'pms_journal.db'), ('q1', jobs.RECEIVED))
+    manager = make_manager()
+    assert wait_until(lambda: manager.journal.state(PROPERTY, 'q1')[0] == jobs.FAILED)
+
+
+def test_spool_timeout_is_failed_after_restart(make_manager, property_config):
+    manager = make_manager(trigger_mode='spool', trigger_timeout=0.3, trigger_timeout_min=0.3)
+    queue_item('q1')
+    assert wait_until(lambda: queue_status('q1') == 'failed')
+    assert manager.journal.state(PROPERTY, 'q1')[0] == jobs.FAILED
+    assert spool_jobs(property_config) == []
+
+    # 실패 기록이 Firebase에 반영되기 전에 종료된 경우: 재시작 후에도 완료로 보지 않는다
+    queue_item('q1')
+    make_manager(trigger_mode='spool', trigger_timeout=0.3, trigger_timeout_min=0.3)
+    assert wait_until(lambda: queue_status('q1') == 'failed')
+
+
+def test_unread_trigger_is_journaled_failed(make_manager, property_config):
+    with open(property_config.ahk_log_file, 'w', encoding='utf-8') as f:
+        f.write("AHK 시작\n")
+    manager = make_manager(ahk_start_timeout=0.2)
+    queue_item('q1')
+    assert wait_until(lambda: queue_status('q1') == 'failed')
+    assert manager.journal.state(PROPERTY, 'q1')[0] == jobs.FAILED
+    assert not os.path.exists(property_config.trigger_file)
@@ -0,0 +1,23 @@
+import pytest
+
+from pms_manager import logger
+from pms_manager.logger import Logger, configure_logging
+
+
+@pytest.mark.parametrize('level, expected', [
+    ('INFO', ['🔄 시작', '⚠️ 재시도', '❌ 실패']),
+    ('WARNING', ['⚠️ 재시도', '❌ 실패']),
+    ('ERROR', ['❌ 실패']),
+])
+def test_log_level_follows_line_marker(monkeypatch, level, expected):
+    written = []
+    monkeypatch.setattr(logger._writer, 'submit',
+                        lambda log_file, console_line, file_line: written.append(file_line.split('] ', 1)[1]))
+    configure_logging(level)
+    try:
+        log = Logger('').log
+        for message in ('🔄 시작', '⚠️ 재시도', '❌ 실패'):
+            log(message)
+        assert written == expected
+    finally:
+        configure_logging('WARNING')
@@ -0,0 +1,102 @@
+import os
+import queue
+import threading
+
+from pms_manager.bench.fake_ahk import FakeAutomator
+from pms_manager.pipeline import _STOP, DeadlineQueue, Pipeline, Stage
+from pms_manager.web_app import normalize_room_number
+
+from helpers import queue_item, wait_until
+
+
+def _drain(q):
+    items = []
+    while q.qsize():
+        items.append(q.get_nowait())
+    return items
+
+
+def test_deadline_queue_puts_urgent_first():
+    q = DeadlineQueue(10, priority=lambda item: 0.0 if item.startswith('checkin') else 30.0)
+    for item in ('clean1', 'clean2', 'checkin1', 'clean3', 'checkin2'):
+        q.put(item)
+    assert _drain(q) == ['checkin1', 'checkin2', 'clean1', 'clean2', 'clean3']
+
+
+def test_deadline_queue_is_fifo_for_equal_priority():
+    q = DeadlineQueue(10, priority=lambda item: 0.0)
+    for item in range(5):
+        q.put(item)
+    assert _drain(q) == [0, 1, 2, 3, 4]
+
+
+def test_deadline_queue_ages_waiting_items():
+    # 양보 시간이 0.01초뿐이면 충분히 기다린 작업이 새 급한 작업보다 먼저
+    q = DeadlineQueue(10, priority=lambda item: 0.0 if item == 'urgent' else 0.01)
+    q.put('waiting')
+    threading.Event().wait(0.03)
+    q.put('urgent')
+    assert _drain(q) == ['waiting', 'urgent']
+
+
+def test_deadline_queue_stop_marker_comes_last():
+    q = DeadlineQueue(10, priority=lambda item: 30.0)
+    q.put('a')
+    q.put(_STOP)
+    q.put('b')
+    assert _drain(q) == ['a', 'b', _STOP]
+
+
+def test_pipeline_passes_results_to_next_stage():
+    results = queue.SimpleQueue()
+    pipeline = Pipeline('test', [
+        Stage('double', lambda item: item * 2),
+        Stage('collect', lambda item: results.put(item)),
+    ], log=lambda message: None)
+    pipeline.start()
+    for item in range(3):
+        pipeline.submit(item)
+    pipeline.stop()
+    assert sorted(results.get_nowait() for _ in range(3)) == [0, 2, 4]
+
+
+def _room_priority(job):
+    return 0.0 if job[1] == 'checkin' else 30.0
+
+
+def _room_group(job):
+    return normalize_room_number(job[0]), job[2]
+
+
+def test_deadline_queue_keeps_same_room_order():
+    # 체크인이 급해도 같은 객실의 체크아웃 → 청소를 앞지르지 않는다. 다른 객실 체크인은 먼저
+    q = DeadlineQueue(10, priority=_room_priority, group=_room_group)
+    for job in (('C103', 'checkout', 1), ('c103', 'clean', 2), ('C103', 'checkin', 3), ('C104', 'checkin', 4)):
+        q.put(job)
+    assert [job[2] for job in _drain(q)] == [4, 1, 2, 3]
+
+
+def test_deadline_queue_releases_room_jobs_in_arrival_order():
+    # 앞 단계 워커가 순서를 바꿔 넣어도 같은 객실은 도착 순서대로
+    q = DeadlineQueue(10, priority=_room_priority, group=_room_group)
+    for job in (('C103', 'clean', 2), ('C103', 'checkout', 1), ('C103', 'checkin', 3)):
+        q.put(job)
+    assert [job[1] for job in _drain(q)] == ['checkout', 'clean', 'checkin']
+
+
+def test_manager_keeps_same_room_order(make_manager, property_config):
+    automator = FakeAutomator(property_config.trigger_file, poll_interval=0.01, macro_delay=0.01,
+                              delays={'busy': 0.3})
+    automator.start()
+    try:
+        make_manager()
+        queue_item('busy', room_number='B201', action='clean')
+        assert wait_until(lambda: automator.processed or os.path.exists(property_config.trigger_file))
+        queue_item('out', action='checkout')
+        queue_item('clean', action='clean')
+        queue_item('in', action='checkin')
+        queue_item('other', room_number='C104', action='checkin')
+        assert wait_until(lambda: len(automator.processed) == 5)
+        assert automator.processed == ['busy', 'other', 'out', 'clean', 'in']
+    finally:
+        automator.stop()
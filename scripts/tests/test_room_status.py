@@ -0,0 +1,44 @@
+from pms_manager import firebase
+from pms_manager.room_status import RoomStatusUploader, compute_delta
+from pms_manager.writes import WriteBatcher
+
+
+def test_compute_delta_changed_added_removed_rooms():
+    old = {'rooms': [{'n': 'C101', 's': '공실'}, {'n': 'C102', 's': '사용중'}], 'updatedAt': '1'}
+    new = {'rooms': [{'n': 'C101', 's': '사용중'}], 'updatedAt': '2'}
+    assert compute_delta(old, new) == {
+        'rooms/0': {'n': 'C101', 's': '사용중'},
+        'rooms/1': None,
+        'updatedAt': '2',
+    }
+
+
+def test_compute_delta_removed_top_level_key():
+    assert compute_delta({'rooms': {}, 'note': 'x'}, {'rooms': {}}) == {'note': None}
+
+
+def test_compute_delta_unchanged_is_empty():
+    snapshot = {'rooms': {'a': {'s': '공실'}}, 'updatedAt': '1'}
+    assert compute_delta(snapshot, dict(snapshot)) == {}
+
+
+def test_full_upload_keeps_metrics_summary(database):
+    writes = WriteBatcher(lambda message: None)
+    writes.set('pms_status/property1/metrics', {'queueDepth': 0}).result(5)
+
+    uploader = RoomStatusUploader('pms_status/property1', lambda message: None, writes)
+    assert uploader.upload({'rooms': [{'n': 'C101'}], 'updatedAt': '1'})
+
+    status = firebase.reference('pms_status/property1').get()
+    assert status['metrics'] == {'queueDepth': 0}
+    assert status['rooms'] == [{'n': 'C101'}]
+
+
+def test_second_upload_sends_only_changed_rooms(database):
+    writes = WriteBatcher(lambda message: None)
+    uploader = RoomStatusUploader('pms_status/property1', lambda message: None, writes)
+    uploader.upload({'rooms': [{'n': 'C101', 's': '공실'}, {'n': 'C102', 's': '공실'}]})
+    before = database.write_count
+    assert uploader.upload({'rooms': [{'n': 'C101', 's': '공실'}, {'n': 'C102', 's': '사용중'}]})
+    assert database.write_count == before + 1
+    assert firebase.reference('pms_status/property1/rooms/1/s').get() == '사용중'
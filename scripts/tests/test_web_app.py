@@ -0,0 +1,151 @@
+import time
+
+import pytest
+
+from pms_manager.web_app import (
+    CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError, RoomDirectory, WebAppClient,
+    normalize_room_number,
+)
+
+
+@pytest.mark.parametrize('raw, expected', [
+    ('Camp 101', 'CAMP101'),
+    ('CAMP101', 'CAMP101'),
+    (' camp 101호', 'CAMP101'),
+    ('c103', 'C103'),
+    (None, ''),
+    (103, '103'),
+])
+def test_normalize_room_number(raw, expected):
+    assert normalize_room_number(raw) == expected
+
+
+def _open(breaker):
+    for _ in range(breaker.failure_threshold):
+        assert breaker.allow()
+        breaker.failure('test')
+    assert breaker.state == OPEN
+
+
+def test_breaker_opens_after_consecutive_failures():
+    breaker = CircuitBreaker(failure_threshold=3, open_time=60)
+    breaker.failure('x')
+    breaker.failure('x')
+    breaker.success()
+    breaker.failure('x')
+    assert breaker.state == CLOSED
+    breaker.failure('x')
+    breaker.failure('x')
+    assert breaker.state == OPEN
+    assert breaker.allow() is None
+    assert breaker.snapshot()['rejected'] == 1
+
+
+def test_breaker_allows_single_probe_when_half_open():
+    breaker = CircuitBreaker(failure_threshold=1, open_time=0.01)
+    _open(breaker)
+    time.sleep(0.02)
+    assert breaker.allow() == HALF_OPEN
+    assert breaker.allow() is None
+    breaker.success()
+    assert breaker.state == CLOSED
+    assert breaker.allow() == CLOSED
+
+
+def test_failed_probe_doubles_open_time():
+    breaker = CircuitBreaker(failure_threshold=1, open_time=0.01)
+    _open(breaker)
+    time.sleep(0.02)
+    assert breaker.allow() == HALF_OPEN
+    breaker.failure('x')
+    assert breaker.state == OPEN
+    assert breaker.retry_in() > 0.01
+
+
+def test_end_probe_frees_probe_slot():
+    breaker = CircuitBreaker(failure_threshold=1, open_time=0.01)
+    _open(breaker)
+    time.sleep(0.02)
+    assert breaker.allow() == HALF_OPEN
+    breaker.end_probe()
+    assert breaker.allow() == HALF_OPEN
+
+
+def test_probe_with_unexpected_error_does_not_block_breaker(monkeypatch):
+    client = WebAppClient('http://127.0.0.1:1', circuit_failures=1, circuit_open_time=0.01,
+                          log=lambda message: None)
+    try:
+        client.breaker.failure('test')
+        time.sleep(0.02)
+
+        def broken(*args, **kwargs):
+            raise ValueError('bad request arguments')
+
+        monkeypatch.setattr(client.session, 'request', broken)
+        with pytest.raises(ValueError):
+            client.get('/api/rooms')
+        assert client.breaker.state == HALF_OPEN
+        # 다음 호출은 다시 시험 호출로 나간다 (CircuitOpenError가 아님)
+        with pytest.raises(ValueError):
+            client.get('/api/rooms')
+    finally:
+        client.close()
+
+
+def test_open_breaker_rejects_without_request(monkeypatch):
+    client = WebAppClient('http://127.0.0.1:1', circuit_failures=1, circuit_open_time=60,
+                          log=lambda message: None)
+    try:
+        client.breaker.failure('test')
+        monkeypatch.setattr(client.session, 'request', lambda *a, **k: pytest.fail("request sent"))
+        with pytest.raises(CircuitOpenError):
+            client.get('/api/rooms')
+    finally:
+        client.close()
+
+
+class _RoomsClient:
+    """/api/room-status 응답을 차례로 돌려주는 가짜 클라이언트 (예외면 던진다)"""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = 0
+
+    def get(self, path):
+        self.calls += 1
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return _Response(response)
+
+
+class _Response:
+    status_code = 200
+
+    def __init__(self, rooms):
+        self.rooms = rooms
+
+    def json(self):
+        return self.rooms
+
+
+def test_room_directory_keeps_stale_index_when_refresh_fails():
+    logged = []
+    client = _RoomsClient([{'id': 'r1', 'roomNumber': 'C103'}], CircuitOpenError(30),
+                          [{'id': 'r2', 'roomNumber': 'C103'}])
+    rooms = RoomDirectory(client, ttl=0, log=logged.append)
+    assert rooms.lookup('C103') == 'r1'
+    # 만료 후 갱신 실패: 이전 목록으로 답하고 다시 시도할 때까지 요청하지 않는다
+    assert rooms.lookup('c 103') == 'r1'
+    assert rooms.lookup('C103') == 'r1'
+    assert client.calls == 2
+    assert logged and logged[0].startswith('⚠️')
+    # 다시 시도할 시각이 지나 갱신에 성공하면 새 목록
+    rooms._stale_until = 0.0
+    assert rooms.lookup('C103') == 'r2'
+
+
+def test_room_directory_raises_without_previous_index():
+    rooms = RoomDirectory(_RoomsClient(CircuitOpenError(30)), log=lambda message: None)
+    with pytest.raises(CircuitOpenError):
+        rooms.lookup('C103')
@@ -0,0 +1,66 @@
+import pytest
+
+from pms_manager import firebase
+from pms_manager.writes import WriteBatcher, merge_write
+
+
+def test_merge_write_later_value_wins():
+    pending = {}
+    merge_write(pending, 'a/b', 1)
+    merge_write(pending, 'a/b', 2)
+    assert pending == {'a/b': 2}
+
+
+def test_merge_write_ancestor_absorbs_child():
+    pending = {'a': {'x': 1}}
+    merge_write(pending, 'a/b/c', 2)
+    assert pending == {'a': {'x': 1, 'b': {'c': 2}}}
+
+
+def test_merge_write_ancestor_replaces_children():
+    pending = {'a/b': 1, 'a/c': 2, 'ab': 3}
+    merge_write(pending, 'a', {'d': 4})
+    assert pending == {'a': {'d': 4}, 'ab': 3}
+
+
+def test_merge_write_delete_inside_ancestor():
+    pending = {'a': {'b': 1}}
+    merge_write(pending, 'a/b', None)
+    assert pending == {'a': None}
+
+
+class _StrictReference:
+    """Firebase처럼 키에 . # $ [ ] 가 있으면 update 전체를 거부"""
+
+    def __init__(self, store):
+        self.store = store
+
+    def update(self, values):
+        for path in values:
+            if any(c in path for c in '.#$[]'):
+                raise ValueError(f"invalid key: {path}")
+        self.store.update(values)
+
+
+def test_failed_batch_is_retried_per_submitter(monkeypatch):
+    store = {}
+    monkeypatch.setattr(firebase, 'reference', lambda path='/': _StrictReference(store))
+    writes = WriteBatcher(lambda message: None, batch_window=0.05)
+    writes.start()
+    try:
+        bad = writes.update('pms_status/property1', {'rooms/C1.5': {'status': '공실'}})
+        done = writes.set('pms_queue/property1/q1/status', 'completed')
+        failed = writes.set('pms_queue/property1/q2/status', 'failed')
+        with pytest.raises(ValueError):
+            bad.result(5)
+        assert done.result(5) is None
+        assert failed.result(5) is None
+    finally:
+        writes.stop()
+    assert store == {'pms_queue/property1/q1/status': 'completed', 'pms_queue/property1/q2/status': 'failed'}
+
+
+def test_writes_before_start_commit_immediately(database):
+    writes = WriteBatcher(lambda message: None)
+    writes.update('a', {'b': 1, 'c/d': 2}).result(5)
+    assert firebase.reference('a').get() == {'b': 1, 'c': {'d': 2}}